@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — JSON 지표 API
+Headless read-only HTTP API over the same dataset snapshots as the dashboard.
+
+Streamlit 없이 대시보드와 같은 숫자(KPI 합계, 캠페인 · 세그먼트 · 플랫폼 CPL)를
+JSON 으로 내준다. 데이터는 app.py 와 같은 RefreshWorker 가 만든 Dataset 스냅샷이고
+(롤업은 ReportCache 에서, 집계는 summary.py), 응답 본문은 데이터 버전마다 한 번만 직렬화해 둔다.
+첫 전체 버전이 준비되기 전의 베이스라인 응답은 Cache-Control: no-store.
+ETag 는 본문 해시라 If-None-Match 가 맞으면 304 로 본문 없이 끝난다.
+
+    python api.py --port 8600
+    curl -s localhost:8600/api/v1/kpis
+    uvicorn api:app --port 8600 --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+from contextlib import asynccontextmanager
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from data import REPORT_PERIOD
+from refresh import REFRESH_INTERVAL, RefreshWorker
+from reportcache import ReportCache
+from summary import campaign_cpl, kpis, platform_cpl, segment_cpl
+
+API_PREFIX = '/api/v1'
+CACHE_CONTROL = f'public, max-age={REFRESH_INTERVAL}'
+
+
+def _records(df):
+    return json.loads(df.to_json(orient='records', force_ascii=False, date_format='iso'))
+
+
+ENDPOINTS = {
+    'kpis': kpis,
+    'campaigns': lambda ds: _records(campaign_cpl(ds)),
+    'segments': lambda ds: _records(segment_cpl(ds)),
+    'platforms': lambda ds: _records(platform_cpl(ds)),
+}
+
+
+# ═══════════════════════════════════════════════
+# Response cache
+# ═══════════════════════════════════════════════
+class ResponseCache:
+    """(데이터 버전, 엔드포인트) → (본문 바이트, ETag). 새 버전이 보이면 이전 버전은 버린다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._bodies = {}
+
+    def get(self, ds, name):
+        entry = self._bodies.get(name) if self._version == ds.version else None
+        if entry is not None:
+            return entry
+        payload = {'version': ds.version, 'source': ds.source, 'period': list(REPORT_PERIOD),
+                   'data': ENDPOINTS[name](ds)}
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode()
+        entry = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        with self._lock:
+            if self._version != ds.version:
+                self._version, self._bodies = ds.version, {}
+            self._bodies[name] = entry
+        return entry
+
+
+def _json_default(o):
+    if isinstance(o, np.generic):
+        return o.item()
+    raise TypeError(f'{type(o).__name__} is not JSON serializable')
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+
+# ═══════════════════════════════════════════════
+# App
+# ═══════════════════════════════════════════════
+def create_app(worker=None):
+    # API 는 파생 객체(인덱스 · 분석 테이블)가 필요 없다 — 팩트 + 롤업만
+    worker = worker or RefreshWorker(derived={}, cache=ReportCache())
+    responses = ResponseCache()
+
+    async def metric(request):
+        name = request.path_params['name']
+        if name not in ENDPOINTS:
+            return JSONResponse({'error': f'unknown endpoint {name!r}', 'endpoints': sorted(ENDPOINTS)}, status_code=404)
+        body, etag = responses.get(worker.current(), name)
+        # 첫 전체 버전 전에는 베이스라인 본문 — 프록시 · 브라우저가 붙잡아 두지 않게
+        headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL if worker.ready else 'no-store'}
+        if _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type='application/json', headers=headers)
+
+    async def version(request):
+        ds = worker.current()
+        return JSONResponse({'version': ds.version, 'source': ds.source, 'built_at': ds.built_at,
+                             'building': worker.building,
+                             'rejected': worker.rejected.version if worker.rejected is not None else None,
+                             'endpoints': sorted(ENDPOINTS)},
+                            headers={'Cache-Control': 'no-store'})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        worker.start()
+        yield
+        worker.stop()
+
+    return Starlette(routes=[
+        Route(f'{API_PREFIX}/version', version),
+        Route(f'{API_PREFIX}/{{name}}', metric),
+    ], lifespan=lifespan)
+
+
+app = create_app()
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description='대시보드 지표 JSON API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args(argv)
+    uvicorn.run(app, host=args.host, port=args.port, access_log=False)
+
+
+if __name__ == '__main__':
+    main()
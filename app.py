@@ -4,8 +4,12 @@
 Move University — Digital Marketing Deep-Dive Dashboard
 """
 
+import functools
+import html
+import os
+import time
+
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
@@ -20,6 +24,8 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+_run_started = time.perf_counter()
+TIMING = st.query_params.get("timing") == "1"   # ?timing=1 → 전체 실행 · fragment 렌더 시간 표시
 
 # ═══════════════════════════════════════════════
 # Custom CSS
@@ -105,6 +111,14 @@ st.markdown("""
         align-items: center; justify-content: center; font-size: 13px; font-weight: 500;
         margin: 0 -20px; position: relative;
     }
+
+    /* Creative gallery */
+    .creative-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(160px, 1fr)); gap: 16px; margin: 12px 0; }
+    .creative-card { background: #f8f9ff; border: 1px solid #e8f0fe; border-radius: 12px; padding: 10px; font-size: 12px; }
+    .creative-card img { border-radius: 8px; }
+    .creative-noimg { aspect-ratio: 1; display: flex; align-items: center; justify-content: center; background: #eef2ff; border-radius: 8px; color: #95A5A6; }
+    .creative-name { font-weight: 700; color: #1B3A5C; margin-top: 6px; }
+    .creative-metrics { color: #555; line-height: 1.6; }
 </style>
 """, unsafe_allow_html=True)
 
@@ -112,233 +126,54 @@ st.markdown("""
 # ═══════════════════════════════════════════════
 # Data
 # ═══════════════════════════════════════════════
-
-# 채널 종합
-TOTAL_SPEND = 40_916_071
-TOTAL_CONV = 6_473
-TOTAL_CPL = 6_322
-GOOGLE_SPEND = 15_452_143
-GOOGLE_CONV = 1_638
-GOOGLE_CPL = 9_432
-META_SPEND = 25_463_928
-META_CONV = 4_835
-META_CPL = 5_267
-
-# Google 키워드 의도별 (keyword report 기반 — 정확 데이터)
-google_intent = pd.DataFrame({
-    'segment': ['브랜드', '기타(영어+이삿짐센터)', '원룸/소형', '포장이사', '일반이사', '가격/견적', '용달/화물', '지역+이사', '외국인'],
-    'keywords': [1, 80, 36, 49, 40, 29, 80, 53, 1],
-    'cost': [394261, 2227000, 357555, 412435, 460648, 284624, 1774389, 488317, 80001],
-    'conversions': [84, 193, 28, 30, 32, 19, 104, 28, 2],
-    'cpl': [4655, 11509, 12769, 13747, 14395, 14980, 17061, 17133, 40000],
-    'clicks': [544, 1058, 127, 153, 202, 109, 750, 171, 91],
-    'impressions': [1023, 12418, 3623, 4955, 7267, 2972, 17065, 2922, 1426],
-})
-PMAX_BENCHMARK = 6976
-SEARCH_CPL = 13363
-
-# Google 캠페인
-google_campaign = pd.DataFrame({
-    '캠페인': ['PMax', '검색광고(내국인)', '검색광고(외국인)'],
-    '비용': [7631334, 6748916, 1919872],
-    '전환': [1109.14, 471.19, 177.50],
-    'CPL': [6880, 14323, 10816],
-    '유형': ['PMax', '검색', '검색'],
-})
-
-# PMax 에셋그룹
-pmax_asset = pd.DataFrame({
-    '에셋그룹': ['리타겟팅', '맞춤타겟\n(소형이사)', '맞춤타겟\n(지역이사)'],
-    '비용': [1675741, 5097790, 857803],
-    '전환': [269.49, 726.49, 113.17],
-    'CPL': [6218, 7017, 7580],
-    'CVR': [2.52, 3.84, 6.42],
-})
-
-# Meta 소재별
-meta_adset = pd.DataFrame({
-    '소재': ['"이사 가격"', '"공통 소재"', '"가격 소재"', '"에브리타임"', '"여자 모델"', '"소재 ALL"', '"신규 소재"(12월)', '"신규 소재"(11월)'],
-    '소재_short': ['이사가격', '공통', '가격소재', '에타', '여자모델', '소재ALL', '신규(12)', '신규(11)'],
-    '타겟': ['한국인', '한국인', '한국인', '20대', '한국인', '유사타겟', '12월', '11월'],
-    '비용': [600648, 3640, 17347742, 3179850, 150191, 3415809, 205059, 17226],
-    '전환': [156, 1, 3355, 617, 26, 522, 16, 1],
-    'CPL': [3850, 3640, 5171, 5154, 5777, 6544, 12816, 17226],
-    'CTR': [0.99, 1.15, 0.81, 1.20, 0.93, 0.78, 0.86, 1.50],
-    'CVR': [27.1, 33.3, 18.1, 11.0, 23.6, 17.0, 20.3, 5.3],
-    '예산비중': [2.4, 0.0, 69.6, 12.8, 0.6, 13.7, 0.8, 0.1],
-    '효율': ['BEST', '표본부족', 'MAIN', 'CTR최고', '가능성', '비효율', 'WORST', 'WORST'],
-    '메시지유형': ['가격', '기타', '가격', '커뮤니티', '감성', '혼합', '신규', '신규'],
-})
-
-# Meta 플랫폼 월별
-meta_plat_month = pd.DataFrame({
-    '월': ['11월','11월','11월','12월','12월','12월','1월','1월','1월'],
-    '플랫폼': ['Instagram','Facebook','Threads'] * 3,
-    'CPL': [5512, 6230, 4285, 5035, 4143, 3821, 4853, 5766, 3937],
-    '전환': [1050, 35, 70, 1380, 52, 95, 1550, 48, 105],
-    '비용': [5787600, 218050, 299950, 6948300, 215436, 362970, 7524650, 276768, 413580],
-})
-
-# Meta 소재 월별
-meta_creative_month = pd.DataFrame({
-    '월': ['11월','11월','11월','11월','12월','12월','12월','12월','1월','1월','1월','1월'],
-    '소재': ['"가격 소재"','"에브리타임"','"소재 ALL"','"신규 소재"',
-             '"가격 소재"','"에브리타임"','"소재 ALL"','"여자 모델"',
-             '"가격 소재"','"에브리타임"','"소재 ALL"','"여자 모델"'],
-    'CPL': [5729, 5091, 10060, 17226, 5525, 5089, 4830, 6585, 4527, 5334, 12867, 3174],
-    '전환': [1050, 210, 120, 1, 1180, 220, 280, 15, 1125, 187, 122, 11],
-})
-
-# 메시지 유형별 크로스채널
-msg_cross = pd.DataFrame({
-    '메시지 유형': ['가격/비교/견적', '브랜드 (이사대학)', '소형이사/원룸', '일반 이사', '용달/화물', '커뮤니티 (에타)', '감성 (여자모델)'],
-    'Google CPL': [5767, 4741, 6411, 16334, 18761, None, None],
-    'Meta CPL': [3850, None, None, None, None, 5154, 5777],
-    '채널': ['Both', 'Google', 'Google', 'Google', 'Google', 'Meta', 'Meta'],
-    '효과': ['최고', '최고', '좋음', '나쁨', '최악', '보통', '가능성'],
-})
-
-# ── Weekly Data (Google) ──
-google_campaign_weekly = pd.DataFrame([
-    # PMax
-    {"campaign": "PMax", "week": "W44", "cost": 81888, "conv": 10.5, "cpl": 7799},
-    {"campaign": "PMax", "week": "W45", "cost": 572469, "conv": 52.0, "cpl": 11009},
-    {"campaign": "PMax", "week": "W46", "cost": 630651, "conv": 73.5, "cpl": 8580},
-    {"campaign": "PMax", "week": "W47", "cost": 538244, "conv": 61.83, "cpl": 8705},
-    {"campaign": "PMax", "week": "W48", "cost": 527085, "conv": 60.0, "cpl": 8785},
-    {"campaign": "PMax", "week": "W49", "cost": 582718, "conv": 56.01, "cpl": 10404},
-    {"campaign": "PMax", "week": "W50", "cost": 544792, "conv": 54.98, "cpl": 9909},
-    {"campaign": "PMax", "week": "W51", "cost": 553454, "conv": 82.5, "cpl": 6709},
-    {"campaign": "PMax", "week": "W52", "cost": 537367, "conv": 88.0, "cpl": 6106},
-    {"campaign": "PMax", "week": "W01", "cost": 548325, "conv": 107.5, "cpl": 5101},
-    {"campaign": "PMax", "week": "W02", "cost": 549466, "conv": 83.01, "cpl": 6619},
-    {"campaign": "PMax", "week": "W03", "cost": 561800, "conv": 115.0, "cpl": 4885},
-    {"campaign": "PMax", "week": "W04", "cost": 552450, "conv": 106.0, "cpl": 5212},
-    {"campaign": "PMax", "week": "W05", "cost": 432733, "conv": 83.17, "cpl": 5203},
-    # Search-내국인
-    {"campaign": "검색광고(내국인)", "week": "W44", "cost": 84366, "conv": 4.0, "cpl": 21092},
-    {"campaign": "검색광고(내국인)", "week": "W45", "cost": 594959, "conv": 35.0, "cpl": 16999},
-    {"campaign": "검색광고(내국인)", "week": "W46", "cost": 573287, "conv": 26.0, "cpl": 22050},
-    {"campaign": "검색광고(내국인)", "week": "W47", "cost": 550335, "conv": 39.67, "cpl": 13873},
-    {"campaign": "검색광고(내국인)", "week": "W48", "cost": 543278, "conv": 24.0, "cpl": 22637},
-    {"campaign": "검색광고(내국인)", "week": "W49", "cost": 578517, "conv": 19.0, "cpl": 30448},
-    {"campaign": "검색광고(내국인)", "week": "W50", "cost": 548974, "conv": 45.01, "cpl": 12197},
-    {"campaign": "검색광고(내국인)", "week": "W51", "cost": 573491, "conv": 47.0, "cpl": 12202},
-    {"campaign": "검색광고(내국인)", "week": "W52", "cost": 385455, "conv": 31.0, "cpl": 12434},
-    {"campaign": "검색광고(내국인)", "week": "W01", "cost": 393393, "conv": 32.5, "cpl": 12104},
-    {"campaign": "검색광고(내국인)", "week": "W02", "cost": 400808, "conv": 27.0, "cpl": 14845},
-    {"campaign": "검색광고(내국인)", "week": "W03", "cost": 403922, "conv": 39.0, "cpl": 10357},
-    {"campaign": "검색광고(내국인)", "week": "W04", "cost": 400210, "conv": 30.0, "cpl": 13340},
-    {"campaign": "검색광고(내국인)", "week": "W05", "cost": 394461, "conv": 37.5, "cpl": 10519},
-    # Search-외국인
-    {"campaign": "검색광고(외국인)", "week": "W44", "cost": 11739, "conv": 0.0, "cpl": 0},
-    {"campaign": "검색광고(외국인)", "week": "W45", "cost": 169414, "conv": 9.0, "cpl": 18824},
-    {"campaign": "검색광고(외국인)", "week": "W46", "cost": 141673, "conv": 14.0, "cpl": 10120},
-    {"campaign": "검색광고(외국인)", "week": "W47", "cost": 148676, "conv": 12.0, "cpl": 12390},
-    {"campaign": "검색광고(외국인)", "week": "W48", "cost": 125757, "conv": 8.5, "cpl": 14795},
-    {"campaign": "검색광고(외국인)", "week": "W49", "cost": 138400, "conv": 14.5, "cpl": 9545},
-    {"campaign": "검색광고(외국인)", "week": "W50", "cost": 135853, "conv": 5.0, "cpl": 27171},
-    {"campaign": "검색광고(외국인)", "week": "W51", "cost": 140044, "conv": 17.5, "cpl": 8003},
-    {"campaign": "검색광고(외국인)", "week": "W52", "cost": 141297, "conv": 11.0, "cpl": 12845},
-    {"campaign": "검색광고(외국인)", "week": "W01", "cost": 115763, "conv": 9.0, "cpl": 12863},
-    {"campaign": "검색광고(외국인)", "week": "W02", "cost": 164034, "conv": 22.0, "cpl": 7456},
-    {"campaign": "검색광고(외국인)", "week": "W03", "cost": 140223, "conv": 19.0, "cpl": 7380},
-    {"campaign": "검색광고(외국인)", "week": "W04", "cost": 129534, "conv": 15.0, "cpl": 8636},
-    {"campaign": "검색광고(외국인)", "week": "W05", "cost": 110838, "conv": 11.0, "cpl": 10076},
-])
-
-# Weekly intent segment data (for top segments only)
-google_intent_weekly = pd.DataFrame([
-    # 브랜드
-    {"segment": "브랜드", "week": "W45", "cpl": 6125}, {"segment": "브랜드", "week": "W46", "cpl": 7458},
-    {"segment": "브랜드", "week": "W47", "cpl": 5469}, {"segment": "브랜드", "week": "W48", "cpl": 2185},
-    {"segment": "브랜드", "week": "W49", "cpl": 529}, {"segment": "브랜드", "week": "W50", "cpl": 6647},
-    {"segment": "브랜드", "week": "W51", "cpl": 4081}, {"segment": "브랜드", "week": "W52", "cpl": 4664},
-    {"segment": "브랜드", "week": "W01", "cpl": 6800}, {"segment": "브랜드", "week": "W02", "cpl": 4360},
-    {"segment": "브랜드", "week": "W03", "cpl": 5077}, {"segment": "브랜드", "week": "W04", "cpl": 3994},
-    {"segment": "브랜드", "week": "W05", "cpl": 4110},
-    # 용달/화물
-    {"segment": "용달/화물", "week": "W45", "cpl": 16132}, {"segment": "용달/화물", "week": "W46", "cpl": 30866},
-    {"segment": "용달/화물", "week": "W47", "cpl": 15259}, {"segment": "용달/화물", "week": "W48", "cpl": 22721},
-    {"segment": "용달/화물", "week": "W49", "cpl": 23551}, {"segment": "용달/화물", "week": "W50", "cpl": 9615},
-    {"segment": "용달/화물", "week": "W51", "cpl": 20115}, {"segment": "용달/화물", "week": "W52", "cpl": 14753},
-    {"segment": "용달/화물", "week": "W01", "cpl": 20057}, {"segment": "용달/화물", "week": "W02", "cpl": 16042},
-    {"segment": "용달/화물", "week": "W03", "cpl": 10076}, {"segment": "용달/화물", "week": "W04", "cpl": 18317},
-    {"segment": "용달/화물", "week": "W05", "cpl": 13694},
-    # 일반이사
-    {"segment": "일반이사", "week": "W45", "cpl": 23195}, {"segment": "일반이사", "week": "W46", "cpl": 17758},
-    {"segment": "일반이사", "week": "W47", "cpl": 17670}, {"segment": "일반이사", "week": "W48", "cpl": 0},
-    {"segment": "일반이사", "week": "W49", "cpl": 0}, {"segment": "일반이사", "week": "W50", "cpl": 17262},
-    {"segment": "일반이사", "week": "W51", "cpl": 18167}, {"segment": "일반이사", "week": "W52", "cpl": 34082},
-    {"segment": "일반이사", "week": "W01", "cpl": 15044}, {"segment": "일반이사", "week": "W02", "cpl": 5170},
-    {"segment": "일반이사", "week": "W03", "cpl": 9728}, {"segment": "일반이사", "week": "W04", "cpl": 15113},
-    {"segment": "일반이사", "week": "W05", "cpl": 7201},
-    # 외국인
-    {"segment": "외국인", "week": "W45", "cpl": 18677}, {"segment": "외국인", "week": "W46", "cpl": 10026},
-    {"segment": "외국인", "week": "W47", "cpl": 12529}, {"segment": "외국인", "week": "W48", "cpl": 14458},
-    {"segment": "외국인", "week": "W49", "cpl": 7376}, {"segment": "외국인", "week": "W50", "cpl": 26645},
-    {"segment": "외국인", "week": "W51", "cpl": 7631}, {"segment": "외국인", "week": "W52", "cpl": 12236},
-    {"segment": "외국인", "week": "W01", "cpl": 12862}, {"segment": "외국인", "week": "W02", "cpl": 7332},
-    {"segment": "외국인", "week": "W03", "cpl": 8207}, {"segment": "외국인", "week": "W04", "cpl": 8601},
-    {"segment": "외국인", "week": "W05", "cpl": 10076},
-])
-
-# ── Weekly Data (Meta) ──
-meta_platform_weekly = pd.DataFrame([
-    {"platform": "Instagram", "week": "W45", "cpl": 6072}, {"platform": "Instagram", "week": "W46", "cpl": 6507},
-    {"platform": "Instagram", "week": "W47", "cpl": 5386}, {"platform": "Instagram", "week": "W48", "cpl": 6515},
-    {"platform": "Instagram", "week": "W49", "cpl": 5720}, {"platform": "Instagram", "week": "W50", "cpl": 5190},
-    {"platform": "Instagram", "week": "W51", "cpl": 5405}, {"platform": "Instagram", "week": "W52", "cpl": 5132},
-    {"platform": "Instagram", "week": "W01", "cpl": 5143}, {"platform": "Instagram", "week": "W02", "cpl": 4688},
-    {"platform": "Instagram", "week": "W03", "cpl": 4767}, {"platform": "Instagram", "week": "W04", "cpl": 4728},
-    {"platform": "Instagram", "week": "W05", "cpl": 4497},
-    {"platform": "Facebook", "week": "W45", "cpl": 6548}, {"platform": "Facebook", "week": "W46", "cpl": 5038},
-    {"platform": "Facebook", "week": "W47", "cpl": 5884}, {"platform": "Facebook", "week": "W48", "cpl": 6059},
-    {"platform": "Facebook", "week": "W49", "cpl": 2748}, {"platform": "Facebook", "week": "W50", "cpl": 3552},
-    {"platform": "Facebook", "week": "W51", "cpl": 3623}, {"platform": "Facebook", "week": "W52", "cpl": 5948},
-    {"platform": "Facebook", "week": "W01", "cpl": 5088}, {"platform": "Facebook", "week": "W02", "cpl": 6332},
-    {"platform": "Facebook", "week": "W03", "cpl": 7580}, {"platform": "Facebook", "week": "W04", "cpl": 5384},
-    {"platform": "Facebook", "week": "W05", "cpl": 5106},
-    {"platform": "Threads", "week": "W45", "cpl": 2706}, {"platform": "Threads", "week": "W46", "cpl": 4334},
-    {"platform": "Threads", "week": "W47", "cpl": 4638}, {"platform": "Threads", "week": "W48", "cpl": 4708},
-    {"platform": "Threads", "week": "W49", "cpl": 3622}, {"platform": "Threads", "week": "W50", "cpl": 3696},
-    {"platform": "Threads", "week": "W51", "cpl": 4591}, {"platform": "Threads", "week": "W52", "cpl": 5612},
-    {"platform": "Threads", "week": "W01", "cpl": 4967}, {"platform": "Threads", "week": "W02", "cpl": 4724},
-    {"platform": "Threads", "week": "W03", "cpl": 4437}, {"platform": "Threads", "week": "W04", "cpl": 3470},
-    {"platform": "Threads", "week": "W05", "cpl": 3044},
-])
-
-meta_adset_weekly = pd.DataFrame([
-    # 가격 소재
-    {"adset": "가격 소재", "week": "W45", "cpl": 5318}, {"adset": "가격 소재", "week": "W46", "cpl": 5941},
-    {"adset": "가격 소재", "week": "W47", "cpl": 5516}, {"adset": "가격 소재", "week": "W48", "cpl": 6192},
-    {"adset": "가격 소재", "week": "W49", "cpl": 5978}, {"adset": "가격 소재", "week": "W50", "cpl": 5139},
-    {"adset": "가격 소재", "week": "W51", "cpl": 5627}, {"adset": "가격 소재", "week": "W52", "cpl": 5608},
-    {"adset": "가격 소재", "week": "W01", "cpl": 4788}, {"adset": "가격 소재", "week": "W02", "cpl": 4455},
-    {"adset": "가격 소재", "week": "W03", "cpl": 4611}, {"adset": "가격 소재", "week": "W04", "cpl": 4459},
-    {"adset": "가격 소재", "week": "W05", "cpl": 4567},
-    # 에브리타임
-    {"adset": "에브리타임", "week": "W45", "cpl": 5865}, {"adset": "에브리타임", "week": "W46", "cpl": 6627},
-    {"adset": "에브리타임", "week": "W47", "cpl": 4333}, {"adset": "에브리타임", "week": "W48", "cpl": 7047},
-    {"adset": "에브리타임", "week": "W49", "cpl": 5111}, {"adset": "에브리타임", "week": "W50", "cpl": 4549},
-    {"adset": "에브리타임", "week": "W51", "cpl": 4639}, {"adset": "에브리타임", "week": "W52", "cpl": 4190},
-    {"adset": "에브리타임", "week": "W01", "cpl": 5345}, {"adset": "에브리타임", "week": "W02", "cpl": 5245},
-    {"adset": "에브리타임", "week": "W03", "cpl": 6092}, {"adset": "에브리타임", "week": "W04", "cpl": 5992},
-    {"adset": "에브리타임", "week": "W05", "cpl": 3912},
-    # 소재 ALL
-    {"adset": "소재 ALL", "week": "W45", "cpl": 10069}, {"adset": "소재 ALL", "week": "W46", "cpl": 10005},
-    {"adset": "소재 ALL", "week": "W47", "cpl": 5631}, {"adset": "소재 ALL", "week": "W48", "cpl": 7164},
-    {"adset": "소재 ALL", "week": "W49", "cpl": 4477}, {"adset": "소재 ALL", "week": "W50", "cpl": 5225},
-    {"adset": "소재 ALL", "week": "W51", "cpl": 5389}, {"adset": "소재 ALL", "week": "W52", "cpl": 4802},
-    {"adset": "소재 ALL", "week": "W01", "cpl": 5026}, {"adset": "소재 ALL", "week": "W02", "cpl": 15201},
-    # 이사 가격 (skip W46 where conv=0)
-    {"adset": "이사 가격", "week": "W45", "cpl": 4553}, {"adset": "이사 가격", "week": "W47", "cpl": 3451},
-    {"adset": "이사 가격", "week": "W48", "cpl": 3850}, {"adset": "이사 가격", "week": "W49", "cpl": 3956},
-    {"adset": "이사 가격", "week": "W50", "cpl": 2888}, {"adset": "이사 가격", "week": "W51", "cpl": 3760},
-    {"adset": "이사 가격", "week": "W52", "cpl": 4024}, {"adset": "이사 가격", "week": "W01", "cpl": 4158},
-    {"adset": "이사 가격", "week": "W02", "cpl": 4470}, {"adset": "이사 가격", "week": "W03", "cpl": 4776},
-    {"adset": "이사 가격", "week": "W04", "cpl": 4587}, {"adset": "이사 가격", "week": "W05", "cpl": 3105},
-])
+from data import PMAX_BENCHMARK, SEARCH_CPL
+from assets import CreativeAssetStore
+from creatives import SORT_KEYS
+from attribution import MODEL_LABELS, MODELS
+from explore import MAX_ROWS as MAX_QUERY_ROWS, QueryError
+from geo import MIN_CONVERSIONS as GEO_MIN_CONVERSIONS, SOURCE_LABELS, load_geojson, region_figure
+from fatigue import FATIGUE_LEVEL, MIN_DAYS, MIN_IMPRESSIONS, WARN_DAYS, decay_curve
+from formatting import auto_column_config, column_config, won_text
+from tables import PAGE_SIZES
+from timeseries import line_figure
+from ngrams import MIN_CONVERSIONS, MIN_SHARE, NEGATIVE_COST, SPLIT_RATIO
+from waste import ACTIVE_DAYS, STALE_COST, ZERO_CONV_COST
+from refresh import RefreshWorker
+from validation import CPL_TOLERANCE, TOTAL_TOLERANCE
+from reportcache import ReportCache
+from reports import UNCACHED, WATCH, dashboard_derived
+from summary import kpis
+
+
+@st.cache_resource
+def refresh_worker():
+    # 프로세스당 하나 — 팩트 파일이 바뀌면 백그라운드에서 새 버전을 만들어 교체
+    # 롤업 · 파생 객체는 디스크 캐시에서 (배포 때 reportcache.py warm 으로 미리 채움)
+    return RefreshWorker(derived=dashboard_derived(), watch=WATCH, cache=ReportCache(), uncached=UNCACHED).start()
+
+# rerun 한 번은 하나의 데이터 버전만 본다
+dataset = refresh_worker().current()
+google_intent = dataset['google_intent']
+google_campaign = dataset['google_campaign']
+pmax_asset = dataset['pmax_asset']
+meta_adset = dataset['meta_adset']
+meta_plat_month = dataset['meta_plat_month']
+meta_creative_month = dataset['meta_creative_month']
+google_campaign_weekly = dataset['google_campaign_weekly']
+google_intent_weekly = dataset['google_intent_weekly']
+meta_platform_weekly = dataset['meta_platform_weekly']
+meta_adset_weekly = dataset['meta_adset_weekly']
+
+
+@st.cache_resource(max_entries=2)
+def dataset_kpis(version, _dataset):
+    # 버전마다 한 번 — JSON API(/api/v1/kpis)와 같은 summary.kpis
+    return kpis(_dataset)
+
+kpi = dataset_kpis(dataset.version, dataset)
+_no_channel = {'spend': 0, 'conversions': 0, 'cpl': 0, 'spend_share': None}
+kpi_google = kpi.get('google', _no_channel)
+kpi_meta = kpi.get('meta', _no_channel)
 
 
 # ═══════════════════════════════════════════════
@@ -361,11 +196,86 @@ def section(text):
 def divider():
     st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
 
+def share_text(channel):
+    return f"{channel['spend_share']}%" if channel['spend_share'] is not None else "—"
+
+def vs_average(channel):
+    # 채널 CPL 의 전체 CPL 대비 차이 ('+49%', '−17%')
+    if not channel['cpl'] or not kpi['total']['cpl']:
+        return "—"
+    pct = round((channel['cpl'] / kpi['total']['cpl'] - 1) * 100)
+    return f"+{pct}%" if pct >= 0 else f"−{-pct}%"
+
 def fmt(n):
     if n >= 1_000_000: return f'₩{n/1_000_000:.1f}M'
     elif n >= 1_000: return f'₩{n:,.0f}'
     return f'₩{n}'
 
+@st.cache_resource
+def creative_assets():
+    # 소재 썸네일은 프로세스당 한 번만 변환 (static/creatives 로 게시)
+    _base = os.path.dirname(os.path.abspath(__file__))
+    return CreativeAssetStore(os.path.join(_base, "images"), static_dir=os.path.join(_base, "static", "creatives"))
+
+def creative_gallery_html(rows, assets, show_account=False):
+    cards = []
+    for row in rows.itertuples():
+        thumb = assets.picture_html(row.image_key, sizes="180px", alt=html.escape(row.creative)) if isinstance(row.image_key, str) else ''
+        cpl = f'₩{row.cpl:,.0f}' if row.cpl == row.cpl else '—'
+        cards.append(f'''<div class="creative-card">
+            {thumb or '<div class="creative-noimg">이미지 없음</div>'}
+            <div class="creative-name">{html.escape(row.creative)}</div>
+            {f'<div class="creative-metrics">{html.escape(row.account)}</div>' if show_account else ''}
+            <div class="creative-metrics">CPL {cpl}<br>CTR {row.ctr:.2f}% · CVR {row.cvr:.1f}%</div>
+        </div>''')
+    return f'<div class="creative-grid">{"".join(cards)}</div>'
+
+def fragment(fn):
+    """st.fragment — 안의 위젯을 바꾸면 페이지 전체가 아니라 이 함수만 다시 실행된다."""
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        if TIMING:
+            st.caption(f"⏱ {fn.__name__}: {(time.perf_counter() - t0) * 1000:.0f}ms")
+    return st.fragment(timed)
+
+@fragment
+def paged_table(index, key, labels, column_config=None, page_sizes=PAGE_SIZES):
+    """TableIndex → 정렬·필터·바로가기 위젯 + 현재 페이지 행만 렌더."""
+    t_cols = st.columns([1, 1, 2, 2, 1, 1])
+    with t_cols[0]:
+        sort = st.selectbox("정렬", index.sort_columns, format_func=lambda c: labels.get(c, c), key=f"{key}_sort")
+    with t_cols[1]:
+        ascending = st.selectbox("순서", ["내림차순", "오름차순"], key=f"{key}_order") == "오름차순"
+    filters = {}
+    with t_cols[2]:
+        for col, options in index.filters.items():
+            filters[col] = st.multiselect(labels.get(col, col), options, key=f"{key}_filter_{col}")
+    positions = index.query(sort, ascending, filters)
+    with t_cols[3]:
+        jump = st.text_input(f"{labels.get(index.search_column, index.search_column)} 바로가기",
+                             key=f"{key}_jump", placeholder="앞글자 입력") if index.search_column else ""
+    with t_cols[4]:
+        page_size = st.selectbox("행 수", page_sizes, key=f"{key}_size")
+    pages = index.page_count(positions, page_size)
+
+    # 바로가기 입력이 바뀐 rerun 에서만 페이지를 옮긴다 (이후엔 페이지 입력을 그대로 따름)
+    if jump != st.session_state.get(f"{key}_jumped", ""):
+        st.session_state[f"{key}_jumped"] = jump
+        target = index.locate(positions, jump) if jump else None
+        if target is not None:
+            st.session_state[f"{key}_page"] = target // page_size + 1
+        elif jump:
+            st.toast(f"'{jump}' 로 시작하는 항목이 없습니다.")
+    with t_cols[5]:
+        # 바로가기가 Session State 로 페이지를 정하므로 value= 는 주지 않는다 (기본값 = min_value)
+        page = min(st.number_input("페이지", min_value=1, step=1, key=f"{key}_page"), pages)
+
+    st.caption(f"{len(positions):,}행 · {page}/{pages} 페이지")
+    st.dataframe(index.page(positions, page - 1, page_size), use_container_width=True, hide_index=True,
+                 column_config=column_config)
+
 COLORS = {
     'best': '#2ECC71', 'good': '#27AE60', 'ok': '#3498DB',
     'mid': '#F39C12', 'bad': '#E67E22', 'worst': '#E74C3C',
@@ -374,6 +284,21 @@ COLORS = {
     'ig': '#E1306C', 'fb': '#4267B2', 'threads': '#000000',
 }
 
+KEYWORD_LABELS = {
+    'segment': '세그먼트', 'keyword': '키워드', 'match_type': '매치유형', 'impressions': '노출',
+    'clicks': '클릭', 'cost': '비용', 'conversions': '전환', 'cpl': 'CPL', 'ctr': 'CTR', 'cvr': 'CVR',
+}
+
+FATIGUE_LABELS = {
+    'account': '계정', 'adset': '광고세트', 'creative': '소재', 'status': '상태', 'age_days': '집행 일수',
+    'life_days': '유효 수명(일)', 'refresh_date': '예상 교체일', 'days_to_refresh': '교체까지(일)',
+    'ctr_launch': '초기 CTR(%)', 'ctr_now': '현재 CTR(%)', 'ctr_weekly_change': 'CTR 주간 변화(%)',
+    'cvr_now': '현재 CVR(%)', 'cvr_weekly_change': 'CVR 주간 변화(%)', 'frequency_now': '현재 빈도',
+    'impressions': '노출', 'clicks': '클릭', 'conversions': '전환', 'cost': '비용', 'cpl': 'CPL',
+}
+
+GEO_LABELS = {'cpl': 'CPL', 'cost': '비용', 'conversions': '전환'}
+
 EFF_COLORS = {'BEST':'#2ECC71','CVR최고':'#27AE60','볼륨OK':'#3498DB','보통':'#F39C12','비효율':'#E67E22','WORST':'#E74C3C','MAIN':'#2E75B6','CTR최고':'#F39C12','가능성':'#9B59B6','표본부족':'#BDC3C7'}
 
 
@@ -392,6 +317,7 @@ with st.sidebar:
         "Meta Deep-Dive",
         "Meta 수정 제안",
         "추가 인사이트",
+        "Explore",
     ], index=0, label_visibility="collapsed")
 
     st.markdown("---")
@@ -400,10 +326,22 @@ with st.sidebar:
     st.markdown("**데이터 소스**")
     st.caption("Google Ads + Meta Ads")
     st.caption("(광고 플랫폼 데이터 기준)")
+    st.caption(f"데이터 버전: {dataset.version}")
+    if refresh_worker().rejected is not None:
+        st.caption(f"⚠ 새 데이터 버전 {refresh_worker().rejected.version} 검증 실패 — 이전 버전 유지 (Explore › 데이터 검증)")
     st.markdown("---")
     st.caption("Prepared by Casey")
     st.caption("2026.02")
 
+# 첫 화면은 data.py 집계 테이블로 바로 — 파생 객체가 든 첫 버전은 워커가 만드는 중
+if not refresh_worker().ready:
+    @st.fragment(run_every=2)
+    def wait_for_derived():
+        if refresh_worker().ready:
+            st.rerun()
+        st.info("분석 리포트를 준비하고 있습니다 — 준비되면 자동으로 표시됩니다.")
+    wait_for_derived()
+
 
 # ═══════════════════════════════════════════════
 # PAGE: Executive Summary
@@ -421,47 +359,82 @@ if page == "Executive Summary":
     # Channel breakdown cards
     col1, col2 = st.columns(2)
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div style="background:#f8faff; border-radius:12px; padding:24px; border-left:4px solid #4285F4;">
             <div style="font-size:14px; color:#666;">Google Ads</div>
-            <div style="font-size:28px; font-weight:900; color:#4285F4; margin:4px 0;">₩15,452,143 <span style="font-size:16px; font-weight:500;">(37.8%)</span></div>
+            <div style="font-size:28px; font-weight:900; color:#4285F4; margin:4px 0;">₩{kpi_google['spend']:,.0f} <span style="font-size:16px; font-weight:500;">({share_text(kpi_google)})</span></div>
             <div style="display:flex; gap:32px; margin-top:12px;">
                 <div>
                     <div style="font-size:12px; color:#888;">전환</div>
-                    <div style="font-size:22px; font-weight:900; color:#333;">1,638건</div>
+                    <div style="font-size:22px; font-weight:900; color:#333;">{kpi_google['conversions']:,.0f}건</div>
                 </div>
                 <div>
                     <div style="font-size:12px; color:#888;">CPL</div>
-                    <div style="font-size:22px; font-weight:900; color:#4285F4;">₩9,432 <span style="font-size:13px; font-weight:500;">평균 대비 +49%</span></div>
+                    <div style="font-size:22px; font-weight:900; color:#4285F4;">₩{kpi_google['cpl']:,.0f} <span style="font-size:13px; font-weight:500;">평균 대비 {vs_average(kpi_google)}</span></div>
                 </div>
             </div>
         </div>
         """, unsafe_allow_html=True)
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div style="background:#fff8f5; border-radius:12px; padding:24px; border-left:4px solid #FF6B35;">
             <div style="font-size:14px; color:#666;">Meta Ads</div>
-            <div style="font-size:28px; font-weight:900; color:#FF6B35; margin:4px 0;">₩25,463,928 <span style="font-size:16px; font-weight:500;">(62.2%)</span></div>
+            <div style="font-size:28px; font-weight:900; color:#FF6B35; margin:4px 0;">₩{kpi_meta['spend']:,.0f} <span style="font-size:16px; font-weight:500;">({share_text(kpi_meta)})</span></div>
             <div style="display:flex; gap:32px; margin-top:12px;">
                 <div>
                     <div style="font-size:12px; color:#888;">전환</div>
-                    <div style="font-size:22px; font-weight:900; color:#333;">4,835건</div>
+                    <div style="font-size:22px; font-weight:900; color:#333;">{kpi_meta['conversions']:,.0f}건</div>
                 </div>
                 <div>
                     <div style="font-size:12px; color:#888;">CPL</div>
-                    <div style="font-size:22px; font-weight:900; color:#FF6B35;">₩5,267 <span style="font-size:13px; font-weight:500;">평균 대비 −17%</span></div>
+                    <div style="font-size:22px; font-weight:900; color:#FF6B35;">₩{kpi_meta['cpl']:,.0f} <span style="font-size:13px; font-weight:500;">평균 대비 {vs_average(kpi_meta)}</span></div>
                 </div>
             </div>
         </div>
         """, unsafe_allow_html=True)
 
     st.markdown("")
-    st.markdown("""
+    st.markdown(f"""
     <div style="text-align:center; font-size:18px; color:#666; margin:12px 0;">
-        총 광고비 <strong style="color:#1B3A5C; font-size:24px;">₩40,916,071</strong> · 총 전환 <strong style="color:#1B3A5C; font-size:24px;">6,473건</strong> · 전체 CPL <strong style="color:#1B3A5C; font-size:24px;">₩6,322</strong>
+        총 광고비 <strong style="color:#1B3A5C; font-size:24px;">₩{kpi['total']['spend']:,.0f}</strong> · 총 전환 <strong style="color:#1B3A5C; font-size:24px;">{kpi['total']['conversions']:,.0f}건</strong> · 전체 CPL <strong style="color:#1B3A5C; font-size:24px;">₩{kpi['total']['cpl']:,.0f}</strong>
     </div>
     """, unsafe_allow_html=True)
 
+    # ── B-2. 중복 제거 전환 · 기여 모델 ──
+    _attr = dataset.derived.get('attribution')
+    if _attr is not None:
+        section("중복 제거 전환 · 기여 모델")
+        _ch = _attr['channel']
+        _platform = _ch['platform_conv'].sum()
+        st.markdown(f"""
+        <div class="kpi-container">
+            {kpi_card("실제 전환 (유저 로그)", f"{_attr['conversions']:,}건", f"매체 보고 합산 {_platform:,.0f}건 대비 {(_attr['conversions'] / _platform - 1) * 100:+.0f}%")}
+            {kpi_card("크로스채널 전환", f"{_attr['multi_channel']:,}건", f"전환의 {_attr['multi_channel'] / max(_attr['conversions'], 1) * 100:.1f}% — 두 매체가 각각 집계")}
+            {kpi_card("터치 없는 전환", f"{_attr['unattributed']:,}건", "룩백 30일 안 광고 터치 없음")}
+        </div>
+        """, unsafe_allow_html=True)
+        @fragment
+        def attribution_table():
+            _model = st.radio("기여 모델", MODELS, format_func=MODEL_LABELS.get, horizontal=True, key="attr_model")
+            _view = _ch[['channel', 'cost', 'platform_conv', 'platform_cpl', _model, f'{_model}_cpl']]
+            st.dataframe(_view, use_container_width=True, hide_index=True, column_config=column_config(
+                currency=['cost', 'platform_cpl', f'{_model}_cpl'],
+                labels={'channel': '채널', 'cost': '광고비', 'platform_conv': '매체 보고 전환', 'platform_cpl': '매체 보고 CPL',
+                        _model: f'기여 전환 ({MODEL_LABELS[_model]})', f'{_model}_cpl': f'기여 CPL ({MODEL_LABELS[_model]})'}))
+            with st.expander("캠페인 · 플랫폼별 기여 CPL / 첫 터치 주 코호트"):
+                st.dataframe(_attr['campaign'][['channel', 'campaign', 'cost', 'touches'] + MODELS + [f'{m}_cpl' for m in MODELS]],
+                             use_container_width=True, hide_index=True, column_config=column_config(
+                    currency=['cost'] + [f'{m}_cpl' for m in MODELS], counts=['touches'],
+                    labels={'channel': '채널', 'campaign': '캠페인 · 플랫폼', 'cost': '광고비', 'touches': '터치',
+                            **MODEL_LABELS, **{f'{m}_cpl': f'{MODEL_LABELS[m]} CPL' for m in MODELS}}))
+                st.dataframe(_attr['cohorts'], use_container_width=True, hide_index=True, column_config=column_config(
+                    counts=['users', 'converted', 'conversions'], percent=['conversion_rate'],
+                    labels={'week': '첫 터치 주', 'channel': '첫 터치 채널', 'users': '유저', 'converted': '전환 유저',
+                            'conversions': '전환', 'conversion_rate': '전환율'}))
+        attribution_table()
+        st.caption("매체 보고 전환은 각 광고관리자가 자기 매체 터치만 보고 센 값이라, 두 매체를 모두 거친 유저는 양쪽에 잡힌다. "
+                   "기여 전환은 유저별 터치 경로에서 전환 1건을 모델에 따라 나눈 값으로 채널 합이 실제 전환 수와 같다.")
+
     divider()
 
     # ── C. TOP FINDINGS ──
@@ -544,6 +517,33 @@ if page == "Executive Summary":
     </div>
     """, unsafe_allow_html=True)
 
+    # ── F. 예약·매출 (내부 DB 연동) ──
+    _bookings = dataset.derived.get('bookings')
+    if _bookings is not None:
+        divider()
+        section("예약·매출 (내부 DB 연동)")
+        _t = _bookings['totals']
+        st.markdown(f"""
+        <div class="kpi-container">
+            {kpi_card("상담신청 → 예약", f"{_t['bookings']:,}건", f"리드 {_t['leads']:,}건 중 {_t['booking_rate']}%")}
+            {kpi_card("예약 매출", fmt(_t['revenue']), "취소 반영")}
+            {kpi_card("예약당 광고비", f"₩{_t['cost_per_booking']:,}" if _t['cost_per_booking'] else "—", "전체 광고비 ÷ 예약")}
+            {kpi_card("ROAS", f"{_t['roas']:,.0f}%" if _t['roas'] else "—", "예약 매출 ÷ 광고비", "green")}
+        </div>
+        """, unsafe_allow_html=True)
+        @fragment
+        def booking_table():
+            _level = st.radio("기준", ["캠페인", "세그먼트 · 광고세트", "키워드 · 소재"], horizontal=True, key="booking_level")
+            _level = {"캠페인": 'campaign', "세그먼트 · 광고세트": 'ad_group', "키워드 · 소재": 'asset'}[_level]
+            st.dataframe(_bookings['views'][_level].head(500), use_container_width=True, hide_index=True, column_config=column_config(
+                currency=['revenue', 'cost', 'cost_per_booking'], counts=['leads', 'bookings'], percent=['booking_rate', 'roas'],
+                labels={'channel': '채널', 'campaign': '캠페인 · 플랫폼', 'ad_group': '세그먼트 · 광고세트', 'asset': '키워드 · 소재',
+                        'leads': '상담신청', 'bookings': '예약', 'revenue': '매출', 'booking_rate': '예약률',
+                        'cost': '광고비', 'cost_per_booking': '예약당 광고비', 'roas': 'ROAS'}))
+        booking_table()
+        st.caption("상담신청(lead)의 gclid·fbclid 로 내부 예약 DB 와 연결. 취소는 예약·매출에서 차감. "
+                   + (f"리드가 아직 동기화되지 않은 예약 {_bookings['pending']:,}건은 다음 갱신 때 반영." if _bookings['pending'] else ""))
+
 
 # ═══════════════════════════════════════════════
 # PAGE: Google Deep-Dive (MERGED with keyword inventory)
@@ -557,8 +557,8 @@ elif page == "Google Deep-Dive":
     # ── Key KPI ──
     st.markdown(f"""
     <div class="kpi-container">
-        {kpi_card("총 광고비", f"₩{GOOGLE_SPEND:,}", "전체의 37.8%")}
-        {kpi_card("총 전환", f"{GOOGLE_CONV:,}건", f"CPL ₩{GOOGLE_CPL:,}")}
+        {kpi_card("총 광고비", f"₩{kpi_google['spend']:,.0f}", f"전체의 {share_text(kpi_google)}")}
+        {kpi_card("총 전환", f"{kpi_google['conversions']:,.0f}건", f"CPL ₩{kpi_google['cpl']:,.0f}")}
         {kpi_card("PMax CPL", f"₩{PMAX_BENCHMARK:,}", "벤치마크 (자동 최적화)")}
         {kpi_card("검색 CPL", f"₩{SEARCH_CPL:,}", "PMax의 1.9배 — 개선 여지", "red")}
     </div>
@@ -574,14 +574,16 @@ elif page == "Google Deep-Dive":
     PMax의 CPL이 벤치마크. 검색광고가 이보다 높으면 <strong>개선 여지가 있다</strong>는 뜻입니다.
     """)
 
-    # Filter to weeks W45-W05 only (exclude partial W44)
-    gcw = google_campaign_weekly[google_campaign_weekly['week'].isin([f'W{str(i).zfill(2)}' for i in list(range(45, 53)) + list(range(1, 6))])]
+    # Exclude the partial W44 of the baseline report (fact rollups keep every ISO year-week)
+    gcw = google_campaign_weekly
+    if dataset.source == 'baseline':
+        gcw = gcw[gcw['week'] != 'W44']
 
     chart_col1, chart_col2 = st.columns([3, 2])
 
     with chart_col1:
-        fig = px.line(gcw, x='week', y='cpl', color='campaign', markers=True,
-                      color_discrete_map={'PMax': COLORS['best'], '검색광고(내국인)': COLORS['worst'], '검색광고(외국인)': COLORS['mid']})
+        fig = line_figure(gcw, x='week', y='cpl', color='campaign', markers=True,
+                          color_discrete_map={'PMax': COLORS['best'], '검색광고(내국인)': COLORS['worst'], '검색광고(외국인)': COLORS['mid']})
         fig.update_layout(height=420, plot_bgcolor='rgba(0,0,0,0)',
                           xaxis=dict(title='주차', showgrid=True, gridcolor='#f0f0f0'),
                           yaxis=dict(title='CPL (₩)', showgrid=True, gridcolor='#f0f0f0'),
@@ -597,7 +599,7 @@ elif page == "Google Deep-Dive":
         fig2.add_trace(go.Bar(
             x=camp_agg['캠페인'], y=camp_agg['CPL'],
             marker_color=camp_colors,
-            text=[f'₩{v:,}' for v in camp_agg['CPL']],
+            texttemplate=won_text('y'),
             textposition='outside', textfont=dict(size=12),
         ))
         fig2.add_hline(y=PMAX_BENCHMARK, line_dash="dot", line_color=COLORS['best'], line_width=1.5,
@@ -609,6 +611,31 @@ elif page == "Google Deep-Dive":
                            margin=dict(l=20, r=20, t=40, b=20))
         st.plotly_chart(fig2, use_container_width=True)
 
+    # 일별 추이 — 구간을 좁히면 해당 구간만 원본 일 단위로 다시 그린다 (긴 구간은 다운샘플)
+    _daily = dataset.derived.get('google_daily')
+    if _daily is not None and len(_daily.dates) > 1:
+        _first, _last = _daily.dates[0].item(), _daily.dates[-1].item()
+        @fragment
+        def daily_chart():
+            d_col1, d_col2, d_col3 = st.columns([1, 2, 3])
+            with d_col1:
+                d_metric = st.selectbox("지표", ["cpl", "cost", "conversions"], key="daily_metric",
+                                        format_func={"cpl": "CPL", "cost": "비용", "conversions": "전환"}.get)
+            with d_col2:
+                d_series = st.multiselect("세그먼트", _daily.labels, key="daily_series")
+            with d_col3:
+                d_range = st.slider("기간", min_value=_first, max_value=_last, value=(_first, _last), key="daily_range")
+            _dd = _daily.frame(d_metric, *d_range, series=d_series or None)
+            fig = line_figure(_dd, x='date', y=d_metric, color='series')
+            fig.update_layout(height=380, plot_bgcolor='rgba(0,0,0,0)',
+                              xaxis=dict(title='', showgrid=True, gridcolor='#f0f0f0'),
+                              yaxis=dict(title={"cpl": "CPL (₩)", "cost": "비용 (₩)", "conversions": "전환"}[d_metric],
+                                         showgrid=True, gridcolor='#f0f0f0'),
+                              title=dict(text='세그먼트별 일별 추이', font=dict(size=14)),
+                              margin=dict(l=20, r=20, t=40, b=20))
+            st.plotly_chart(fig, use_container_width=True)
+        daily_chart()
+
     col1, col2 = st.columns(2)
     with col1:
         insight("""
@@ -657,7 +684,7 @@ elif page == "Google Deep-Dive":
         x=df_sorted['cpl'],
         orientation='h',
         marker_color=bar_colors,
-        text=[f'₩{v:,}' for v in df_sorted['cpl']],
+        texttemplate=won_text('x'),
         textposition='outside',
         textfont=dict(size=12, family='Noto Sans KR'),
     ))
@@ -698,13 +725,138 @@ elif page == "Google Deep-Dive":
     display_df = google_intent[google_intent['segment'] != '외국인'].copy()
     display_df = display_df[['segment', 'cpl', 'cost', 'impressions', 'clicks', 'conversions', 'keywords']]
     display_df.columns = ['세그먼트', 'CPL', '비용', '노출', '클릭', '전환', '키워드 수']
-    display_df['비용'] = display_df['비용'].apply(lambda x: f'₩{x:,}')
-    display_df['CPL'] = display_df['CPL'].apply(lambda x: f'₩{x:,}')
-    display_df['노출'] = display_df['노출'].apply(lambda x: f'{x:,}')
-    st.dataframe(display_df, use_container_width=True, hide_index=True)
+    st.dataframe(display_df, use_container_width=True, hide_index=True,
+                 column_config=column_config(currency=['CPL', '비용'], counts=['노출', '클릭', '전환', '키워드 수']))
 
     st.caption("**참고**: 키워드 보고서 기준 (검색 캠페인 비용의 약 79% 커버)")
 
+    # 키워드 보고서 — 수십만 행이라 서버에서 정렬·필터하고 한 페이지만 보낸다
+    st.markdown("**키워드 보고서**")
+    _kw_index = dataset.derived.get('keyword_index')
+    if _kw_index is None:
+        st.caption("키워드 일별 팩트(google_keyword_daily)가 적재되면 키워드 단위 보고서가 표시됩니다.")
+    else:
+        paged_table(_kw_index, "kw_table", KEYWORD_LABELS, column_config(
+            currency=['cost', 'cpl'], counts=['impressions', 'clicks'], percent=['ctr', 'cvr'], labels=KEYWORD_LABELS))
+
+    divider()
+
+    # ── B-2. 검색어 n-gram — 세그먼트 안에 섞인 다른 의도 찾기 ──
+    section("검색어 n-gram 분석: 새 의도 세그먼트 · 제외 키워드 후보")
+    _ngrams = dataset.derived.get('ngrams')
+    if _ngrams is None:
+        st.caption("키워드 일별 팩트(google_keyword_daily)가 적재되면 검색어를 단어 · 두 단어 묶음으로 쪼개 "
+                   "세그먼트 안의 다른 의도와 제외 키워드 후보를 찾아 표시합니다.")
+    else:
+        _sugg, _neg = _ngrams['suggestions'], _ngrams['negatives']
+        st.markdown(f"""
+        <div class="kpi-container">
+            {kpi_card("분석한 n-gram", f"{_ngrams['ngrams']:,}개", "세그먼트 × 단어 · 두 단어 묶음")}
+            {kpi_card("세그먼트 분리 후보", f"{_sugg['segment'].nunique()}개 세그먼트", f"n-gram {len(_sugg):,}개", "orange")}
+            {kpi_card("제외 키워드 후보", f"{len(_neg):,}개", f"{fmt(_neg['cost'].sum())} 전환 없이 지출", "red")}
+        </div>
+        """, unsafe_allow_html=True)
+        insight("""
+        "용달/화물", "기타(영어+이삿짐센터)"처럼 키워드가 많은 세그먼트는 같은 CPL 로 묶여 있지만,
+        검색어를 쪼개 보면 <strong>세그먼트 평균보다 훨씬 싸거나 비싼 단어</strong>가 섞여 있습니다.<br>
+        비용 비중이 크고 CPL 이 평균과 크게 다른 n-gram 은 <strong>별도 광고그룹(전용 카피 · 입찰)</strong>으로 분리할 후보입니다.
+        """)
+        st.markdown("**세그먼트 분리 후보**")
+        st.dataframe(_sugg, use_container_width=True, hide_index=True, column_config=column_config(
+            currency=['cost', 'cpl', 'segment_cpl'], labels={
+                'segment': '세그먼트', 'ngram': 'n-gram', 'n': '단어 수', 'action': '제안', 'share': '세그먼트 비용 비중(%)',
+                'cost': '비용', 'conversions': '전환', 'cpl': 'CPL', 'segment_cpl': '세그먼트 CPL',
+                'cpl_ratio': 'CPL 배수', 'collided': '해시 충돌'}))
+        st.markdown("**제외 키워드 후보** (전환 0)")
+        st.dataframe(_neg.head(200), use_container_width=True, hide_index=True, column_config=column_config(
+            currency=['cost'], counts=['clicks', 'impressions'], labels={
+                'n': '단어 수', 'ngram': 'n-gram', 'cost': '비용', 'clicks': '클릭', 'impressions': '노출',
+                'conversions': '전환', 'segments': '세그먼트', 'collided': '해시 충돌'}))
+        st.caption(f"기준: 분리 후보 = 세그먼트 비용의 {MIN_SHARE:.0%} 이상 · 전환 {MIN_CONVERSIONS}건 이상 · CPL 이 세그먼트 평균의 "
+                   f"{SPLIT_RATIO[0]}배 이하 또는 {SPLIT_RATIO[1]}배 이상. 제외 후보 = 전환 없이 ₩{NEGATIVE_COST:,} 이상 지출. "
+                   f"해시 충돌 표시는 다른 n-gram 과 카운터를 공유해 합계가 과대일 수 있음.")
+
+    divider()
+
+    # ── 지역별 성과 ──
+    section("지역별 성과: 지역+이사 검색어 · 유저 위치")
+    _geo = dataset.derived.get('geo')
+    if _geo is None:
+        st.caption("키워드 일별 팩트 또는 Google 위치 보고서(google_location_daily)가 적재되면 검색어 속 지역명과 "
+                   "유저 위치를 시/도 · 시/군/구로 묶어 지역별 비용 · CPL 을 지도로 표시합니다.")
+    else:
+        insight("""
+        "지역+이사" 세그먼트(키워드 53개, CPL ₩17,133)와 PMax "맞춤타겟(지역이사)"는 보고서에서 한 줄이지만,
+        지역별로 나누면 <strong>같은 세그먼트 안에서도 CPL 이 몇 배씩 차이</strong>납니다.<br>
+        지도에서 시/도를 누르면 시/군/구 · 주간 추이로 내려갑니다 — CPL 이 낮은 지역은 <strong>지역 키워드 · 위치 입찰 강화</strong>,
+        높은 지역은 <strong>입찰 조정(-) 또는 제외</strong> 후보입니다.
+        """)
+
+        @fragment
+        def geo_view():
+            g_cols = st.columns([2, 1, 3])
+            with g_cols[0]:
+                _source = st.radio("지역 기준", _geo.sources(), format_func=SOURCE_LABELS.get, horizontal=True, key="geo_source")
+            with g_cols[1]:
+                _metric = st.selectbox("색", ['cpl', 'cost', 'conversions'], format_func=GEO_LABELS.get, key="geo_metric")
+            with g_cols[2]:
+                # 옵션은 주 위치(cube.weeks 순서) — 라벨은 표시용
+                _lo, _hi = st.select_slider("주차", options=range(len(_geo.weeks)), value=(0, len(_geo.weeks) - 1),
+                                            format_func=lambda i: _geo.week_labels[i], key="geo_weeks")
+            _weeks = slice(_lo, _hi + 1)
+            _sido = _geo.by_sido(_source, _weeks)
+            if _sido.empty:
+                st.caption("선택한 기간에 지역을 알 수 있는 비용이 없습니다.")
+                return
+            _rated = _sido[_sido['conversions'] >= GEO_MIN_CONVERSIONS]
+            _best = _rated.loc[_rated['cpl'].idxmin()] if len(_rated) else None
+            _worst = _rated.loc[_rated['cpl'].idxmax()] if len(_rated) else None
+            st.markdown(f"""
+            <div class="kpi-container">
+                {kpi_card("지역 식별 비용", f"{_geo.coverage(_source)}%", SOURCE_LABELS[_source])}
+                {kpi_card("최다 지출", _sido.at[0, 'short'], f"{fmt(_sido.at[0, 'cost'])} · 비중 {_sido.at[0, 'share']}%")}
+                {kpi_card("최저 CPL", _best['short'] if _best is not None else "—",
+                          f"₩{_best['cpl']:,.0f}" if _best is not None else "", "green")}
+                {kpi_card("최고 CPL", _worst['short'] if _worst is not None else "—",
+                          f"₩{_worst['cpl']:,.0f}" if _worst is not None else "", "red")}
+            </div>
+            """, unsafe_allow_html=True)
+
+            # 지도 클릭 → 시/도 선택 (새로 누른 점만 반영해 선택 박스로 고른 값을 덮지 않는다)
+            _options = list(_sido['region'])
+            _event = st.session_state.get("geo_map")
+            _points = _event.selection.points if _event else []
+            _clicked = _points[0].get('customdata') if _points else None
+            if _clicked in _options and _clicked != st.session_state.get("geo_map_last"):
+                st.session_state["geo_region"] = _clicked
+            st.session_state["geo_map_last"] = _clicked
+            if st.session_state.get("geo_region") not in _options:
+                st.session_state["geo_region"] = _options[0]
+
+            map_col, drill_col = st.columns([3, 2])
+            with drill_col:
+                _region = st.selectbox("시/도", _options, format_func=lambda r: _sido.set_index('region').at[r, 'short'],
+                                       key="geo_region")
+                _sub = _geo.by_sigungu(_source, _region, _weeks)
+                st.dataframe(_sub, use_container_width=True, hide_index=True, height=260, column_config=column_config(
+                    currency=['cost', 'cpl'], counts=['clicks', 'impressions'], labels={
+                        'region': '시/군/구', 'cost': '비용', 'conversions': '전환', 'clicks': '클릭',
+                        'impressions': '노출', 'cpl': 'CPL', 'share': '시/도 내 비중(%)'}))
+                _trend = _geo.weekly(_source, _region, _weeks).assign(region=_region)
+                fig = line_figure(_trend, x='week', y='cpl', color='region', markers=True,
+                                  color_discrete_map={_region: COLORS['blue']})
+                fig.update_layout(height=220, margin=dict(l=10, r=10, t=30, b=10), plot_bgcolor='rgba(0,0,0,0)',
+                                  title=dict(text='주간 CPL', font=dict(size=13)), xaxis_title=None, yaxis_title=None)
+                st.plotly_chart(fig, use_container_width=True)
+            with map_col:
+                fig = region_figure(_sido, _metric, load_geojson(), selected=_region)
+                fig.update_layout(height=520, margin=dict(l=0, r=0, t=10, b=0))
+                st.plotly_chart(fig, use_container_width=True, on_select="rerun", selection_mode="points", key="geo_map")
+        geo_view()
+        st.caption(f"검색어 속 지역 = 검색어(없으면 키워드)에 든 지역명 기준 (PMax 제외) · 유저 위치 = Google 위치 보고서. "
+                   f"최저 · 최고 CPL 은 전환 {GEO_MIN_CONVERSIONS}건 이상 시/도만. "
+                   f"{'시/도 경계 GeoJSON 단계구분도' if load_geojson() is not None else '시/도 중심점 버블 (MOVEUNIV_GEOJSON 에 시/도 경계를 두면 단계구분도)'}.")
+
     divider()
 
     # ── C. CPL 비효율 원인 분석 ──
@@ -795,6 +947,32 @@ elif page == "Google 수정 제안":
 
     divider()
 
+    # ── 0전환 키워드 낭비 탐지 (적재마다 새 행만 반영되는 누적 카운터) ──
+    section("0전환 키워드 낭비 탐지")
+    _waste = dataset.derived.get('waste')
+    if _waste is None:
+        st.caption("키워드 일별 팩트(google_keyword_daily)가 적재되면 키워드별 누적 비용·전환으로 낭비 키워드를 찾아 표시합니다.")
+    else:
+        _zero = _waste[_waste['status'] == '전환 0']
+        st.markdown(f"""
+        <div class="kpi-container">
+            {kpi_card("전환 0 키워드", f"{len(_zero):,}개", f"{fmt(_zero['cost'].sum())} 지출", "red")}
+            {kpi_card("장기 미전환 키워드", f"{len(_waste) - len(_zero):,}개", f"마지막 전환 후 ₩{STALE_COST:,}+ 지출")}
+            {kpi_card("예상 절감액", f"{fmt(_waste['monthly_waste'].sum())}/월", "제외 시 최근 지출 속도 기준", "green")}
+        </div>
+        """, unsafe_allow_html=True)
+        st.dataframe(_waste.head(200), use_container_width=True, hide_index=True, column_config=column_config(
+            currency=['cost', 'cost_since_conv', 'monthly_waste'], counts=['clicks', 'days_since_conv'],
+            labels={'account': '계정', 'campaign': '캠페인', 'segment': '세그먼트', 'keyword': '키워드',
+                    'match_type': '매치유형', 'status': '상태', 'cost': '누적 비용', 'clicks': '클릭',
+                    'conversions': '전환', 'cost_since_conv': '마지막 전환 후 비용',
+                    'days_since_conv': '경과 일수', 'monthly_waste': '월 절감 추정'}))
+        st.caption(f"기준: 전환 없이 ₩{ZERO_CONV_COST:,} 이상 (검색 평균 CPL) 또는 마지막 전환 후 ₩{STALE_COST:,} 이상 지출. "
+                   f"월 절감 추정 = 마지막 전환(또는 첫 노출)부터 데이터 마지막 날까지 일평균 비용 × 30.4일 "
+                   f"(최근 {ACTIVE_DAYS}일 지출이 없는 키워드는 0).")
+
+    divider()
+
     # ── Section 3: 수정 제안 ──
     section("수정 제안")
 
@@ -830,15 +1008,16 @@ elif page == "Google 수정 제안":
 
     proposal_data = pd.DataFrame({
         '세그먼트': ['브랜드', '원룸/소형', '가격/견적', '포장이사', '기타(영어)', '일반이사', '지역+이사', '용달/화물'],
-        '현재 예산': ['39만', '36만', '28만', '41만', '223만', '46만', '49만', '177만'],
-        '현재 CPL': ['₩4,655', '₩12,769', '₩14,980', '₩13,747', '₩11,509', '₩14,395', '₩17,133', '₩17,061'],
+        '현재 예산': [39, 36, 28, 41, 223, 46, 49, 177],
+        '현재 CPL': [4655, 12769, 14980, 13747, 11509, 14395, 17133, 17061],
         '현재 전환': [84, 28, 19, 30, 193, 32, 28, 104],
         '방향': ['→ 유지', '↑↑ 증액', '↑↑ 증액', '↑ 소폭증액', '→ 카피최적화', '↓ 감액', '↓ 감액', '↓↓ 대폭감액'],
-        '제안 예산': ['40만', '120만', '80만', '60만', '220만', '35만', '30만', '50만'],
-        '목표 CPL': ['₩4,655', '₩12,769', '₩14,980', '₩13,747', '₩9,207', '₩11,516', '₩13,706', '₩13,649'],
+        '제안 예산': [40, 120, 80, 60, 220, 35, 30, 50],
+        '목표 CPL': [4655, 12769, 14980, 13747, 9207, 11516, 13706, 13649],
         '예상 전환': [86, 94, 53, 44, 239, 30, 22, 37],
     })
-    st.dataframe(proposal_data, use_container_width=True, hide_index=True)
+    st.dataframe(proposal_data, use_container_width=True, hide_index=True,
+                 column_config=column_config(currency=['현재 CPL', '목표 CPL'], man_won=['현재 예산', '제안 예산']))
 
 
 # ═══════════════════════════════════════════════
@@ -853,8 +1032,8 @@ elif page == "Meta Deep-Dive":
     # ── Key KPI ──
     st.markdown(f"""
     <div class="kpi-container">
-        {kpi_card("총 광고비", f"₩{META_SPEND:,}", "전체의 62.2%")}
-        {kpi_card("총 전환", f"{META_CONV:,}건", f"CPL ₩{META_CPL:,}")}
+        {kpi_card("총 광고비", f"₩{kpi_meta['spend']:,.0f}", f"전체의 {share_text(kpi_meta)}")}
+        {kpi_card("총 전환", f"{kpi_meta['conversions']:,.0f}건", f"CPL ₩{kpi_meta['cpl']:,.0f}")}
         {kpi_card("Threads CPL", "₩3,800", "전 플랫폼 최저", "green")}
         {kpi_card("비효율 예산 비중", "70%", "예산 재배분 필요", "red")}
     </div>
@@ -877,13 +1056,10 @@ elif page == "Meta Deep-Dive":
     ]
 
     # 대표 소재 이미지 (이미지 먼저, 차트 아래)
-    import os
-    _img_dir = os.path.join(os.path.dirname(__file__), "images")
+    _assets = creative_assets()
     dd_col1, dd_col2, dd_col3 = st.columns(3)
     with dd_col1:
-        _p = os.path.join(_img_dir, "meta_isagagyeok_ad.png")
-        if os.path.exists(_p):
-            st.image(_p)
+        st.markdown(_assets.picture_html("meta_isagagyeok_ad", alt="이사가격 대표 소재"), unsafe_allow_html=True)
         st.markdown("""
         <div style="text-align:center; font-size:13px; line-height:1.8;">
             <strong>이사가격</strong> 대표 소재<br>
@@ -893,9 +1069,7 @@ elif page == "Meta Deep-Dive":
         </div>
         """, unsafe_allow_html=True)
     with dd_col2:
-        _p = os.path.join(_img_dir, "meta_everytime_ad.png")
-        if os.path.exists(_p):
-            st.image(_p)
+        st.markdown(_assets.picture_html("meta_everytime_ad", alt="에브리타임 대표 소재"), unsafe_allow_html=True)
         st.markdown("""
         <div style="text-align:center; font-size:13px; line-height:1.8;">
             <strong>에브리타임</strong> 대표 소재<br>
@@ -905,9 +1079,7 @@ elif page == "Meta Deep-Dive":
         </div>
         """, unsafe_allow_html=True)
     with dd_col3:
-        _p = os.path.join(_img_dir, "meta_price_ad.png")
-        if os.path.exists(_p):
-            st.image(_p)
+        st.markdown(_assets.picture_html("meta_price_ad", alt="가격소재 대표 소재"), unsafe_allow_html=True)
         st.markdown("""
         <div style="text-align:center; font-size:13px; line-height:1.8;">
             <strong>가격소재</strong> 대표 소재<br>
@@ -925,7 +1097,7 @@ elif page == "Meta Deep-Dive":
     fig = go.Figure()
     fig.add_trace(go.Bar(
         x=df_3['소재_short'], y=df_3['CPL'], marker_color=colors_3,
-        text=[f'₩{v:,}' for v in df_3['CPL']], textposition='outside',
+        texttemplate=won_text('y'), textposition='outside',
         textfont=dict(size=13),
     ))
     fig.update_layout(height=350, plot_bgcolor='rgba(0,0,0,0)',
@@ -936,6 +1108,73 @@ elif page == "Meta Deep-Dive":
 
     divider()
 
+    # ── 소재 갤러리 (전체 소재, 페이지 단위 로딩) ──
+    section("소재 갤러리")
+
+    _index = dataset.derived.get('creative_index')
+    @fragment
+    def creative_gallery():
+        g_col1, g_col2, g_col3, g_col4, g_col5 = st.columns([1, 1, 2, 2, 1])
+        with g_col1:
+            g_sort = st.selectbox("정렬", list(SORT_KEYS), key="gallery_sort")
+        with g_col2:
+            g_order = st.selectbox("순서", ["기본", "오름차순", "내림차순"], key="gallery_order")
+        with g_col3:
+            g_adsets = st.multiselect("광고세트", _index.adsets, key="gallery_adsets")
+        with g_col4:
+            g_search = st.text_input("소재 검색", key="gallery_search")
+        _pos = _index.query(g_sort, {"기본": None, "오름차순": True, "내림차순": False}[g_order], g_adsets, search=g_search)
+        _pages = _index.page_count(_pos)
+        with g_col5:
+            g_page = min(st.number_input("페이지", min_value=1, value=1, step=1, key="gallery_page"), _pages)
+
+        st.caption(f"소재 {len(_pos):,}개 · {g_page}/{_pages} 페이지")
+        st.markdown(creative_gallery_html(_index.page(_pos, g_page - 1), _assets, show_account=len(_index.accounts) > 1), unsafe_allow_html=True)
+    if _index is not None:
+        creative_gallery()
+
+    divider()
+
+    # ── 소재 피로도: 일별 CTR 감쇠를 소재마다 적합 (새 날짜만 누적) ──
+    section("소재 피로도: CTR 감쇠와 교체 시점")
+    _fatigue = dataset.derived.get('fatigue')
+    if _fatigue is None:
+        st.caption("소재 일별 팩트(meta_creative_daily)가 적재되면 소재별 CTR · CVR · 빈도 감쇠를 적합해 교체 시점을 예측합니다.")
+    else:
+        _fitted = _fatigue[_fatigue['status'] != '데이터 부족']
+        _due = _fitted[_fitted['status'] == '교체 필요']
+        _soon = _fitted[_fitted['status'] == '교체 임박']
+        st.markdown(f"""
+        <div class="kpi-container">
+            {kpi_card("교체 필요 소재", f"{len(_due):,}개", f"{fmt(_due['cost'].sum())} 집행 · 유효 수명 경과", "red")}
+            {kpi_card("2주 내 교체", f"{len(_soon):,}개", f"CTR 이 초기 대비 {1 - FATIGUE_LEVEL:.0%} 하락 예정", "orange")}
+            {kpi_card("중앙 유효 수명", f"{_fitted['life_days'].median():.0f}일" if _fitted['life_days'].notna().any() else "-",
+                      f"적합 소재 {len(_fitted):,}개 기준")}
+        </div>
+        """, unsafe_allow_html=True)
+
+        fig = go.Figure()
+        for _, row in _fitted.nlargest(8, 'cost').iterrows():
+            _age, _rel = decay_curve(row)
+            _color = {'교체 필요': COLORS['worst'], '교체 임박': COLORS['mid']}.get(row['status'], COLORS['ok'])
+            fig.add_trace(go.Scatter(x=_age, y=_rel, mode='lines', name=row['creative'], line=dict(color=_color, width=2),
+                                     hovertemplate='%{x}일차 · 초기 대비 %{y:.0f}%<extra>' + row['creative'] + '</extra>'))
+            fig.add_trace(go.Scatter(x=[row['age_days']], y=[_rel[min(int(row['age_days']), len(_rel) - 1)]], mode='markers',
+                                     marker=dict(color=_color, size=9), showlegend=False, hoverinfo='skip'))
+        fig.add_hline(y=100 * FATIGUE_LEVEL, line_dash="dash", line_color=COLORS['worst'],
+                      annotation_text=f"유효 수명 기준 ({FATIGUE_LEVEL:.0%})", annotation_position="bottom right")
+        fig.update_layout(height=420, plot_bgcolor='rgba(0,0,0,0)', margin=dict(l=20, r=20, t=40, b=20),
+                          xaxis=dict(title='집행 일수'), yaxis=dict(title='초기 대비 CTR (%)', showgrid=True, gridcolor='#f0f0f0'),
+                          title=dict(text='비용 상위 소재의 CTR 감쇠 곡선 (● = 현재)', font=dict(size=14)))
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(_fitted.head(200), use_container_width=True, hide_index=True, column_config=column_config(
+            currency=['cost', 'cpl'], counts=['impressions', 'clicks', 'conversions'], labels=FATIGUE_LABELS))
+        st.caption(f"일별 로그 CTR 을 집행 일수에 대해 노출 가중 직선 적합. 유효 수명 = CTR 이 초기의 {FATIGUE_LEVEL:.0%} 가 되는 날. "
+                   f"집행 {MIN_DAYS}일 · 노출 {MIN_IMPRESSIONS:,} 미만 소재는 제외 ({len(_fatigue) - len(_fitted):,}개).")
+
+    divider()
+
     # 플랫폼 비교
     section("플랫폼별 주간 CPL 추이")
 
@@ -944,8 +1183,8 @@ elif page == "Meta Deep-Dive":
     meta_chart_col1, meta_chart_col2 = st.columns([3, 2])
 
     with meta_chart_col1:
-        fig = px.line(mpw, x='week', y='cpl', color='platform', markers=True,
-                      color_discrete_map={'Instagram': COLORS['ig'], 'Facebook': COLORS['fb'], 'Threads': COLORS['threads']})
+        fig = line_figure(mpw, x='week', y='cpl', color='platform', markers=True,
+                          color_discrete_map={'Instagram': COLORS['ig'], 'Facebook': COLORS['fb'], 'Threads': COLORS['threads']})
         fig.update_layout(height=400, plot_bgcolor='rgba(0,0,0,0)',
                           yaxis=dict(showgrid=True, gridcolor='#f0f0f0', title='CPL (₩)'),
                           xaxis=dict(title='주차'),
@@ -963,7 +1202,7 @@ elif page == "Meta Deep-Dive":
         fig2.add_trace(go.Bar(
             x=plat_agg['플랫폼'], y=plat_agg['CPL'],
             marker_color=[plat_color_map[p] for p in plat_agg['플랫폼']],
-            text=[f'₩{v:,}' for v in plat_agg['CPL']],
+            texttemplate=won_text('y'),
             textposition='outside', textfont=dict(size=12),
         ))
         fig2.update_layout(height=400, plot_bgcolor='rgba(0,0,0,0)',
@@ -1074,6 +1313,22 @@ elif page == "Meta 수정 제안":
     </div>
     """, unsafe_allow_html=True)
 
+    # 3. 소재 교체 일정 — Meta Deep-Dive 의 피로도 모델 결과
+    _fatigue = dataset.derived.get('fatigue')
+    if _fatigue is not None:
+        _plan = _fatigue[_fatigue['status'].isin(['교체 필요', '교체 임박'])].sort_values('refresh_date', kind='stable')
+        st.markdown(f"""
+        <div style="font-size:15px; line-height:1.9; color:#333; padding:8px 0; margin-top:12px;">
+            <strong style="font-size:16px;">3. 소재 교체 일정 ({len(_plan):,}개)</strong><br>
+            CTR 이 초기 대비 {1 - FATIGUE_LEVEL:.0%} 이상 떨어졌거나 {WARN_DAYS}일 안에 떨어질 소재입니다.
+            예상 교체일 전에 같은 메시지의 새 이미지 · 카피를 준비해 두면 CPL 상승 구간을 건너뛸 수 있습니다.
+        </div>
+        """, unsafe_allow_html=True)
+        st.dataframe(_plan[['adset', 'creative', 'status', 'refresh_date', 'days_to_refresh', 'age_days',
+                            'ctr_launch', 'ctr_now', 'frequency_now', 'cost', 'cpl']],
+                     use_container_width=True, hide_index=True,
+                     column_config=column_config(currency=['cost', 'cpl'], labels=FATIGUE_LABELS))
+
 
 
 # ═══════════════════════════════════════════════
@@ -1104,6 +1359,29 @@ elif page == "추가 인사이트":
 
     divider()
 
+    # 메시지 태그(키워드·소재) 기준 채널별 성과 — 데이터가 바뀌면 자동 재계산
+    section("메시지 유형별 크로스채널 성과")
+    _mc = dataset.derived.get('message_cross')
+    if _mc is not None:
+        fig = go.Figure()
+        for _ch, _color in (("Google", COLORS['google']), ("Meta", COLORS['meta'])):
+            fig.add_trace(go.Bar(
+                x=_mc['메시지 유형'], y=_mc[f'{_ch} CPL'], name=_ch, marker_color=_color,
+                texttemplate=won_text('y'), textposition='outside', textfont=dict(size=11),
+            ))
+        fig.update_layout(barmode='group', height=380, plot_bgcolor='rgba(0,0,0,0)',
+                          yaxis=dict(title='CPL (₩)', showgrid=True, gridcolor='#f0f0f0'),
+                          xaxis=dict(title=''),
+                          title=dict(text='메시지 유형별 CPL (Google vs Meta)', font=dict(size=14)),
+                          margin=dict(l=20, r=20, t=40, b=20))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(_mc, use_container_width=True, hide_index=True, column_config=column_config(
+            currency=['Google 비용', 'Google CPL', 'Meta 비용', 'Meta CPL'], percent=['Google CVR', 'Meta CVR']))
+        st.caption("효과: 각 채널 평균 CPL 대비 배수 (≤0.6 최고 · ≤0.9 좋음 · ≤1.2 보통 · ≤1.6 나쁨). "
+                   "키워드·소재 하나가 여러 메시지에 걸릴 수 있어 유형별 합계는 채널 합계와 다를 수 있습니다.")
+
+    divider()
+
     section("효과 없는 메시지: 서비스와 맞지 않는 타겟")
 
     st.markdown("""
@@ -1174,9 +1452,79 @@ elif page == "추가 인사이트":
 
 
 
+# ═══════════════════════════════════════════════
+# PAGE: Explore
+# ═══════════════════════════════════════════════
+elif page == "Explore":
+
+    st.markdown("# Explore")
+    st.caption("팩트 테이블·대시보드 테이블에 직접 SQL 질의 (DuckDB, SELECT 전용)")
+    divider()
+
+    _engine = dataset.derived.get('query_engine')
+    if _engine is None:
+        st.stop()
+    _templates = _engine.templates()
+
+    @fragment
+    def explore_query():
+        ex_col1, ex_col2 = st.columns([3, 1])
+        with ex_col1:
+            ex_template = st.selectbox("템플릿", list(_templates), key="explore_template")
+        with ex_col2:
+            st.caption(f"데이터 버전: {_engine.version}")
+            st.caption(f"최대 {MAX_QUERY_ROWS:,}행 표시")
+
+        # 템플릿을 바꾸면 쿼리 박스를 그 템플릿으로 다시 채운다
+        if st.session_state.get("explore_loaded") != ex_template:
+            st.session_state["explore_sql"] = _templates[ex_template]
+            st.session_state["explore_loaded"] = ex_template
+
+        with st.form("explore_form"):
+            ex_sql = st.text_area("SQL", key="explore_sql", height=220)
+            ex_run = st.form_submit_button("실행")
+
+        if ex_run or ex_sql:
+            try:
+                _res = _engine.query(ex_sql)
+            except QueryError as e:
+                st.warning(str(e))
+            except Exception as e:  # DuckDB 문법·바인딩 오류는 그대로 보여준다
+                st.error(f"{type(e).__name__}: {e}")
+            else:
+                _how = "캐시" if _res.cached else f"{_res.elapsed * 1000:.0f}ms"
+                st.caption(f"{len(_res.df):,}행{' (잘림)' if _res.truncated else ''} · {_how}")
+                st.dataframe(_res.df, use_container_width=True, hide_index=True, column_config=auto_column_config(_res.df))
+    explore_query()
+
+    divider()
+
+    section("테이블")
+    for _name, _source in _engine.sources.items():
+        with st.expander(f"{_name}  ·  {_source}"):
+            st.dataframe(_engine.schema(_name), use_container_width=True, hide_index=True)
+
+    divider()
+
+    section("데이터 검증")
+    _rejected = refresh_worker().rejected
+    if _rejected is not None:
+        st.error(f"{_rejected} — 데이터 버전 {dataset.version} 을 계속 사용 중")
+        st.dataframe(_rejected.report[_rejected.report['severity'] == 'error'],
+                     use_container_width=True, hide_index=True)
+    _validation = dataset.validation
+    if _validation is not None:
+        _counts = _validation['severity'].value_counts()
+        st.caption(f"현재 버전: 오류 {_counts.get('error', 0)}건 · 경고 {_counts.get('warning', 0)}건 "
+                   f"(합계 ±{TOTAL_TOLERANCE:.1%}, CPL ±{CPL_TOLERANCE:.0%} 허용 · 보고서 수치끼리의 불일치는 경고)")
+        st.dataframe(_validation, use_container_width=True, hide_index=True)
+
+
 # ═══════════════════════════════════════════════
 # Footer
 # ═══════════════════════════════════════════════
 st.markdown("---")
 st.caption("이사대학 디지털 마케팅 심화 분석 대시보드 | Prepared by Casey | 2026.02")
 st.caption("데이터 기반: Google Ads + Meta Ads (2025.11~2026.01)")
+if TIMING:
+    st.sidebar.caption(f"⏱ 전체 실행: {(time.perf_counter() - _run_started) * 1000:.0f}ms")
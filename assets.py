@@ -0,0 +1,170 @@
+"""
+이사대학 마케팅 분석 — 소재 이미지 스토어
+Creative thumbnails: resized WebP/AVIF variants generated once per process.
+
+원본 이미지(images/)를 키(파일명 stem)로 등록해 두고, 처음 요청될 때 한 번만
+여러 폭 × 포맷으로 변환해 메모리에 보관한다. static_dir 가 주어지면 내용 해시가
+들어간 파일명으로 기록해 Streamlit static serving(/app/static/...)으로 브라우저
+캐시가 가능한 URL 을 제공하고, 더 이상 참조되지 않는 이전 변환본은 지운다.
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+from PIL import Image, features
+
+THUMB_WIDTHS = (320, 640, 960)
+SOURCE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+STATIC_URL = 'app/static/creatives'
+# 게시 파일명: {key}-{width}w-{digest}.{fmt}
+STATIC_NAME = re.compile(r'^(?P<key>.+)-\d+w-[0-9a-f]{12}\.(?:avif|webp)$')
+
+# AVIF 는 Pillow 빌드에 libavif 가 있을 때만 (없으면 WebP 만 생성)
+FORMATS = ('avif', 'webp') if features.check('avif') else ('webp',)
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    key: str
+    fmt: str
+    width: int
+    height: int
+    data: bytes
+    digest: str
+
+    @property
+    def mime(self):
+        return f'image/{self.fmt}'
+
+    @property
+    def filename(self):
+        return f'{self.key}-{self.width}w-{self.digest[:12]}.{self.fmt}'
+
+
+def _encode(img, fmt, quality):
+    buf = io.BytesIO()
+    if fmt == 'avif':
+        img.save(buf, format='AVIF', quality=quality, speed=6)
+    else:
+        img.save(buf, format='WEBP', quality=quality, method=6)
+    return buf.getvalue()
+
+
+class CreativeAssetStore:
+    def __init__(self, source_dir, static_dir=None, widths=THUMB_WIDTHS, quality=80):
+        self.static_dir = static_dir
+        self.widths = tuple(sorted(widths))
+        self.quality = quality
+        self._sources = {}
+        self._variants = {}
+        self._lock = threading.Lock()
+        if os.path.isdir(source_dir):
+            for name in sorted(os.listdir(source_dir)):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in SOURCE_EXTS:
+                    self._sources[stem] = os.path.join(source_dir, name)
+        # 원본이 사라진 키의 변환본 정리
+        self._prune(lambda key, name: key not in self._sources)
+
+    def __contains__(self, key):
+        return key in self._sources
+
+    def keys(self):
+        return list(self._sources)
+
+    def register(self, key, path):
+        with self._lock:
+            self._sources[key] = path
+            self._variants.pop(key, None)
+
+    def variants(self, key):
+        """키의 모든 변환본 (포맷별 폭 오름차순). 최초 호출 시 한 번만 생성."""
+        if key not in self._sources:
+            return []
+        cached = self._variants.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            if key not in self._variants:
+                self._variants[key] = self._build(key)
+            return self._variants[key]
+
+    def get(self, key, width=640, fmt='webp'):
+        """요청 폭 이상인 가장 작은 변환본 (없으면 가장 큰 것)."""
+        candidates = [t for t in self.variants(key) if t.fmt == fmt]
+        if not candidates:
+            return None
+        for thumb in candidates:
+            if thumb.width >= width:
+                return thumb
+        return candidates[-1]
+
+    def warm(self):
+        for key in self.keys():
+            self.variants(key)
+
+    def picture_html(self, key, sizes='(max-width: 768px) 100vw, 33vw', alt='', style='width:100%;'):
+        """<picture> + srcset — 브라우저가 화면 폭에 맞는 포맷·크기를 골라 받는다."""
+        thumbs = self.variants(key)
+        if not thumbs or self.static_dir is None:
+            return ''
+        by_fmt = {}
+        for t in thumbs:
+            by_fmt.setdefault(t.fmt, []).append(f'{STATIC_URL}/{t.filename} {t.width}w')
+        fallback = self.get(key, width=self.widths[-1], fmt=FORMATS[-1])
+        sources = ''.join(f'<source type="image/{fmt}" srcset="{", ".join(srcset)}" sizes="{sizes}">'
+                          for fmt, srcset in by_fmt.items())
+        return (f'<picture>{sources}<img src="{STATIC_URL}/{fallback.filename}" alt="{alt}" '
+                f'width="{fallback.width}" height="{fallback.height}" loading="lazy" decoding="async" '
+                f'style="{style} height:auto;"></picture>')
+
+    def _build(self, key):
+        with Image.open(self._sources[key]) as src:
+            src.load()
+            img = src.convert('RGBA') if src.mode in ('P', 'LA', 'RGBA') else src.convert('RGB')
+        thumbs = []
+        for fmt in FORMATS:
+            done = set()
+            for width in self.widths:
+                # 원본보다 크게 늘리지 않는다 — 원본 폭으로 맞춘 뒤 중복 제거
+                w = min(width, img.width)
+                if w in done:
+                    continue
+                done.add(w)
+                h = max(1, round(img.height * w / img.width))
+                resized = img if w == img.width else img.resize((w, h), Image.LANCZOS)
+                data = _encode(resized, fmt, self.quality)
+                thumb = Thumbnail(key, fmt, w, h, data, hashlib.sha256(data).hexdigest())
+                self._publish(thumb)
+                thumbs.append(thumb)
+        # 원본·폭·품질이 바뀌어 참조되지 않는 이 키의 이전 변환본 정리
+        current = {t.filename for t in thumbs}
+        self._prune(lambda k, name: k == key and name not in current)
+        return thumbs
+
+    def _publish(self, thumb):
+        if self.static_dir is None:
+            return
+        os.makedirs(self.static_dir, exist_ok=True)
+        path = os.path.join(self.static_dir, thumb.filename)
+        if os.path.exists(path):
+            return
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(thumb.data)
+        os.replace(tmp, path)
+
+    def _prune(self, stale):
+        if self.static_dir is None or not os.path.isdir(self.static_dir):
+            return
+        for name in os.listdir(self.static_dir):
+            m = STATIC_NAME.match(name)
+            if m and stale(m['key'], name):
+                try:
+                    os.remove(os.path.join(self.static_dir, name))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,257 @@
+"""
+이사대학 마케팅 분석 — 크로스채널 기여 모델
+Single-pass multi-touch attribution over user-level touchpoint logs.
+
+광고관리자 전환을 채널별로 더하면(1,638 + 4,835) Google 과 Meta 를 모두 거친
+유저가 두 번 세어진다. 터치포인트 로그
+
+    touchpoints.parquet(user_id, ts, channel, campaign, event)
+
+(event 는 'click' 등 터치, 전환은 'conversion') 를 유저 · 시각 순으로 정렬된
+상태로 배치 단위로 읽어, 전환 하나의 크레딧 1 을 그 직전 경로의 터치들에 나눠 준다.
+
+    last_click       마지막 터치 1
+    linear           경로 터치마다 1/n
+    time_decay       전환까지 남은 시간의 반감기(7일) 가중
+    position_based   첫·마지막 40%, 가운데 20% 균등 (U자형)
+
+경로는 유저의 직전 전환 이후 ~ 이번 전환까지, LOOKBACK_DAYS 보다 오래된 터치는
+제외한다. 배치 끝의 마지막 유저는 다음 배치로 넘겨 한 유저는 항상 한 번에 처리하므로
+메모리는 (배치 + 한 유저의 이력) 으로 제한된다. 첫 터치 주 × 채널 코호트도 같이 센다.
+
+로그는 유저 순으로 통째로 다시 쓰이므로 뒤에 붙은 행만 읽을 수는 없다. 대신
+AttributionStore 가 파일 (크기, 수정 시각) 별로 엔진을 들고 있어, 팩트만 바뀐
+데이터 버전은 로그를 다시 읽지 않고 비용 조인만 새로 한다.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from bookings import ad_costs
+from data import DATA_DIR, GOOGLE_CONV, META_CONV
+
+TOUCHPOINTS = os.environ.get('MOVEUNIV_TOUCHPOINTS', os.path.join(DATA_DIR, 'touchpoints.parquet'))
+TOUCH_COLUMNS = ['user_id', 'ts', 'channel', 'campaign', 'event']
+CONVERSION_EVENT = 'conversion'
+BATCH_ROWS = 500_000
+LOOKBACK_DAYS = 30
+HALF_LIFE_DAYS = 7
+MODELS = ['last_click', 'linear', 'time_decay', 'position_based']
+MODEL_LABELS = {'last_click': '마지막 클릭', 'linear': '선형', 'time_decay': '시간 가중', 'position_based': '위치 기반'}
+PLATFORM_CONV = {'Google': GOOGLE_CONV, 'Meta': META_CONV}
+SEP = '\x1f'
+_DAY_S = 86_400
+
+
+class Attribution:
+    """feed(배치) 를 순서대로 호출한 뒤 finish(). 크레딧은 (채널, 캠페인) 별 누적."""
+
+    def __init__(self, lookback_days=LOOKBACK_DAYS, half_life_days=HALF_LIFE_DAYS):
+        self.lookback = lookback_days * _DAY_S
+        self.half_life = half_life_days * _DAY_S
+        self.keys = []
+        self._index = {}
+        self.credit = {m: np.zeros(0) for m in MODELS}
+        self.touches = np.zeros(0)
+        self.conversions = 0
+        self.unattributed = 0       # 룩백 안에 터치가 없는 전환 (직접 유입)
+        self.multi_channel = 0      # 경로에 Google · Meta 가 모두 있는 전환
+        self._cohorts = []
+        self._carry = None
+
+    def _codes(self, channel, campaign):
+        pairs = pd.Series(channel, dtype=str).str.cat(pd.Series(campaign, dtype=str), sep=SEP)
+        codes, uniques = pd.factorize(pairs)
+        mapped = np.empty(len(uniques), dtype='int64')
+        for i, key in enumerate(uniques):
+            j = self._index.get(key)
+            if j is None:
+                j = self._index[key] = len(self.keys)
+                self.keys.append(key)
+            mapped[i] = j
+        n = len(self.keys)
+        for m in MODELS:
+            self.credit[m] = np.concatenate([self.credit[m], np.zeros(n - len(self.credit[m]))])
+        self.touches = np.concatenate([self.touches, np.zeros(n - len(self.touches))])
+        return mapped[codes]
+
+    # ─── stream ───
+    def feed(self, batch):
+        frame = batch if self._carry is None else pd.concat([self._carry, batch], ignore_index=True)
+        if not len(frame):
+            return
+        user = frame['user_id'].to_numpy()
+        last = np.flatnonzero(user != user[-1])
+        cut = last[-1] + 1 if len(last) else 0
+        # 마지막 유저는 다음 배치에 이어질 수 있다
+        self._carry = frame.iloc[cut:].reset_index(drop=True)
+        if cut:
+            self._process(frame.iloc[:cut])
+
+    def finish(self):
+        if self._carry is not None and len(self._carry):
+            self._process(self._carry)
+        self._carry = None
+        return self
+
+    def _process(self, df):
+        user = df['user_id'].to_numpy()
+        ts = df['ts'].to_numpy().astype('datetime64[s]').astype('int64')
+        is_conv = (df['event'] == CONVERSION_EVENT).to_numpy()
+        n = len(df)
+        new_user = np.ones(n, dtype=bool)
+        new_user[1:] = user[1:] != user[:-1]
+        if np.any(~new_user[1:] & (ts[1:] < ts[:-1])):
+            raise ValueError('touchpoints must be sorted by user_id, ts')
+
+        # 경로: 유저가 바뀌거나 직전 행이 전환이면 새 경로
+        start = new_user.copy()
+        start[1:] |= is_conv[:-1]
+        path = np.cumsum(start) - 1
+        n_paths = int(path[-1]) + 1
+        closed = np.zeros(n_paths, dtype=bool)
+        closed[path[is_conv]] = True
+        conv_ts = np.zeros(n_paths, dtype='int64')
+        conv_ts[path[is_conv]] = ts[is_conv]
+        self.conversions += int(is_conv.sum())
+
+        touch = ~is_conv & closed[path]
+        touch &= conv_ts[path] - ts <= self.lookback
+        self._cohort(df, new_user, is_conv, ts)
+        rows = np.flatnonzero(touch)
+        tp = path[rows]
+        count = np.bincount(tp, minlength=n_paths)
+        self.unattributed += int((closed & (count == 0)).sum())
+        if not len(rows):
+            return
+        codes = self._codes(df['channel'].to_numpy()[rows], df['campaign'].to_numpy()[rows])
+        size = len(self.keys)
+
+        # 경로 안 위치 (터치 행은 경로별로 연속)
+        first = np.ones(len(tp), dtype=bool)
+        first[1:] = tp[1:] != tp[:-1]
+        pos = np.arange(len(tp)) - np.maximum.accumulate(np.where(first, np.arange(len(tp)), 0))
+        k = count[tp]
+        is_last = pos == k - 1
+
+        decay = np.exp2(-(conv_ts[tp] - ts[rows]) / self.half_life)
+        decay /= np.bincount(tp, weights=decay, minlength=n_paths)[tp]
+        middle = np.where(k > 2, 0.2 / np.maximum(k - 2, 1), 0.0)
+        edge = np.where(k == 1, 1.0, np.where(k == 2, 0.5, 0.4))
+        weights = {
+            'last_click': is_last.astype('float64'),
+            'linear': 1.0 / k,
+            'time_decay': decay,
+            'position_based': np.where((pos == 0) | is_last, edge, middle),
+        }
+        for m, w in weights.items():
+            self.credit[m] += np.bincount(codes, weights=w, minlength=size)
+        self.touches += np.bincount(codes, minlength=size)
+
+        channel = pd.factorize(df['channel'].to_numpy()[rows])[0]
+        lo = np.minimum.reduceat(channel, np.flatnonzero(first))
+        hi = np.maximum.reduceat(channel, np.flatnonzero(first))
+        self.multi_channel += int((lo != hi).sum())
+
+    def _cohort(self, df, new_user, is_conv, ts):
+        """첫 행 기준 주 × 채널 → 유저 수 · 전환 유저 · 전환 수."""
+        user_id = np.cumsum(new_user) - 1
+        firsts = np.flatnonzero(new_user)
+        conv = np.bincount(user_id, weights=is_conv, minlength=len(firsts))
+        day = ts[firsts] // _DAY_S
+        week = (day - (day + 3) % 7).astype('datetime64[D]')   # 월요일 시작 (1970-01-01 은 목요일)
+        channel = np.where(is_conv[firsts], '(direct)', df['channel'].to_numpy()[firsts].astype(str))
+        part = pd.DataFrame({'week': week, 'channel': channel, 'users': 1,
+                             'converted': (conv > 0).astype('int64'), 'conversions': conv.astype('int64')})
+        self._cohorts.append(part.groupby(['week', 'channel'], as_index=False).sum())
+
+    # ─── results ───
+    def credits(self):
+        keys = pd.DataFrame([k.split(SEP) for k in self.keys], columns=['channel', 'campaign'])
+        return keys.assign(touches=self.touches.astype('int64'), **{m: self.credit[m] for m in MODELS})
+
+    def cohorts(self):
+        if not self._cohorts:
+            return pd.DataFrame(columns=['week', 'channel', 'users', 'converted', 'conversions'])
+        out = pd.concat(self._cohorts).groupby(['week', 'channel'], as_index=False).sum()
+        out['conversion_rate'] = np.round(100 * out['converted'] / out['users'], 1)
+        return out.sort_values(['week', 'channel']).reset_index(drop=True)
+
+
+def read_touchpoints(path=TOUCHPOINTS, batch_rows=BATCH_ROWS):
+    """Parquet 을 배치로 — 파일 전체를 메모리에 올리지 않는다."""
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=TOUCH_COLUMNS):
+        yield batch.to_pandas()
+
+
+def attribute(batches, lookback_days=LOOKBACK_DAYS, half_life_days=HALF_LIFE_DAYS):
+    engine = Attribution(lookback_days, half_life_days)
+    for batch in batches:
+        engine.feed(batch)
+    return engine.finish()
+
+
+class AttributionStore:
+    """터치포인트 파일이 그대로면 직전에 만든 Attribution 을 다시 쓴다."""
+
+    def __init__(self, path=TOUCHPOINTS):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._engine = None
+
+    def sync(self):
+        """현재 파일의 엔진 (파일이 없으면 None). 크기 · 수정 시각이 바뀔 때만 다시 읽는다."""
+        try:
+            st = os.stat(self.path) if self.path else None
+        except FileNotFoundError:
+            st = None
+        fp = None if st is None else (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if fp != self._fingerprint:
+                self._engine = None if fp is None else attribute(read_touchpoints(self.path))
+                self._fingerprint = fp
+            return self._engine
+
+
+# ═══════════════════════════════════════════════
+# Report
+# ═══════════════════════════════════════════════
+def _cpl(cost, conv):
+    cost, conv = np.asarray(cost, dtype='float64'), np.asarray(conv, dtype='float64')
+    return np.rint(np.divide(cost, conv, out=np.full_like(cost, np.nan), where=conv > 0))
+
+
+def attribution_report(dataset, store=None):
+    """터치포인트 로그가 있으면 캠페인 · 채널별 기여 전환 / CPL (+ 매체 보고 CPL), 없으면 None."""
+    engine = (store or AttributionStore()).sync()
+    if engine is None:
+        return None
+    credits = engine.credits()
+    costs = ad_costs(dataset, 'campaign')
+    campaign = credits.merge(costs, on=['channel', 'campaign'], how='outer').fillna({m: 0.0 for m in MODELS})
+    campaign['cost'] = campaign['cost'].fillna(0.0)
+    campaign['touches'] = campaign['touches'].fillna(0).astype('int64')
+    for m in MODELS:
+        campaign[m] = campaign[m].round(1)
+        campaign[f'{m}_cpl'] = _cpl(campaign['cost'], campaign[m])
+
+    channel = campaign.groupby('channel', as_index=False)[['cost'] + MODELS].sum()
+    facts = {'Google': dataset.facts.get('google'), 'Meta': dataset.facts.get('meta')}
+    channel['platform_conv'] = [float(facts[c]['conversions'].sum()) if facts.get(c) is not None
+                                else PLATFORM_CONV.get(c, np.nan) for c in channel['channel']]
+    channel['platform_cpl'] = _cpl(channel['cost'], channel['platform_conv'])
+    for m in MODELS:
+        channel[f'{m}_cpl'] = _cpl(channel['cost'], channel[m])
+    return {
+        'campaign': campaign.sort_values('cost', ascending=False, kind='stable').reset_index(drop=True),
+        'channel': channel,
+        'cohorts': engine.cohorts(),
+        'conversions': engine.conversions,
+        'unattributed': engine.unattributed,
+        'multi_channel': engine.multi_channel,
+    }
@@ -0,0 +1,273 @@
+"""
+이사대학 마케팅 분석 — 내부 DB 예약·매출 연결
+Joins ad leads (상담신청) to internal bookings and revenue.
+
+내부 DB(SQLite, PostgreSQL 대용)의 두 테이블을 읽는다.
+
+    leads(lead_id TEXT PRIMARY KEY, click_id TEXT, channel TEXT, campaign TEXT,
+          ad_group TEXT, asset TEXT, created_at TEXT)
+    bookings(booking_id TEXT, lead_id TEXT, booked_at TEXT, revenue INTEGER)
+
+leads 는 랜딩 페이지가 gclid/fbclid 와 함께 남기는 상담신청 기록이다 (channel 은
+Google/Meta, ad_group 은 세그먼트·광고세트, asset 은 키워드·소재, Meta 의
+campaign 은 플랫폼). bookings 는 추가만 되는 이벤트 테이블이고 취소는 음수 매출
+행으로 들어온다.
+
+두 테이블 모두 rowid 워터마크 이후 행만 읽는다. lead_id 는 64비트 해시로 바꿔
+해시 → 위치 사전에 새 리드만 더하고, 리드별 배열은 용량을 두 배씩 늘리므로
+동기화 비용은 새 리드 · 예약 행 수에 비례한다. 아직 리드가 동기화되지 않은
+예약은 보류했다가 다음 동기화에서 다시 붙인다. DB 파일이 통째로 다시 만들어지면
+(다른 inode, 또는 워터마크 행이 다른 행) 처음부터 다시 읽는다.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import DATA_DIR
+
+log = logging.getLogger(__name__)
+
+BOOKINGS_DB = os.environ.get('MOVEUNIV_BOOKINGS_DB', os.path.join(DATA_DIR, 'bookings.sqlite'))
+CHUNK_ROWS = 200_000
+LEVELS = ('campaign', 'ad_group', 'asset')
+LEAD_COLUMNS = ['channel', 'campaign', 'ad_group', 'asset']
+
+# 리드 레벨 → 팩트 컬럼 (광고비 조인용)
+COST_COLUMNS = {
+    'Google': {'campaign': 'campaign', 'ad_group': 'segment', 'asset': 'keyword'},
+    'Meta': {'campaign': 'platform', 'ad_group': 'adset', 'asset': 'creative'},
+}
+
+
+def _hash_ids(ids):
+    return pd.util.hash_array(np.asarray(ids, dtype=object)).view('int64')
+
+
+def _grow(arr, n):
+    """용량을 두 배씩 늘리는 배열 — 청크마다 전체를 다시 잇지 않는다."""
+    if n <= len(arr):
+        return arr
+    out = np.zeros(max(n, 2 * len(arr), 1024), dtype=arr.dtype)
+    out[:len(arr)] = arr
+    return out
+
+
+class BookingStore:
+    def __init__(self, db_path=BOOKINGS_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.lead_watermark = 0
+        self.booking_watermark = 0
+        self.duplicates = 0            # 이미 본 lead_id 로 다시 들어온 리드 (무시)
+        self._identity = None          # DB 파일 (장치, inode)
+        self._anchors = {}             # 테이블 → 워터마크 행의 id (파일이 다시 쓰였는지 확인용)
+        self._n = 0
+        self._hashes = np.zeros(0, dtype='int64')
+        self._codes = {c: np.zeros(0, dtype='int32') for c in LEAD_COLUMNS}
+        self.categories = {c: [] for c in LEAD_COLUMNS}
+        self._lookup = {c: {} for c in LEAD_COLUMNS}
+        self._bookings = np.zeros(0, dtype='int64')
+        self._revenue = np.zeros(0)
+        self._pos = {}                 # lead 해시 → 위치 (새 리드만 추가)
+        self._pending = pd.DataFrame({'lead_hash': np.zeros(0, dtype='int64'), 'revenue': np.zeros(0)})
+
+    @property
+    def available(self):
+        return bool(self.db_path) and os.path.exists(self.db_path)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def bookings(self):
+        return self._bookings[:self._n]
+
+    @property
+    def revenue(self):
+        return self._revenue[:self._n]
+
+    # ─── sync ───
+    def sync(self):
+        """워터마크 이후 leads · bookings 만 읽어 반영. (새 리드, 새 예약) 행 수.
+
+        DB 파일이 바뀌었거나(다른 inode) 워터마크 행이 다른 행으로 바뀌었으면 처음부터 다시 읽는다.
+        """
+        if not self.available:
+            return 0, 0
+        with self._lock:
+            st = os.stat(self.db_path)
+            con = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True)
+            try:
+                if self._identity != (st.st_dev, st.st_ino) or not self._anchors_match(con):
+                    if self._identity is not None:
+                        log.warning('%s was replaced — re-reading leads and bookings', self.db_path)
+                    self._reset()
+                    self._identity = (st.st_dev, st.st_ino)
+                new_leads = self._sync_leads(con)
+                new_bookings = self._sync_bookings(con)
+            finally:
+                con.close()
+            return new_leads, new_bookings
+
+    def _anchor(self, con, table, column, rowid):
+        row = con.execute(f'SELECT {column} FROM {table} WHERE rowid = ?', (rowid,)).fetchone()
+        return row[0] if row else None
+
+    def _anchors_match(self, con):
+        return all(self._anchor(con, table, column, rowid) == value
+                   for (table, column, rowid), value in self._anchors.items())
+
+    def _encode(self, col, values):
+        codes, uniques = pd.factorize(values)
+        lookup, cats = self._lookup[col], self.categories[col]
+        mapped = np.empty(len(uniques), dtype='int32')
+        for i, v in enumerate(map(str, uniques)):
+            if v not in lookup:
+                lookup[v] = len(cats)
+                cats.append(v)
+            mapped[i] = lookup[v]
+        return mapped[codes]
+
+    def _sync_leads(self, con):
+        total = 0
+        sql = 'SELECT rowid, lead_id, channel, campaign, ad_group, asset FROM leads WHERE rowid > ? ORDER BY rowid'
+        for chunk in pd.read_sql_query(sql, con, params=(self.lead_watermark,), chunksize=CHUNK_ROWS):
+            if not len(chunk):   # 새 행이 없어도 빈 청크가 한 번 나온다
+                continue
+            self.lead_watermark = int(chunk['rowid'].iat[-1])
+            self._anchors = {k: v for k, v in self._anchors.items() if k[0] != 'leads'}
+            self._anchors[('leads', 'lead_id', self.lead_watermark)] = chunk['lead_id'].iat[-1]
+            total += len(chunk)
+            hashes = _hash_ids(chunk['lead_id'])
+            # 같은 lead_id 가 다시 들어오면 (청크 안 중복 포함) 처음 것만 남긴다
+            fresh = ~pd.Index(hashes).duplicated() & np.fromiter(
+                (h not in self._pos for h in hashes.tolist()), dtype=bool, count=len(hashes))
+            self.duplicates += int((~fresh).sum())
+            hashes, chunk = hashes[fresh], chunk[fresh]
+            lo, hi = self._n, self._n + len(hashes)
+            self._hashes = _grow(self._hashes, hi)
+            self._hashes[lo:hi] = hashes
+            for col in LEAD_COLUMNS:
+                self._codes[col] = _grow(self._codes[col], hi)
+                self._codes[col][lo:hi] = self._encode(col, chunk[col].fillna(''))
+            self._pos.update(zip(hashes.tolist(), range(lo, hi)))
+            self._bookings = _grow(self._bookings, hi)
+            self._revenue = _grow(self._revenue, hi)
+            self._n = hi
+        return total
+
+    def _sync_bookings(self, con):
+        sql = 'SELECT rowid, booking_id, lead_id, revenue FROM bookings WHERE rowid > ? ORDER BY rowid'
+        frames = [self._pending]
+        total = 0
+        for chunk in pd.read_sql_query(sql, con, params=(self.booking_watermark,), chunksize=CHUNK_ROWS):
+            if not len(chunk):
+                continue
+            frames.append(pd.DataFrame({'lead_hash': _hash_ids(chunk['lead_id']),
+                                        'revenue': chunk['revenue'].to_numpy(dtype='float64')}))
+            self.booking_watermark = int(chunk['rowid'].iat[-1])
+            self._anchors = {k: v for k, v in self._anchors.items() if k[0] != 'bookings'}
+            self._anchors[('bookings', 'booking_id', self.booking_watermark)] = chunk['booking_id'].iat[-1]
+            total += len(chunk)
+        events = pd.concat(frames, ignore_index=True)
+        if not len(events):
+            return 0
+        pos = np.fromiter((self._pos.get(h, -1) for h in events['lead_hash'].tolist()),
+                          dtype='int64', count=len(events))
+        matched = pos >= 0
+        revenue = events['revenue'].to_numpy()
+        # 취소(음수 매출)는 예약 1건을 되돌린다 — 새 예약 행이 닿는 리드만 갱신
+        np.add.at(self._bookings, pos[matched], np.sign(revenue[matched]).astype('int64'))
+        np.add.at(self._revenue, pos[matched], revenue[matched])
+        self._pending = events[~matched].reset_index(drop=True)
+        return total
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    # ─── views ───
+    def view(self, level, costs=None):
+        """채널 × level 별 리드·예약·매출 (+ costs 가 있으면 예약당 비용·ROAS)."""
+        channel = self._codes['channel'][:self._n]
+        key = self._codes[level][:self._n]
+        n_key = len(self.categories[level])
+        flat = channel.astype('int64') * max(n_key, 1) + key
+        size = len(self.categories['channel']) * max(n_key, 1)
+        leads = np.bincount(flat, minlength=size)
+        present = np.flatnonzero(leads)
+        out = pd.DataFrame({
+            'channel': np.asarray(self.categories['channel'], dtype=object)[present // max(n_key, 1)],
+            level: np.asarray(self.categories[level], dtype=object)[present % max(n_key, 1)],
+            'leads': leads[present],
+            'bookings': np.bincount(flat, weights=self.bookings, minlength=size)[present].astype('int64'),
+            'revenue': np.bincount(flat, weights=self.revenue, minlength=size)[present].round(),
+        })
+        out['booking_rate'] = np.round(100 * out['bookings'] / out['leads'], 1)
+        if costs is not None:
+            out = out.merge(costs, on=['channel', level], how='left')
+            cost = out['cost'].to_numpy(dtype='float64')
+            out['cost_per_booking'] = np.where(out['bookings'] > 0, np.rint(cost / out['bookings'].clip(lower=1)), np.nan)
+            out['roas'] = np.where(cost > 0, np.round(100 * out['revenue'] / np.where(cost > 0, cost, 1), 1), np.nan)
+        return out.sort_values('revenue', ascending=False, kind='stable').reset_index(drop=True)
+
+    def totals(self, total_cost=None):
+        bookings, revenue = int(self.bookings.sum()), float(self.revenue.sum())
+        return {
+            'leads': self._n, 'bookings': bookings, 'revenue': revenue,
+            'booking_rate': round(100 * bookings / self._n, 1) if self._n else 0.0,
+            'cost_per_booking': round(total_cost / bookings) if total_cost and bookings else None,
+            'roas': round(100 * revenue / total_cost, 1) if total_cost else None,
+        }
+
+
+# ═══════════════════════════════════════════════
+# Ad cost (join side)
+# ═══════════════════════════════════════════════
+def ad_costs(dataset, level):
+    """채널 × level 광고비 — 팩트가 있으면 팩트, 없으면 대시보드 집계 테이블."""
+    frames = []
+    for channel, table in (('Google', 'google'), ('Meta', 'meta')):
+        col = COST_COLUMNS[channel][level]
+        facts = dataset.facts.get(table)
+        if facts is not None:
+            agg = facts.groupby(col, observed=True)['cost'].sum()
+            frames.append(pd.DataFrame({'channel': channel, level: agg.index.astype(str), 'cost': agg.to_numpy(dtype='float64')}))
+    if not frames:
+        frames = [pd.DataFrame({'channel': ch, level: np.asarray(keys, dtype=str), 'cost': np.asarray(cost, dtype='float64')})
+                  for ch, keys, cost in _baseline_costs(dataset, level)]
+    if not frames:   # 베이스라인 집계에는 키워드·소재 단위 Meta/Google 비용이 없다
+        return pd.DataFrame({'channel': pd.Series(dtype=object), level: pd.Series(dtype=object),
+                             'cost': pd.Series(dtype='float64')})
+    return pd.concat(frames, ignore_index=True)
+
+
+def _baseline_costs(dataset, level):
+    if level == 'campaign':
+        gc = dataset['google_campaign']
+        platform = dataset['meta_plat_month'].groupby('플랫폼')['비용'].sum()
+        return [('Google', gc['캠페인'], gc['비용']), ('Meta', platform.index, platform.to_numpy())]
+    if level == 'ad_group':
+        gi, ma = dataset['google_intent'], dataset['meta_adset']
+        return [('Google', gi['segment'], gi['cost']),
+                ('Meta', ma['소재'].str.replace('"', '', regex=False), ma['비용'])]
+    return []
+
+
+def booking_report(store, dataset):
+    """데이터 버전마다 한 번: 동기화 후 레벨별 뷰 + 합계 (DB 없으면 None)."""
+    if not store.available:
+        return None
+    store.sync()
+    costs = {level: ad_costs(dataset, level) for level in LEVELS}
+    views = {level: store.view(level, costs[level]) for level in LEVELS}
+    total_cost = float(costs['campaign']['cost'].sum())   # 리드가 없는 캠페인 비용도 포함
+    return {'views': views, 'totals': store.totals(total_cost), 'pending': store.pending}
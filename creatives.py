@@ -0,0 +1,106 @@
+"""
+이사대학 마케팅 분석 — 소재 갤러리 인덱스
+Creative-level table with precomputed sort orders for paged gallery queries.
+
+소재 팩트(meta_creative_daily)를 소재 단위로 한 번 집계해 두고, 정렬·필터·
+페이징은 tables.TableIndex 에 맡긴다. 질의는 (정렬 순서 × 필터 마스크) 위치
+배열만 만들고 페이지 분량만 잘라 DataFrame 으로 만들기 때문에 소재 수천 개도
+페이지 전환이 O(n) 벡터 연산 한 번이다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data import meta_adset
+from metrics import safe_rate
+from tables import TableIndex
+
+PAGE_SIZE = 24
+
+# 정렬 키: 화면 라벨 → 컬럼, 기본 오름차순 여부
+SORT_KEYS = {
+    'CPL': ('cpl', True),
+    'CTR': ('ctr', False),
+    'CVR': ('cvr', False),
+    '비용': ('cost', False),
+    '전환': ('conversions', False),
+}
+
+# 광고세트 대표 이미지 (images/ 의 키)
+ADSET_IMAGES = {
+    '이사 가격': 'meta_isagagyeok_ad',
+    '에브리타임': 'meta_everytime_ad',
+    '가격 소재': 'meta_price_ad',
+}
+
+
+# ═══════════════════════════════════════════════
+# Load
+# ═══════════════════════════════════════════════
+def load_creative_table(meta_facts=None):
+    """소재 단위 집계. 팩트가 없으면 data.meta_adset 을 소재 테이블로 사용.
+
+    계정마다 같은 소재 이름을 쓰므로 소재 키는 (계정, 광고세트, 소재).
+    """
+    if meta_facts is not None:
+        agg = meta_facts.groupby(['account', 'adset', 'creative'], observed=True).agg(
+            impressions=('impressions', 'sum'), clicks=('clicks', 'sum'),
+            cost=('cost', 'sum'), conversions=('conversions', 'sum'),
+        ).reset_index()
+        for col in ('account', 'adset', 'creative'):
+            agg[col] = agg[col].astype(str)
+    else:
+        ma = meta_adset
+        adset = ma['소재'].str.replace('"', '', regex=False)
+        clicks = np.rint(ma['전환'] / (ma['CVR'] / 100)).astype('int64')
+        agg = pd.DataFrame({
+            'account': '',
+            'adset': adset,
+            'creative': adset,
+            'impressions': np.rint(clicks / (ma['CTR'] / 100)).astype('int64'),
+            'clicks': clicks,
+            'cost': ma['비용'],
+            'conversions': ma['전환'],
+        })
+    agg['image_key'] = agg['adset'].map(ADSET_IMAGES)
+    return agg
+
+
+# ═══════════════════════════════════════════════
+# Index
+# ═══════════════════════════════════════════════
+class CreativeIndex(TableIndex):
+    """소재 테이블용 TableIndex — 화면 라벨 정렬 · 기본 방향 · 소재명 부분 검색만 더한다."""
+
+    def __init__(self, table):
+        df = table.reset_index(drop=True)
+        cost = df['cost'].to_numpy(dtype='float64')
+        conv = df['conversions'].to_numpy(dtype='float64')
+        df['cpl'] = np.where(conv > 0, np.rint(cost / np.where(conv > 0, conv, 1)), np.nan)
+        df['ctr'] = safe_rate(df['clicks'], df['impressions'])
+        df['cvr'] = safe_rate(df['conversions'], df['clicks'], decimals=1)
+        # CPL 없는 소재 = 전환 0 은 TableIndex 규칙대로 항상 맨 뒤
+        super().__init__(df, sort_columns=[col for col, _ in SORT_KEYS.values()], filter_columns=['adset'])
+        self.adsets = self.filters['adset']
+        self.accounts = sorted(a for a in df['account'].unique() if a)
+        self._names = df['creative'].str.lower().to_numpy(dtype=str)
+
+    def query(self, sort='CPL', ascending=None, adsets=None, min_cost=0, search=''):
+        """조건에 맞는 행 위치를 정렬 순서대로 반환."""
+        col, default_asc = SORT_KEYS[sort]
+        order = super().query(col, default_asc if ascending is None else ascending, {'adset': adsets})
+        if not (min_cost or search):
+            return order
+        mask = np.ones(len(self.df), dtype=bool)
+        if min_cost:
+            mask &= self.df['cost'].to_numpy() >= min_cost
+        if search:
+            mask &= np.char.find(self._names, search.lower()) >= 0
+        return order[mask[order]]
+
+    def page(self, positions, page, page_size=PAGE_SIZE):
+        return super().page(positions, page, page_size)
+
+    @staticmethod
+    def page_count(positions, page_size=PAGE_SIZE):
+        return TableIndex.page_count(positions, page_size)
@@ -0,0 +1,253 @@
+"""
+이사대학 마케팅 분석 — 데이터
+광고 플랫폼 리포트에서 옮겨 온 분석 기간(2025.11.02 ~ 2026.01.31) 집계 테이블.
+"""
+
+import os
+
+import pandas as pd
+
+# 일 단위 팩트 테이블(Parquet) 위치 — datagen.py 또는 광고 플랫폼 export 결과
+DATA_DIR = os.environ.get('MOVEUNIV_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+GOOGLE_FACTS = 'google_keyword_daily.parquet'
+META_FACTS = 'meta_creative_daily.parquet'
+# 기본 리포트 기간 (시작일, 종료일) — 사전 계산 캐시 키에 들어간다
+REPORT_PERIOD = ('2025-11-02', '2026-01-31')
+
+
+# ═══════════════════════════════════════════════
+# Data
+# ═══════════════════════════════════════════════
+
+# 채널 종합
+TOTAL_SPEND = 40_916_071
+TOTAL_CONV = 6_473
+TOTAL_CPL = 6_322
+GOOGLE_SPEND = 15_452_143
+GOOGLE_CONV = 1_638
+GOOGLE_CPL = 9_432
+META_SPEND = 25_463_928
+META_CONV = 4_835
+META_CPL = 5_267
+
+# Google 키워드 의도별 (keyword report 기반 — 정확 데이터)
+google_intent = pd.DataFrame({
+    'segment': ['브랜드', '기타(영어+이삿짐센터)', '원룸/소형', '포장이사', '일반이사', '가격/견적', '용달/화물', '지역+이사', '외국인'],
+    'keywords': [1, 80, 36, 49, 40, 29, 80, 53, 1],
+    'cost': [394261, 2227000, 357555, 412435, 460648, 284624, 1774389, 488317, 80001],
+    'conversions': [84, 193, 28, 30, 32, 19, 104, 28, 2],
+    'cpl': [4655, 11509, 12769, 13747, 14395, 14980, 17061, 17133, 40000],
+    'clicks': [544, 1058, 127, 153, 202, 109, 750, 171, 91],
+    'impressions': [1023, 12418, 3623, 4955, 7267, 2972, 17065, 2922, 1426],
+})
+PMAX_BENCHMARK = 6976
+SEARCH_CPL = 13363
+
+# Google 캠페인
+google_campaign = pd.DataFrame({
+    '캠페인': ['PMax', '검색광고(내국인)', '검색광고(외국인)'],
+    '비용': [7631334, 6748916, 1919872],
+    '전환': [1109.14, 471.19, 177.50],
+    'CPL': [6880, 14323, 10816],
+    '유형': ['PMax', '검색', '검색'],
+})
+
+# PMax 에셋그룹
+pmax_asset = pd.DataFrame({
+    '에셋그룹': ['리타겟팅', '맞춤타겟\n(소형이사)', '맞춤타겟\n(지역이사)'],
+    '비용': [1675741, 5097790, 857803],
+    '전환': [269.49, 726.49, 113.17],
+    'CPL': [6218, 7017, 7580],
+    'CVR': [2.52, 3.84, 6.42],
+})
+
+# Meta 소재별
+meta_adset = pd.DataFrame({
+    '소재': ['"이사 가격"', '"공통 소재"', '"가격 소재"', '"에브리타임"', '"여자 모델"', '"소재 ALL"', '"신규 소재"(12월)', '"신규 소재"(11월)'],
+    '소재_short': ['이사가격', '공통', '가격소재', '에타', '여자모델', '소재ALL', '신규(12)', '신규(11)'],
+    '타겟': ['한국인', '한국인', '한국인', '20대', '한국인', '유사타겟', '12월', '11월'],
+    '비용': [600648, 3640, 17347742, 3179850, 150191, 3415809, 205059, 17226],
+    '전환': [156, 1, 3355, 617, 26, 522, 16, 1],
+    'CPL': [3850, 3640, 5171, 5154, 5777, 6544, 12816, 17226],
+    'CTR': [0.99, 1.15, 0.81, 1.20, 0.93, 0.78, 0.86, 1.50],
+    'CVR': [27.1, 33.3, 18.1, 11.0, 23.6, 17.0, 20.3, 5.3],
+    '예산비중': [2.4, 0.0, 69.6, 12.8, 0.6, 13.7, 0.8, 0.1],
+    '효율': ['BEST', '표본부족', 'MAIN', 'CTR최고', '가능성', '비효율', 'WORST', 'WORST'],
+    '메시지유형': ['가격', '기타', '가격', '커뮤니티', '감성', '혼합', '신규', '신규'],
+})
+
+# Meta 플랫폼 월별
+meta_plat_month = pd.DataFrame({
+    '월': ['11월','11월','11월','12월','12월','12월','1월','1월','1월'],
+    '플랫폼': ['Instagram','Facebook','Threads'] * 3,
+    'CPL': [5512, 6230, 4285, 5035, 4143, 3821, 4853, 5766, 3937],
+    '전환': [1050, 35, 70, 1380, 52, 95, 1550, 48, 105],
+    '비용': [5787600, 218050, 299950, 6948300, 215436, 362970, 7524650, 276768, 413580],
+})
+
+# Meta 소재 월별
+meta_creative_month = pd.DataFrame({
+    '월': ['11월','11월','11월','11월','12월','12월','12월','12월','1월','1월','1월','1월'],
+    '소재': ['"가격 소재"','"에브리타임"','"소재 ALL"','"신규 소재"',
+             '"가격 소재"','"에브리타임"','"소재 ALL"','"여자 모델"',
+             '"가격 소재"','"에브리타임"','"소재 ALL"','"여자 모델"'],
+    'CPL': [5729, 5091, 10060, 17226, 5525, 5089, 4830, 6585, 4527, 5334, 12867, 3174],
+    '전환': [1050, 210, 120, 1, 1180, 220, 280, 15, 1125, 187, 122, 11],
+})
+
+# ── Weekly Data (Google) ──
+google_campaign_weekly = pd.DataFrame([
+    # PMax
+    {"campaign": "PMax", "week": "W44", "cost": 81888, "conv": 10.5, "cpl": 7799},
+    {"campaign": "PMax", "week": "W45", "cost": 572469, "conv": 52.0, "cpl": 11009},
+    {"campaign": "PMax", "week": "W46", "cost": 630651, "conv": 73.5, "cpl": 8580},
+    {"campaign": "PMax", "week": "W47", "cost": 538244, "conv": 61.83, "cpl": 8705},
+    {"campaign": "PMax", "week": "W48", "cost": 527085, "conv": 60.0, "cpl": 8785},
+    {"campaign": "PMax", "week": "W49", "cost": 582718, "conv": 56.01, "cpl": 10404},
+    {"campaign": "PMax", "week": "W50", "cost": 544792, "conv": 54.98, "cpl": 9909},
+    {"campaign": "PMax", "week": "W51", "cost": 553454, "conv": 82.5, "cpl": 6709},
+    {"campaign": "PMax", "week": "W52", "cost": 537367, "conv": 88.0, "cpl": 6106},
+    {"campaign": "PMax", "week": "W01", "cost": 548325, "conv": 107.5, "cpl": 5101},
+    {"campaign": "PMax", "week": "W02", "cost": 549466, "conv": 83.01, "cpl": 6619},
+    {"campaign": "PMax", "week": "W03", "cost": 561800, "conv": 115.0, "cpl": 4885},
+    {"campaign": "PMax", "week": "W04", "cost": 552450, "conv": 106.0, "cpl": 5212},
+    {"campaign": "PMax", "week": "W05", "cost": 432733, "conv": 83.17, "cpl": 5203},
+    # Search-내국인
+    {"campaign": "검색광고(내국인)", "week": "W44", "cost": 84366, "conv": 4.0, "cpl": 21092},
+    {"campaign": "검색광고(내국인)", "week": "W45", "cost": 594959, "conv": 35.0, "cpl": 16999},
+    {"campaign": "검색광고(내국인)", "week": "W46", "cost": 573287, "conv": 26.0, "cpl": 22050},
+    {"campaign": "검색광고(내국인)", "week": "W47", "cost": 550335, "conv": 39.67, "cpl": 13873},
+    {"campaign": "검색광고(내국인)", "week": "W48", "cost": 543278, "conv": 24.0, "cpl": 22637},
+    {"campaign": "검색광고(내국인)", "week": "W49", "cost": 578517, "conv": 19.0, "cpl": 30448},
+    {"campaign": "검색광고(내국인)", "week": "W50", "cost": 548974, "conv": 45.01, "cpl": 12197},
+    {"campaign": "검색광고(내국인)", "week": "W51", "cost": 573491, "conv": 47.0, "cpl": 12202},
+    {"campaign": "검색광고(내국인)", "week": "W52", "cost": 385455, "conv": 31.0, "cpl": 12434},
+    {"campaign": "검색광고(내국인)", "week": "W01", "cost": 393393, "conv": 32.5, "cpl": 12104},
+    {"campaign": "검색광고(내국인)", "week": "W02", "cost": 400808, "conv": 27.0, "cpl": 14845},
+    {"campaign": "검색광고(내국인)", "week": "W03", "cost": 403922, "conv": 39.0, "cpl": 10357},
+    {"campaign": "검색광고(내국인)", "week": "W04", "cost": 400210, "conv": 30.0, "cpl": 13340},
+    {"campaign": "검색광고(내국인)", "week": "W05", "cost": 394461, "conv": 37.5, "cpl": 10519},
+    # Search-외국인
+    {"campaign": "검색광고(외국인)", "week": "W44", "cost": 11739, "conv": 0.0, "cpl": 0},
+    {"campaign": "검색광고(외국인)", "week": "W45", "cost": 169414, "conv": 9.0, "cpl": 18824},
+    {"campaign": "검색광고(외국인)", "week": "W46", "cost": 141673, "conv": 14.0, "cpl": 10120},
+    {"campaign": "검색광고(외국인)", "week": "W47", "cost": 148676, "conv": 12.0, "cpl": 12390},
+    {"campaign": "검색광고(외국인)", "week": "W48", "cost": 125757, "conv": 8.5, "cpl": 14795},
+    {"campaign": "검색광고(외국인)", "week": "W49", "cost": 138400, "conv": 14.5, "cpl": 9545},
+    {"campaign": "검색광고(외국인)", "week": "W50", "cost": 135853, "conv": 5.0, "cpl": 27171},
+    {"campaign": "검색광고(외국인)", "week": "W51", "cost": 140044, "conv": 17.5, "cpl": 8003},
+    {"campaign": "검색광고(외국인)", "week": "W52", "cost": 141297, "conv": 11.0, "cpl": 12845},
+    {"campaign": "검색광고(외국인)", "week": "W01", "cost": 115763, "conv": 9.0, "cpl": 12863},
+    {"campaign": "검색광고(외국인)", "week": "W02", "cost": 164034, "conv": 22.0, "cpl": 7456},
+    {"campaign": "검색광고(외국인)", "week": "W03", "cost": 140223, "conv": 19.0, "cpl": 7380},
+    {"campaign": "검색광고(외국인)", "week": "W04", "cost": 129534, "conv": 15.0, "cpl": 8636},
+    {"campaign": "검색광고(외국인)", "week": "W05", "cost": 110838, "conv": 11.0, "cpl": 10076},
+])
+
+# Weekly intent segment data (for top segments only)
+google_intent_weekly = pd.DataFrame([
+    # 브랜드
+    {"segment": "브랜드", "week": "W45", "cpl": 6125}, {"segment": "브랜드", "week": "W46", "cpl": 7458},
+    {"segment": "브랜드", "week": "W47", "cpl": 5469}, {"segment": "브랜드", "week": "W48", "cpl": 2185},
+    {"segment": "브랜드", "week": "W49", "cpl": 529}, {"segment": "브랜드", "week": "W50", "cpl": 6647},
+    {"segment": "브랜드", "week": "W51", "cpl": 4081}, {"segment": "브랜드", "week": "W52", "cpl": 4664},
+    {"segment": "브랜드", "week": "W01", "cpl": 6800}, {"segment": "브랜드", "week": "W02", "cpl": 4360},
+    {"segment": "브랜드", "week": "W03", "cpl": 5077}, {"segment": "브랜드", "week": "W04", "cpl": 3994},
+    {"segment": "브랜드", "week": "W05", "cpl": 4110},
+    # 용달/화물
+    {"segment": "용달/화물", "week": "W45", "cpl": 16132}, {"segment": "용달/화물", "week": "W46", "cpl": 30866},
+    {"segment": "용달/화물", "week": "W47", "cpl": 15259}, {"segment": "용달/화물", "week": "W48", "cpl": 22721},
+    {"segment": "용달/화물", "week": "W49", "cpl": 23551}, {"segment": "용달/화물", "week": "W50", "cpl": 9615},
+    {"segment": "용달/화물", "week": "W51", "cpl": 20115}, {"segment": "용달/화물", "week": "W52", "cpl": 14753},
+    {"segment": "용달/화물", "week": "W01", "cpl": 20057}, {"segment": "용달/화물", "week": "W02", "cpl": 16042},
+    {"segment": "용달/화물", "week": "W03", "cpl": 10076}, {"segment": "용달/화물", "week": "W04", "cpl": 18317},
+    {"segment": "용달/화물", "week": "W05", "cpl": 13694},
+    # 일반이사
+    {"segment": "일반이사", "week": "W45", "cpl": 23195}, {"segment": "일반이사", "week": "W46", "cpl": 17758},
+    {"segment": "일반이사", "week": "W47", "cpl": 17670}, {"segment": "일반이사", "week": "W48", "cpl": 0},
+    {"segment": "일반이사", "week": "W49", "cpl": 0}, {"segment": "일반이사", "week": "W50", "cpl": 17262},
+    {"segment": "일반이사", "week": "W51", "cpl": 18167}, {"segment": "일반이사", "week": "W52", "cpl": 34082},
+    {"segment": "일반이사", "week": "W01", "cpl": 15044}, {"segment": "일반이사", "week": "W02", "cpl": 5170},
+    {"segment": "일반이사", "week": "W03", "cpl": 9728}, {"segment": "일반이사", "week": "W04", "cpl": 15113},
+    {"segment": "일반이사", "week": "W05", "cpl": 7201},
+    # 외국인
+    {"segment": "외국인", "week": "W45", "cpl": 18677}, {"segment": "외국인", "week": "W46", "cpl": 10026},
+    {"segment": "외국인", "week": "W47", "cpl": 12529}, {"segment": "외국인", "week": "W48", "cpl": 14458},
+    {"segment": "외국인", "week": "W49", "cpl": 7376}, {"segment": "외국인", "week": "W50", "cpl": 26645},
+    {"segment": "외국인", "week": "W51", "cpl": 7631}, {"segment": "외국인", "week": "W52", "cpl": 12236},
+    {"segment": "외국인", "week": "W01", "cpl": 12862}, {"segment": "외국인", "week": "W02", "cpl": 7332},
+    {"segment": "외국인", "week": "W03", "cpl": 8207}, {"segment": "외국인", "week": "W04", "cpl": 8601},
+    {"segment": "외국인", "week": "W05", "cpl": 10076},
+])
+
+# ── Weekly Data (Meta) ──
+meta_platform_weekly = pd.DataFrame([
+    {"platform": "Instagram", "week": "W45", "cpl": 6072}, {"platform": "Instagram", "week": "W46", "cpl": 6507},
+    {"platform": "Instagram", "week": "W47", "cpl": 5386}, {"platform": "Instagram", "week": "W48", "cpl": 6515},
+    {"platform": "Instagram", "week": "W49", "cpl": 5720}, {"platform": "Instagram", "week": "W50", "cpl": 5190},
+    {"platform": "Instagram", "week": "W51", "cpl": 5405}, {"platform": "Instagram", "week": "W52", "cpl": 5132},
+    {"platform": "Instagram", "week": "W01", "cpl": 5143}, {"platform": "Instagram", "week": "W02", "cpl": 4688},
+    {"platform": "Instagram", "week": "W03", "cpl": 4767}, {"platform": "Instagram", "week": "W04", "cpl": 4728},
+    {"platform": "Instagram", "week": "W05", "cpl": 4497},
+    {"platform": "Facebook", "week": "W45", "cpl": 6548}, {"platform": "Facebook", "week": "W46", "cpl": 5038},
+    {"platform": "Facebook", "week": "W47", "cpl": 5884}, {"platform": "Facebook", "week": "W48", "cpl": 6059},
+    {"platform": "Facebook", "week": "W49", "cpl": 2748}, {"platform": "Facebook", "week": "W50", "cpl": 3552},
+    {"platform": "Facebook", "week": "W51", "cpl": 3623}, {"platform": "Facebook", "week": "W52", "cpl": 5948},
+    {"platform": "Facebook", "week": "W01", "cpl": 5088}, {"platform": "Facebook", "week": "W02", "cpl": 6332},
+    {"platform": "Facebook", "week": "W03", "cpl": 7580}, {"platform": "Facebook", "week": "W04", "cpl": 5384},
+    {"platform": "Facebook", "week": "W05", "cpl": 5106},
+    {"platform": "Threads", "week": "W45", "cpl": 2706}, {"platform": "Threads", "week": "W46", "cpl": 4334},
+    {"platform": "Threads", "week": "W47", "cpl": 4638}, {"platform": "Threads", "week": "W48", "cpl": 4708},
+    {"platform": "Threads", "week": "W49", "cpl": 3622}, {"platform": "Threads", "week": "W50", "cpl": 3696},
+    {"platform": "Threads", "week": "W51", "cpl": 4591}, {"platform": "Threads", "week": "W52", "cpl": 5612},
+    {"platform": "Threads", "week": "W01", "cpl": 4967}, {"platform": "Threads", "week": "W02", "cpl": 4724},
+    {"platform": "Threads", "week": "W03", "cpl": 4437}, {"platform": "Threads", "week": "W04", "cpl": 3470},
+    {"platform": "Threads", "week": "W05", "cpl": 3044},
+])
+
+meta_adset_weekly = pd.DataFrame([
+    # 가격 소재
+    {"adset": "가격 소재", "week": "W45", "cpl": 5318}, {"adset": "가격 소재", "week": "W46", "cpl": 5941},
+    {"adset": "가격 소재", "week": "W47", "cpl": 5516}, {"adset": "가격 소재", "week": "W48", "cpl": 6192},
+    {"adset": "가격 소재", "week": "W49", "cpl": 5978}, {"adset": "가격 소재", "week": "W50", "cpl": 5139},
+    {"adset": "가격 소재", "week": "W51", "cpl": 5627}, {"adset": "가격 소재", "week": "W52", "cpl": 5608},
+    {"adset": "가격 소재", "week": "W01", "cpl": 4788}, {"adset": "가격 소재", "week": "W02", "cpl": 4455},
+    {"adset": "가격 소재", "week": "W03", "cpl": 4611}, {"adset": "가격 소재", "week": "W04", "cpl": 4459},
+    {"adset": "가격 소재", "week": "W05", "cpl": 4567},
+    # 에브리타임
+    {"adset": "에브리타임", "week": "W45", "cpl": 5865}, {"adset": "에브리타임", "week": "W46", "cpl": 6627},
+    {"adset": "에브리타임", "week": "W47", "cpl": 4333}, {"adset": "에브리타임", "week": "W48", "cpl": 7047},
+    {"adset": "에브리타임", "week": "W49", "cpl": 5111}, {"adset": "에브리타임", "week": "W50", "cpl": 4549},
+    {"adset": "에브리타임", "week": "W51", "cpl": 4639}, {"adset": "에브리타임", "week": "W52", "cpl": 4190},
+    {"adset": "에브리타임", "week": "W01", "cpl": 5345}, {"adset": "에브리타임", "week": "W02", "cpl": 5245},
+    {"adset": "에브리타임", "week": "W03", "cpl": 6092}, {"adset": "에브리타임", "week": "W04", "cpl": 5992},
+    {"adset": "에브리타임", "week": "W05", "cpl": 3912},
+    # 소재 ALL
+    {"adset": "소재 ALL", "week": "W45", "cpl": 10069}, {"adset": "소재 ALL", "week": "W46", "cpl": 10005},
+    {"adset": "소재 ALL", "week": "W47", "cpl": 5631}, {"adset": "소재 ALL", "week": "W48", "cpl": 7164},
+    {"adset": "소재 ALL", "week": "W49", "cpl": 4477}, {"adset": "소재 ALL", "week": "W50", "cpl": 5225},
+    {"adset": "소재 ALL", "week": "W51", "cpl": 5389}, {"adset": "소재 ALL", "week": "W52", "cpl": 4802},
+    {"adset": "소재 ALL", "week": "W01", "cpl": 5026}, {"adset": "소재 ALL", "week": "W02", "cpl": 15201},
+    # 이사 가격 (skip W46 where conv=0)
+    {"adset": "이사 가격", "week": "W45", "cpl": 4553}, {"adset": "이사 가격", "week": "W47", "cpl": 3451},
+    {"adset": "이사 가격", "week": "W48", "cpl": 3850}, {"adset": "이사 가격", "week": "W49", "cpl": 3956},
+    {"adset": "이사 가격", "week": "W50", "cpl": 2888}, {"adset": "이사 가격", "week": "W51", "cpl": 3760},
+    {"adset": "이사 가격", "week": "W52", "cpl": 4024}, {"adset": "이사 가격", "week": "W01", "cpl": 4158},
+    {"adset": "이사 가격", "week": "W02", "cpl": 4470}, {"adset": "이사 가격", "week": "W03", "cpl": 4776},
+    {"adset": "이사 가격", "week": "W04", "cpl": 4587}, {"adset": "이사 가격", "week": "W05", "cpl": 3105},
+])
+
+
+# 대시보드가 사용하는 집계 테이블 (이름 → DataFrame)
+BASELINE_TABLES = {
+    'google_intent': google_intent,
+    'google_campaign': google_campaign,
+    'pmax_asset': pmax_asset,
+    'meta_adset': meta_adset,
+    'meta_plat_month': meta_plat_month,
+    'meta_creative_month': meta_creative_month,
+    'google_campaign_weekly': google_campaign_weekly,
+    'google_intent_weekly': google_intent_weekly,
+    'meta_platform_weekly': meta_platform_weekly,
+    'meta_adset_weekly': meta_adset_weekly,
+}
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — 합성 광고 데이터 생성기
+Synthetic Google / Meta ad data for load and scale testing.
+
+실제 분석 테이블(data.py)의 CPC·CTR·CVR·예산 비중으로 분포를 보정한 뒤
+  - Google: 캠페인 × 키워드 × 검색어 × 일
+  - Meta:   플랫폼 × 광고세트 × 소재 × 일
+팩트 테이블을 Parquet 으로 스트리밍 기록한다. 한 번에 메모리에 올라가는 것은
+(계정 1개 × chunk 일수) 분량뿐이라 수천만 행도 일정한 메모리로 생성된다.
+metrics.py 의 *_from_facts 함수로 대시보드 테이블 스키마로 롤업할 수 있다.
+
+    python datagen.py --out data --accounts 20 --keywords 2000 --days 1095
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data import (DATA_DIR, GOOGLE_FACTS, META_FACTS, google_campaign, google_intent, pmax_asset,
+                  meta_adset, meta_plat_month)
+from geo import REGIONS as GEO_REGIONS, UNASSIGNED
+from metrics import GOOGLE_FACT_COLUMNS, META_FACT_COLUMNS, PMAX_CAMPAIGN, week_label
+
+# 분석 기간 일수 (2025.11.02 ~ 2026.01.31)
+BASE_DAYS = 91
+
+
+# ═══════════════════════════════════════════════
+# Vocabulary
+# ═══════════════════════════════════════════════
+SEGMENT_TERMS = {
+    '브랜드': ['이사대학', '이사대학 앱', '이사대학 견적', '이사대학 후기'],
+    '기타(영어+이삿짐센터)': ['이삿짐센터', '이삿짐센터 추천', 'moving company seoul', 'moving service korea', 'korea movers'],
+    '원룸/소형': ['원룸이사', '원룸 이사 비용', '투룸이사', '소형이사', '반포장 이사', '원룸 반포장'],
+    '포장이사': ['포장이사', '포장이사 비용', '포장이사 업체', '보관이사'],
+    '일반이사': ['이사', '이사 업체', '이삿짐', '이사 준비', '이사 날짜'],
+    '가격/견적': ['이사 견적', '이사 가격', '이사 비용 비교', '이사 견적 비교', '이사 비용'],
+    '용달/화물': ['용달', '1톤 용달', '용달 가격', '화물 운송', '용달이사', '다마스 용달'],
+    '지역+이사': ['이사', '원룸이사', '포장이사', '용달이사', '이사 업체'],
+    '외국인': ['moving in korea', 'foreigner moving korea', 'english moving service'],
+}
+REGIONS = ['서울', '강남', '관악', '마포', '송파', '신림', '부산', '인천', '수원', '대전', '대구', '광주', '성남', '고양', '용인']
+MODIFIERS = ['', ' 추천', ' 비용', ' 후기', ' 저렴한', ' 당일', ' 주말', ' 가격']
+MATCH_TYPES = ['완전일치', '구문일치', '확장검색']
+MATCH_PROBS = [0.3, 0.3, 0.4]
+# 일치 유형별 CTR·CVR 배율 (완전일치가 가장 의도가 명확)
+MATCH_CTR = np.array([1.25, 1.0, 0.85])
+MATCH_CVR = np.array([1.2, 1.0, 0.8])
+
+PLATFORMS = ['Instagram', 'Facebook', 'Threads']
+# 요일별 수요 (월~일) — 주말에 검색·상담신청 소폭 감소
+WEEKDAY_FACTOR = np.array([1.08, 1.04, 1.0, 1.0, 0.97, 0.92, 0.99])
+
+
+# ═══════════════════════════════════════════════
+# Calibration (data.py 기준)
+# ═══════════════════════════════════════════════
+def _google_profile():
+    gi = google_intent.copy()
+    gi['campaign'] = np.where(gi['segment'] == '외국인', '검색광고(외국인)', '검색광고(내국인)')
+    gi['cpc'] = gi['cost'] / gi['clicks']
+    gi['ctr'] = gi['clicks'] / gi['impressions']
+    gi['cvr'] = gi['conversions'] / gi['clicks']
+    gi['kw_share'] = gi['keywords'] / gi['keywords'].sum()
+    gi['daily_impr'] = gi['impressions'] / gi['keywords'] / BASE_DAYS
+    return gi
+
+
+def _pmax_profile():
+    pm = pmax_asset.copy()
+    pm['asset_group'] = pm['에셋그룹'].str.replace('\n', '', regex=False)
+    pm['clicks'] = pm['전환'] / (pm['CVR'] / 100)
+    pm['cpc'] = pm['비용'] / pm['clicks']
+    pm['ctr'] = 0.03
+    pm['cvr'] = pm['CVR'] / 100
+    pm['daily_impr'] = pm['clicks'] / pm['ctr'] / BASE_DAYS
+    return pm
+
+
+def _meta_profile():
+    ma = meta_adset.copy()
+    ma['adset'] = ma['소재'].str.replace('"', '', regex=False)
+    ma['ctr'] = ma['CTR'] / 100
+    ma['cvr'] = ma['CVR'] / 100
+    ma['cpc'] = ma['CPL'] * ma['cvr']
+    ma['cpm'] = ma['cpc'] * ma['ctr'] * 1000
+    ma['share'] = np.maximum(ma['예산비중'], 0.1)
+    ma['share'] /= ma['share'].sum()
+    plat = meta_plat_month.groupby('플랫폼').agg({'비용': 'sum', '전환': 'sum'})
+    plat['share'] = plat['비용'] / plat['비용'].sum()
+    plat['cpl'] = plat['비용'] / plat['전환']
+    # 플랫폼 CPL 차이를 CVR 배율로 반영
+    plat['cvr_mult'] = (plat['비용'].sum() / plat['전환'].sum()) / plat['cpl']
+    return ma, plat.reindex(PLATFORMS)
+
+
+def _season(dates):
+    # 요일 효과 × 월말(손없는날·계약 만기) 수요 증가
+    dates = pd.DatetimeIndex(dates)
+    weekday = WEEKDAY_FACTOR[dates.weekday]
+    month_end = np.where(dates.day >= 24, 1.15, 1.0)
+    return weekday * month_end
+
+
+def _dict_array(codes, dictionary):
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(dictionary, type=pa.string()))
+
+
+def _chunks(start, days, chunk_days):
+    dates = pd.date_range(start, periods=days, freq='D')
+    for i in range(0, days, chunk_days):
+        yield dates[i:i + chunk_days]
+
+
+# ═══════════════════════════════════════════════
+# Google
+# ═══════════════════════════════════════════════
+def _google_units(rng, n_keywords, terms_per_keyword):
+    """계정 1개의 (키워드, 검색어) 단위 — 단위별 기대 노출·CTR·CVR·CPC."""
+    gi = _google_profile()
+    seg_idx = rng.choice(len(gi), size=n_keywords, p=gi['kw_share'].to_numpy())
+    match_idx = rng.choice(len(MATCH_TYPES), size=n_keywords, p=MATCH_PROBS)
+
+    keywords, seen = [], set()
+    for i, s in enumerate(seg_idx):
+        seg = gi['segment'].iat[s]
+        base = SEGMENT_TERMS[seg][rng.integers(len(SEGMENT_TERMS[seg]))]
+        kw = base + MODIFIERS[rng.integers(len(MODIFIERS))]
+        if seg == '지역+이사' or kw in seen:
+            kw = f'{REGIONS[rng.integers(len(REGIONS))]} {kw}'
+        if kw in seen:
+            kw = f'{kw} {i}'
+        seen.add(kw)
+        keywords.append(kw)
+
+    n_units = n_keywords * terms_per_keyword
+    kw_of_unit = np.repeat(np.arange(n_keywords), terms_per_keyword)
+    # 검색어: 첫 번째는 키워드 그대로, 나머지는 변형
+    terms = []
+    for k, kw in enumerate(keywords):
+        terms.append(kw)
+        for _ in range(terms_per_keyword - 1):
+            variant = kw + MODIFIERS[rng.integers(1, len(MODIFIERS))]
+            if rng.random() < 0.3:
+                variant = f'{REGIONS[rng.integers(len(REGIONS))]} {variant}'
+            terms.append(variant)
+
+    s = seg_idx[kw_of_unit]
+    m = match_idx[kw_of_unit]
+    # 키워드별 품질 편차 (로그정규) + 검색어별 노출 비중 (디리클레)
+    kw_volume = rng.lognormal(0, 0.8, n_keywords)
+    kw_volume /= kw_volume.mean()
+    term_weight = rng.dirichlet(np.ones(terms_per_keyword) * 2, size=n_keywords).ravel() * terms_per_keyword
+    units = {
+        'segment_idx': s,
+        'match_idx': m,
+        'keyword_idx': kw_of_unit,
+        'impr': gi['daily_impr'].to_numpy()[s] * kw_volume[kw_of_unit] * term_weight / terms_per_keyword,
+        'ctr': np.clip(gi['ctr'].to_numpy()[s] * MATCH_CTR[m] * rng.lognormal(0, 0.35, n_units), 0, 0.9),
+        'cvr': np.clip(gi['cvr'].to_numpy()[s] * MATCH_CVR[m] * rng.lognormal(0, 0.6, n_units), 0, 0.9),
+        'cpc': gi['cpc'].to_numpy()[s] * rng.lognormal(0, 0.2, n_units),
+        'campaign': gi['campaign'].to_numpy()[s],
+    }
+    return units, keywords, terms, list(gi['segment'])
+
+
+def generate_google(path, accounts=1, keywords=369, days=BASE_DAYS, start='2025-11-02',
+                    terms_per_keyword=3, seed=0, chunk_rows=1_000_000):
+    rng = np.random.default_rng(seed)
+    pm = _pmax_profile()
+    campaigns = [PMAX_CAMPAIGN, '검색광고(내국인)', '검색광고(외국인)']
+    camp_code = {c: i for i, c in enumerate(campaigns)}
+    rows = 0
+    writer = None
+    try:
+        for a in range(accounts):
+            account = f'account-{a + 1:03d}'
+            scale = rng.lognormal(0, 0.5) if a else 1.0
+            units, kw_names, term_names, segments = _google_units(rng, keywords, terms_per_keyword)
+            # PMax 에셋그룹은 키워드 대신 에셋그룹 이름을 키워드 자리에 둔다
+            n_pm = len(pm)
+            kw_dict = kw_names + list(pm['asset_group'])
+            term_dict = term_names + list(pm['asset_group'])
+            seg_dict = segments + [PMAX_CAMPAIGN]
+            match_dict = MATCH_TYPES + [PMAX_CAMPAIGN]
+            impr = np.concatenate([units['impr'], pm['daily_impr'].to_numpy()])
+            ctr = np.concatenate([units['ctr'], pm['ctr'].to_numpy()])
+            cvr = np.concatenate([units['cvr'], pm['cvr'].to_numpy()])
+            cpc = np.concatenate([units['cpc'], pm['cpc'].to_numpy()])
+            camp = np.concatenate([[camp_code[c] for c in units['campaign']], np.zeros(n_pm, dtype=int)])
+            seg = np.concatenate([units['segment_idx'], np.full(n_pm, len(segments))])
+            match = np.concatenate([units['match_idx'], np.full(n_pm, len(MATCH_TYPES))])
+            kw = np.concatenate([units['keyword_idx'], len(kw_names) + np.arange(n_pm)])
+            term = np.concatenate([np.arange(len(term_names)), len(term_names) + np.arange(n_pm)])
+            n_units = len(impr)
+
+            chunk_days = max(1, chunk_rows // n_units)
+            for dates in _chunks(start, days, chunk_days):
+                n_days = len(dates)
+                u = np.tile(np.arange(n_units), n_days)
+                d = np.repeat(np.arange(n_days), n_units)
+                lam = impr[u] * _season(dates)[d] * scale
+                impressions = rng.poisson(lam)
+                clicks = rng.binomial(impressions, ctr[u])
+                conversions = rng.binomial(clicks, cvr[u]).astype('float64')
+                # Google 은 데이터 기반 기여로 소수점 전환이 섞인다
+                frac = rng.random(len(u)) < 0.1
+                conversions[frac] *= rng.choice([0.5, 0.33, 0.67], size=frac.sum())
+                cost = np.rint(clicks * cpc[u] * rng.lognormal(0, 0.15, len(u))).astype('int64')
+
+                weeks = week_label(dates)
+                week_dict, week_codes = np.unique(weeks, return_inverse=True)
+                table = pa.table({
+                    'account': _dict_array(np.zeros(len(u), dtype=np.int32), [account]),
+                    'date': pa.array(dates.values.astype('datetime64[D]')[d]),
+                    'week': _dict_array(week_codes[d], list(week_dict)),
+                    'campaign': _dict_array(camp[u], campaigns),
+                    'segment': _dict_array(seg[u], seg_dict),
+                    'keyword': _dict_array(kw[u], kw_dict),
+                    'match_type': _dict_array(match[u], match_dict),
+                    'search_term': _dict_array(term[u], term_dict),
+                    'impressions': impressions.astype('int64'),
+                    'clicks': clicks.astype('int64'),
+                    'cost': cost,
+                    'conversions': conversions,
+                }).select(GOOGLE_FACT_COLUMNS)
+                if writer is None:
+                    # 계정마다 사전(dictionary)이 다르므로 스키마는 plain string 으로 고정
+                    schema = pa.schema([f.with_type(pa.string()) if pa.types.is_dictionary(f.type) else f
+                                        for f in table.schema])
+                    writer = pq.ParquetWriter(path, schema, compression='zstd')
+                writer.write_table(table.cast(writer.schema))
+                rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+# ═══════════════════════════════════════════════
+# Meta
+# ═══════════════════════════════════════════════
+def _meta_units(rng, creatives_per_adset, days):
+    """계정 1개의 (플랫폼, 광고세트, 소재) 단위 — 소재별 출시일·피로도 포함."""
+    ma, plat = _meta_profile()
+    n_adsets = len(ma)
+    n_creatives = n_adsets * creatives_per_adset
+    adset_of = np.repeat(np.arange(n_adsets), creatives_per_adset)
+    creative_names = [f'{ma["adset"].iat[a]} #{i + 1:02d}' for a in range(n_adsets) for i in range(creatives_per_adset)]
+    # 소재별: 품질(CTR·CVR 편차), 출시일, 유효 수명(피로 곡선)
+    quality_ctr = rng.lognormal(0, 0.3, n_creatives)
+    quality_cvr = rng.lognormal(0, 0.3, n_creatives)
+    weight = rng.dirichlet(np.ones(creatives_per_adset), size=n_adsets).ravel()
+    launch = np.where(np.arange(n_creatives) % creatives_per_adset == 0, 0,
+                      rng.integers(0, max(days - 14, 1), n_creatives))
+    life = rng.uniform(30, 120, n_creatives)
+
+    n_plat = len(PLATFORMS)
+    p = np.repeat(np.arange(n_plat), n_creatives)
+    c = np.tile(np.arange(n_creatives), n_plat)
+    a = adset_of[c]
+    units = {
+        'platform_idx': p,
+        'creative_idx': c,
+        'adset_idx': a,
+        'spend': (25_463_928 / BASE_DAYS) * ma['share'].to_numpy()[a] * plat['share'].to_numpy()[p] * weight[c],
+        'cpm': ma['cpm'].to_numpy()[a] * rng.lognormal(0, 0.15, len(c)),
+        'ctr': ma['ctr'].to_numpy()[a] * quality_ctr[c],
+        'cvr': np.clip(ma['cvr'].to_numpy()[a] * plat['cvr_mult'].to_numpy()[p] * quality_cvr[c], 0, 0.9),
+        'launch': launch[c],
+        'life': life[c],
+    }
+    return units, ma, creative_names
+
+
+def generate_meta(path, accounts=1, creatives_per_adset=4, days=BASE_DAYS, start='2025-11-02',
+                  seed=0, chunk_rows=1_000_000):
+    rng = np.random.default_rng(seed + 1)
+    rows = 0
+    writer = None
+    try:
+        for acct in range(accounts):
+            account = f'account-{acct + 1:03d}'
+            scale = rng.lognormal(0, 0.5) if acct else 1.0
+            units, ma, creative_names = _meta_units(rng, creatives_per_adset, days)
+            n_units = len(units['spend'])
+            chunk_days = max(1, chunk_rows // n_units)
+            day0 = 0
+            for dates in _chunks(start, days, chunk_days):
+                n_days = len(dates)
+                u = np.tile(np.arange(n_units), n_days)
+                d = np.repeat(np.arange(n_days), n_units)
+                age = (day0 + d) - units['launch'][u]
+                live = age >= 0
+                u, d, age = u[live], d[live], age[live]
+                day0 += n_days
+
+                # 소재 피로: 노출 빈도가 오르고 CTR 이 수명에 따라 바닥(60%)까지 감소
+                fatigue = 0.6 + 0.4 * np.exp(-age / units['life'][u])
+                spend = units['spend'][u] * _season(dates)[d] * scale * rng.lognormal(0, 0.25, len(u))
+                impressions = rng.poisson(spend / units['cpm'][u] * 1000)
+                frequency = 1.05 + age / 60.0
+                reach = np.maximum(np.rint(impressions / frequency), np.minimum(impressions, 1)).astype('int64')
+                clicks = rng.binomial(impressions, np.clip(units['ctr'][u] * fatigue, 0, 0.9))
+                conversions = rng.binomial(clicks, units['cvr'][u])
+                cost = np.rint(spend).astype('int64')
+
+                weeks = week_label(dates)
+                week_dict, week_codes = np.unique(weeks, return_inverse=True)
+                a = units['adset_idx'][u]
+                table = pa.table({
+                    'account': _dict_array(np.zeros(len(u), dtype=np.int32), [account]),
+                    'date': pa.array(dates.values.astype('datetime64[D]')[d]),
+                    'week': _dict_array(week_codes[d], list(week_dict)),
+                    'platform': _dict_array(units['platform_idx'][u], PLATFORMS),
+                    'adset': _dict_array(a, list(ma['adset'])),
+                    'target': _dict_array(a, list(ma['타겟'])),
+                    'creative': _dict_array(units['creative_idx'][u], creative_names),
+                    'impressions': impressions.astype('int64'),
+                    'reach': reach,
+                    'clicks': clicks.astype('int64'),
+                    'cost': cost,
+                    'conversions': conversions.astype('int64'),
+                }).select(META_FACT_COLUMNS)
+                if writer is None:
+                    schema = pa.schema([f.with_type(pa.string()) if pa.types.is_dictionary(f.type) else f
+                                        for f in table.schema])
+                    writer = pq.ParquetWriter(path, schema, compression='zstd')
+                writer.write_table(table.cast(writer.schema))
+                rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+# ═══════════════════════════════════════════════
+# Bookings (internal DB stand-in)
+# ═══════════════════════════════════════════════
+# 세그먼트·광고세트별 상담 → 예약 전환율 (소형·용달은 결정이 빠르고, 일반·포장이사는 견적 비교가 길다)
+BOOKING_RATES = {
+    '브랜드': 0.42, '원룸/소형': 0.36, '용달/화물': 0.38, '가격/견적': 0.24,
+    '포장이사': 0.2, '일반이사': 0.22, '지역+이사': 0.25, '외국인': 0.3,
+}
+DEFAULT_BOOKING_RATE = 0.25
+AVG_BOOKING_REVENUE = 320_000
+CANCEL_RATE = 0.06
+
+BOOKINGS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id TEXT PRIMARY KEY, click_id TEXT, channel TEXT, campaign TEXT,
+    ad_group TEXT, asset TEXT, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_id TEXT, lead_id TEXT, booked_at TEXT, revenue INTEGER
+);
+"""
+
+
+def _fact_assets(path, columns):
+    """팩트 Parquet → (자산 × 기간) 전환 합계. 배치 단위로 읽어 메모리 일정."""
+    parts = []
+    for batch in pq.ParquetFile(path).iter_batches(columns=columns + ['date', 'conversions']):
+        df = batch.to_pandas()
+        parts.append(df.groupby(columns, observed=True).agg(
+            conversions=('conversions', 'sum'), first=('date', 'min'), last=('date', 'max')))
+    agg = pd.concat(parts).groupby(level=list(range(len(columns)))).agg(
+        conversions=('conversions', 'sum'), first=('first', 'min'), last=('last', 'max'))
+    return agg.reset_index()
+
+
+def generate_bookings(db_path, google_path, meta_path, seed=0, chunk_rows=500_000):
+    """팩트 전환 수만큼 상담신청(leads)을 만들고 일부를 예약·취소(bookings)로 잇는다."""
+    rng = np.random.default_rng(seed + 2)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    con = sqlite3.connect(db_path)
+    con.executescript(BOOKINGS_SCHEMA)
+    n_leads = n_bookings = 0
+    sources = [('Google', google_path, ['campaign', 'segment', 'keyword'], 'gclid'),
+               ('Meta', meta_path, ['platform', 'adset', 'creative'], 'fbclid')]
+    for channel, path, columns, click in sources:
+        if not os.path.exists(path):
+            continue
+        assets = _fact_assets(path, columns)
+        counts = rng.poisson(assets['conversions'].to_numpy(dtype='float64').clip(min=0))
+        rate = assets[columns[1]].map(BOOKING_RATES).fillna(DEFAULT_BOOKING_RATE).to_numpy()
+        rate = (rate * rng.lognormal(0, 0.25, len(assets))).clip(0, 0.9)   # 자산마다 편차
+        first = pd.to_datetime(assets['first']).to_numpy().astype('datetime64[s]').astype('int64')
+        last = pd.to_datetime(assets['last']).to_numpy().astype('datetime64[s]').astype('int64') + 86_399
+        idx = np.repeat(np.arange(len(assets)), counts)
+        for lo in range(0, len(idx), chunk_rows):
+            a = idx[lo:lo + chunk_rows]
+            ids = np.arange(n_leads, n_leads + len(a))
+            lead_ids = [f'{channel[0]}{i:010d}' for i in ids]
+            created = first[a] + (rng.random(len(a)) * (last[a] - first[a])).astype('int64')
+            created_at = np.datetime_as_string(created.astype('datetime64[s]'))
+            con.executemany('INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?, ?)', zip(
+                lead_ids, [f'{click}-{i:x}' for i in ids], [channel] * len(a),
+                *(assets[c].to_numpy(dtype=object)[a] for c in columns), created_at))
+            booked = np.flatnonzero(rng.random(len(a)) < rate[a])
+            booked_at = created[booked] + rng.integers(3_600, 14 * 86_400, len(booked))
+            revenue = np.rint(rng.lognormal(np.log(AVG_BOOKING_REVENUE), 0.45, len(booked)) / 1000) * 1000
+            rows = [(f'B{n_bookings + j:010d}', lead_ids[i], str(t), int(r))
+                    for j, (i, t, r) in enumerate(zip(booked, booked_at.astype('datetime64[s]'), revenue))]
+            # 취소는 같은 예약 번호의 음수 매출 행으로 (추가만 되는 이벤트 테이블)
+            cancel = rng.random(len(rows)) < CANCEL_RATE
+            rows += [(b, l, str(np.datetime64(t) + np.timedelta64(86_400, 's')), -r)
+                     for (b, l, t, r), c in zip(rows, cancel) if c]
+            con.executemany('INSERT INTO bookings VALUES (?, ?, ?, ?)', rows)
+            con.commit()
+            n_leads += len(a)
+            n_bookings += len(booked)
+    con.close()
+    return n_leads, n_bookings
+
+
+# ═══════════════════════════════════════════════
+# Touchpoints (user-level paths)
+# ═══════════════════════════════════════════════
+TOUCH_RATE = 1.3          # 유저당 추가 터치 수 (포아송 평균)
+TOUCH_GAP_DAYS = 2.0      # 터치 간격 평균 (지수분포)
+CHANNEL_STICKINESS = 0.75  # 직전 터치와 같은 채널일 확률
+USER_CONVERSION = 0.16
+
+
+def _touch_campaigns():
+    """채널 → (캠페인, 가중치). 터치 수는 광고관리자 전환 비중에 비례."""
+    plat = meta_plat_month.groupby('플랫폼')['전환'].sum().reindex(PLATFORMS)
+    return {
+        'Google': (google_campaign['캠페인'].to_numpy(), google_campaign['전환'].to_numpy(dtype='float64')),
+        'Meta': (plat.index.to_numpy(), plat.to_numpy(dtype='float64')),
+    }
+
+
+def generate_touchpoints(path, users=200_000, days=BASE_DAYS, start='2025-11-02', seed=0, chunk_users=200_000):
+    """유저 × 시각 순으로 정렬된 터치포인트 로그 (attribution.py 입력)."""
+    rng = np.random.default_rng(seed + 3)
+    campaigns = _touch_campaigns()
+    channels = np.array(['Google', 'Meta'])
+    google_share = google_campaign['전환'].sum() / (google_campaign['전환'].sum() + meta_plat_month['전환'].sum())
+    t0 = np.datetime64(start, 's').astype('int64')
+    rows = 0
+    writer = None
+    try:
+        for lo in range(0, users, chunk_users):
+            n_users = min(chunk_users, users - lo)
+            n_touch = 1 + rng.poisson(TOUCH_RATE, n_users)
+            user = np.repeat(np.arange(lo, lo + n_users, dtype='int64'), n_touch)
+            first = np.r_[True, user[1:] != user[:-1]]
+            gap = np.where(first, rng.random(len(user)) * days * 86_400,
+                           rng.exponential(TOUCH_GAP_DAYS * 86_400, len(user)))
+            # 유저별 누적 시각 (reduceat 시작점에서 다시 0부터)
+            ts = np.cumsum(gap)
+            ts -= np.repeat(ts[first] - gap[first], n_touch)
+            # 채널: 첫 터치는 전환 비중대로, 이후엔 같은 채널에 머물 확률 CHANNEL_STICKINESS
+            # → 첫 채널 XOR (지금까지 채널을 바꾼 횟수의 홀짝)
+            first_ch = (rng.random(n_users) >= google_share).astype('int64')
+            flips = np.cumsum((rng.random(len(user)) >= CHANNEL_STICKINESS) & ~first)
+            flips -= np.repeat(flips[first], n_touch)
+            ch = np.repeat(first_ch, n_touch) ^ (flips % 2)
+            campaign = np.empty(len(user), dtype=object)
+            for c, name in enumerate(channels):
+                names, weights = campaigns[name]
+                sel = np.flatnonzero(ch == c)
+                campaign[sel] = names[rng.choice(len(names), len(sel), p=weights / weights.sum())]
+            # 전환: 마지막 터치 뒤 0~2일 (유저당 최대 1건)
+            last = np.r_[first[1:], True]
+            conv = np.flatnonzero(last & (rng.random(len(user)) < USER_CONVERSION * np.sqrt(n_touch[np.cumsum(first) - 1])))
+            df = pd.DataFrame({
+                'user_id': np.r_[user, user[conv]],
+                'ts': np.r_[ts, ts[conv] + rng.random(len(conv)) * 2 * 86_400],
+                'channel': np.r_[channels[ch], channels[ch[conv]]],
+                'campaign': np.r_[campaign, campaign[conv]],
+                'event': np.r_[np.full(len(user), 'click', dtype=object), np.full(len(conv), 'conversion', dtype=object)],
+            })
+            df['ts'] = (t0 + df['ts'].to_numpy().astype('int64')).astype('datetime64[s]')
+            df = df.sort_values(['user_id', 'ts'], kind='stable').reset_index(drop=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+            writer.write_table(table)
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+# ═══════════════════════════════════════════════
+# Location report (geo.py 입력)
+# ═══════════════════════════════════════════════
+# 시/도별 광고 노출 비중 (수도권 중심 — 대학생 · 사회초년생 원룸 이사)
+SIDO_WEIGHTS = {'서울': 0.45, '경기': 0.28, '인천': 0.07}
+OTHER_SIDO_WEIGHT = 0.2
+
+
+def _location_units(rng):
+    """위치 보고서 행 단위 (시/도, 시/군/구) + 노출 비중 + 지역 CVR 배수."""
+    units = GEO_REGIONS[GEO_REGIONS['sido'] != UNASSIGNED].copy()
+    has_city = set(units.loc[units['sigungu'] != '', 'sido'])
+    # 시/군/구 목록이 있는 시/도는 시/군/구 단위로만, 없는 시/도는 시/도 한 줄로
+    units = units[(units['sigungu'] != '') | ~units['sido'].isin(has_city)].reset_index(drop=True)
+    sido_weight = units['sido_short'].map(SIDO_WEIGHTS)
+    other = sido_weight.isna()
+    sido_weight[other] = OTHER_SIDO_WEIGHT / units.loc[other, 'sido'].nunique()
+    share = rng.gamma(2.0, 1.0, len(units))
+    share = share / pd.Series(share).groupby(units['sido']).transform('sum').to_numpy() * sido_weight.to_numpy()
+    cvr = rng.lognormal(0, 0.3, len(units))
+    return units['sido'].to_numpy(dtype=object), units['sigungu'].to_numpy(dtype=object), share, cvr
+
+
+def generate_locations(path, google_path, seed=0, noise=0.25):
+    """Google 팩트의 (일 × 캠페인) 합계를 유저 위치(시/도 × 시/군/구)로 나눈 위치 보고서."""
+    rng = np.random.default_rng(seed + 4)
+    region, city, share, cvr = _location_units(rng)
+    parts = []
+    for batch in pq.ParquetFile(google_path).iter_batches(columns=['date', 'campaign', 'impressions', 'clicks', 'cost', 'conversions']):
+        df = batch.to_pandas()
+        parts.append(df.groupby(['date', 'campaign'], observed=True).sum())
+    daily = pd.concat(parts).groupby(level=[0, 1]).sum().reset_index()
+    n, m = len(daily), len(region)
+    w = share[None, :] * rng.lognormal(0, noise, (n, m))
+    w /= w.sum(axis=1, keepdims=True)
+    cw = w * cvr[None, :]
+    cw /= cw.sum(axis=1, keepdims=True)
+    out = pd.DataFrame({
+        'date': np.repeat(daily['date'].to_numpy(), m),
+        'campaign': np.repeat(daily['campaign'].astype(str).to_numpy(dtype=object), m),
+        'region': np.tile(region, n),
+        'city': np.tile(city, n),
+        'impressions': np.rint(w * daily['impressions'].to_numpy()[:, None]).ravel().astype('int64'),
+        'clicks': np.rint(w * daily['clicks'].to_numpy()[:, None]).ravel().astype('int64'),
+        'cost': np.rint(w * daily['cost'].to_numpy()[:, None]).ravel().astype('int64'),
+        'conversions': np.round(cw * daily['conversions'].to_numpy()[:, None], 2).ravel(),
+    })
+    out = out[out['impressions'] > 0]
+    pq.write_table(pa.Table.from_pandas(out, preserve_index=False), path, compression='zstd')
+    return len(out)
+
+
+# ═══════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='합성 Google/Meta 광고 팩트 테이블 생성 (Parquet)')
+    parser.add_argument('--out', default=DATA_DIR, help='출력 디렉터리 (기본: 대시보드 데이터 디렉터리)')
+    parser.add_argument('--accounts', type=int, default=1)
+    parser.add_argument('--keywords', type=int, default=369, help='계정당 검색 키워드 수')
+    parser.add_argument('--terms-per-keyword', type=int, default=3)
+    parser.add_argument('--creatives', type=int, default=4, help='광고세트당 소재 수')
+    parser.add_argument('--days', type=int, default=BASE_DAYS)
+    parser.add_argument('--start', default='2025-11-02')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help='한 번에 생성·기록하는 최대 행 수')
+    parser.add_argument('--bookings', metavar='DB', help='상담신청·예약 SQLite DB 도 생성 (예: data/bookings.sqlite)')
+    parser.add_argument('--touchpoints', metavar='PATH', help='유저별 터치포인트 로그 Parquet 도 생성')
+    parser.add_argument('--users', type=int, default=200_000, help='터치포인트 로그 유저 수')
+    parser.add_argument('--locations', metavar='PATH', help='Google 위치 보고서 Parquet 도 생성 (예: data/google_location_daily.parquet)')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    t0 = time.perf_counter()
+    g_rows = generate_google(os.path.join(args.out, GOOGLE_FACTS), args.accounts, args.keywords, args.days,
+                             args.start, args.terms_per_keyword, args.seed, args.chunk_rows)
+    m_rows = generate_meta(os.path.join(args.out, META_FACTS), args.accounts, args.creatives, args.days,
+                           args.start, args.seed, args.chunk_rows)
+    print(f'{GOOGLE_FACTS}: {g_rows:,} rows')
+    print(f'{META_FACTS}: {m_rows:,} rows')
+    if args.bookings:
+        leads, bookings = generate_bookings(args.bookings, os.path.join(args.out, GOOGLE_FACTS),
+                                            os.path.join(args.out, META_FACTS), args.seed)
+        print(f'{args.bookings}: {leads:,} leads, {bookings:,} bookings')
+    if args.touchpoints:
+        rows = generate_touchpoints(args.touchpoints, args.users, args.days, args.start, args.seed)
+        print(f'{args.touchpoints}: {rows:,} rows')
+    if args.locations:
+        rows = generate_locations(args.locations, os.path.join(args.out, GOOGLE_FACTS), args.seed)
+        print(f'{args.locations}: {rows:,} rows')
+    print(f'done in {time.perf_counter() - t0:.1f}s → {args.out}')
+
+
+if __name__ == '__main__':
+    main()
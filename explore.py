@@ -0,0 +1,172 @@
+"""
+이사대학 마케팅 분석 — Explore (임베디드 SQL)
+Ad-hoc DuckDB queries over the fact tables and dashboard tables.
+
+데이터 버전마다 DuckDB 연결 하나를 만들고 다음을 테이블로 노출한다.
+  - google_facts / meta_facts : Parquet 이면 read_parquet 뷰 (필요한 컬럼·행 그룹만
+                                스트리밍, 집계가 메모리를 넘으면 임시 디렉터리로 spill),
+                                팩트 스토어면 매핑된 DataFrame 을 그대로 스캔
+  - google_intent, meta_adset … : 대시보드 집계 테이블 (data.py / 팩트 롤업)
+허용하는 문장은 SELECT 하나뿐이고, 연결을 만든 뒤 외부 파일 접근을 잠근다.
+결과는 (데이터 버전, 쿼리) 키로 LRU 캐시 — 같은 질문은 다시 계산하지 않는다.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import duckdb
+import pandas as pd
+
+from data import DATA_DIR
+from refresh import FACT_FILES, fact_store
+
+MAX_ROWS = 10_000
+CACHE_SIZE = 64
+MEMORY_LIMIT = '1GB'
+SPILL_DIR = os.path.join(tempfile.gettempdir(), 'moveuniv-duckdb')
+
+# 템플릿: 라벨 → (필요한 테이블, SQL)
+TEMPLATES = {
+    'CPL — 세그먼트 × 주차 × 매치유형': (('google_facts',), """\
+SELECT segment, match_type,
+       date_trunc('week', date)::DATE AS week,
+       SUM(cost) AS cost,
+       SUM(conversions) AS conversions,
+       ROUND(SUM(cost) / NULLIF(SUM(conversions), 0)) AS cpl
+FROM google_facts
+GROUP BY ALL
+ORDER BY segment, match_type, week"""),
+    '낭비 키워드 — 전환 0 · 비용 상위': (('google_facts',), """\
+SELECT segment, keyword, match_type,
+       SUM(clicks) AS clicks,
+       SUM(cost) AS cost
+FROM google_facts
+GROUP BY ALL
+HAVING SUM(conversions) = 0
+ORDER BY cost DESC
+LIMIT 100"""),
+    '검색어 — 전환 상위': (('google_facts',), """\
+SELECT search_term, segment,
+       SUM(clicks) AS clicks,
+       SUM(conversions) AS conversions,
+       ROUND(100.0 * SUM(conversions) / NULLIF(SUM(clicks), 0), 2) AS cvr,
+       ROUND(SUM(cost) / NULLIF(SUM(conversions), 0)) AS cpl
+FROM google_facts
+GROUP BY ALL
+ORDER BY conversions DESC
+LIMIT 100"""),
+    'Meta 소재 — 광고세트별 CPL': (('meta_facts',), """\
+SELECT adset, creative,
+       SUM(impressions) AS impressions,
+       ROUND(100.0 * SUM(clicks) / NULLIF(SUM(impressions), 0), 2) AS ctr,
+       SUM(cost) AS cost,
+       ROUND(SUM(cost) / NULLIF(SUM(conversions), 0)) AS cpl
+FROM meta_facts
+GROUP BY ALL
+ORDER BY adset, cpl NULLS LAST"""),
+    'Meta 플랫폼 × 주차': (('meta_facts',), """\
+SELECT platform,
+       date_trunc('week', date)::DATE AS week,
+       SUM(cost) AS cost,
+       SUM(conversions) AS conversions,
+       ROUND(SUM(cost) / NULLIF(SUM(conversions), 0)) AS cpl
+FROM meta_facts
+GROUP BY ALL
+ORDER BY platform, week"""),
+    '대시보드 — Google 세그먼트': (('google_intent',), """\
+SELECT *
+FROM google_intent
+ORDER BY CPL"""),
+    '대시보드 — Meta 광고세트': (('meta_adset',), """\
+SELECT *
+FROM meta_adset
+ORDER BY CPL"""),
+}
+
+
+class QueryError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    df: pd.DataFrame
+    elapsed: float
+    truncated: bool
+    cached: bool = False
+
+
+_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+class QueryEngine:
+    def __init__(self, dataset, data_dir=DATA_DIR, memory_limit=MEMORY_LIMIT):
+        self.version = dataset.version
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        self._con = duckdb.connect(config={'memory_limit': memory_limit, 'temp_directory': SPILL_DIR})
+        # 연결 하나를 여러 세션이 공유 — 등록한 DataFrame 은 연결 밖(cursor)에서 안 보이므로 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self.sources = {}
+        store = fact_store(data_dir)
+        # 팩트 Parquet 파일만 읽기 허용 — 데이터 디렉터리 전체(예약 DB·터치포인트·캐시)는 막는다
+        paths = []
+        for table, name in FACT_FILES.items():
+            if table not in dataset.facts:
+                continue
+            view, path = f'{table}_facts', os.path.join(data_dir, name)
+            if table not in store and os.path.exists(path):
+                self._con.execute(f"CREATE VIEW {view} AS SELECT * FROM read_parquet('{path}')")
+                self.sources[view] = 'parquet'
+                paths.append(os.path.abspath(path))
+            else:
+                self._con.register(view, dataset.facts[table])
+                self.sources[view] = 'store'
+        for name, df in dataset.tables.items():
+            self._con.register(name, df)
+            self.sources[name] = 'dashboard'
+        self._con.execute(f'SET allowed_directories = {[SPILL_DIR + os.sep]!r}')
+        self._con.execute(f'SET allowed_paths = {sorted(paths)!r}')
+        self._con.execute('SET enable_external_access = false')
+        self._con.execute('SET lock_configuration = true')
+
+    def tables(self):
+        return list(self.sources)
+
+    def templates(self):
+        return {label: sql for label, (needs, sql) in TEMPLATES.items() if all(t in self.sources for t in needs)}
+
+    def schema(self, table):
+        with self._lock:
+            return self._con.execute(f'DESCRIBE "{table}"').df()[['column_name', 'column_type']]
+
+    def query(self, sql, max_rows=MAX_ROWS):
+        """SELECT 한 문장 → QueryResult (버전 × 쿼리 캐시)."""
+        with self._lock:
+            statements = self._con.extract_statements(sql)
+        if len(statements) != 1:
+            raise QueryError('쿼리는 한 문장만 실행할 수 있습니다.')
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise QueryError('SELECT 문만 실행할 수 있습니다.')
+        text = statements[0].query.strip()
+        key = (self.version, text, max_rows)
+        with _CACHE_LOCK:
+            hit = _CACHE.get(key)
+            if hit is not None:
+                _CACHE.move_to_end(key)
+                return QueryResult(hit.df, hit.elapsed, hit.truncated, cached=True)
+
+        t0 = time.perf_counter()
+        with self._lock:
+            # 문장을 감싸지 않고 릴레이션으로 실행 — 끝의 ';' 나 주석이 있어도 그대로 동작
+            df = self._con.sql(text).limit(max_rows + 1).df()
+        result = QueryResult(df.head(max_rows), time.perf_counter() - t0, len(df) > max_rows)
+        with _CACHE_LOCK:
+            _CACHE[key] = result
+            while len(_CACHE) > CACHE_SIZE:
+                _CACHE.popitem(last=False)
+        return result
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — PDF / PPTX 리포트 내보내기
+Batch deck export: headless page capture, parallel figure rasterization, PDF + PPTX.
+
+대시보드 6개 페이지를 AppTest 로 headless 실행해 요소 트리(제목 · 섹션 · KPI 카드 ·
+인사이트 박스 · Plotly 차트)를 그대로 읽고, 16:9 슬라이드로 나눠 PDF 와 PPTX 로 쓴다.
+
+    1. capture    클라이언트(데이터 디렉터리)마다 새 인터프리터에서 AppTest 실행
+    2. layout     1920×1080 좌표로 배치, 차트마다 (spec, 크기) 래스터 작업
+    3. rasterize  kaleido 로 PNG — 프로세스 풀, 결과는 (spec + 크기) 해시로 디스크 캐시
+    4. render     같은 배치로 PDF(Pillow) · PPTX(python-pptx)
+
+데이터가 그대로면 차트 spec 도 같아 다음 달 · 다른 포맷 내보내기는 캐시 PNG 를 다시 쓴다.
+
+    python export.py --out decks
+    python export.py --client 이사대학=data --client 다른고객=/srv/b/data --format pdf pptx --workers 4
+
+한글 PDF 에는 CJK 폰트가 필요하다 (MOVEUNIV_FONT, 없으면 흔한 설치 경로에서 찾는다).
+"""
+
+import argparse
+import functools
+import hashlib
+import html
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+from PIL import Image, ImageDraw, ImageFont
+
+from data import DATA_DIR, REPORT_PERIOD
+from reportcache import CACHE_DIR, _write_atomic
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+PAGES = [
+    "Executive Summary",
+    "Google Deep-Dive",
+    "Google 수정 제안",
+    "Meta Deep-Dive",
+    "Meta 수정 제안",
+    "추가 인사이트",
+]
+FIGURE_DIR = os.path.join(CACHE_DIR, 'figures')
+FIGURE_SCALE = 2          # PPTX 확대에도 선명하게
+FIGURE_HEIGHT = 450       # layout.height 가 없는 차트
+FORMATS = ('pdf', 'pptx')
+READY_TIMEOUT = 600      # 파생 리포트 준비 대기 (초)
+PREPARING = '분석 리포트를 준비'   # app.py 의 '준비 중' 안내 앞부분
+
+# 슬라이드 좌표 (px). PPTX 16:9 = 12,192,000 EMU → 1px = 6350 EMU, 1px = 0.5pt
+SLIDE_W, SLIDE_H = 1920, 1080
+EMU_PER_PX = 6350
+MARGIN = 80
+TOP = 190
+BOTTOM = SLIDE_H - 70
+GAP = 24
+CONTENT_W = SLIDE_W - 2 * MARGIN
+TEXT_PX = 24
+LINE_PX = 38
+KPI_H = 170
+
+FONT = os.environ.get('MOVEUNIV_FONT')
+FONT_CANDIDATES = [
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    'C:/Windows/Fonts/malgun.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+]
+PPTX_FONT = 'Noto Sans KR'
+
+NAVY, BLUE, GREY = '#1B3A5C', '#2E75B6', '#888888'
+CARD_COLORS = {'': BLUE, 'green': '#2ECC71', 'red': '#E74C3C', 'orange': '#F39C12'}
+INSIGHT_COLORS = {   # (배경, 왼쪽 선) — app.py 의 .insight-box 와 같은 색
+    '': ('#eef2ff', BLUE),
+    'warning': ('#fff0e0', '#F39C12'),
+    'danger': ('#ffe8e8', '#E74C3C'),
+    'success': ('#e8ffee', '#2ECC71'),
+}
+
+
+# ═══════════════════════════════════════════════
+# Capture (AppTest 요소 트리 → 블록)
+# ═══════════════════════════════════════════════
+_TAG = re.compile(r'<[^>]+>')
+_BREAK = re.compile(r'<br\s*/?>|</div>|</p>|</li>|</tr>', re.I)
+_CARD = re.compile(
+    r'class="kpi-card ?([^"]*)".*?class="kpi-label">(.*?)</div>\s*<div class="kpi-value">(.*?)</div>'
+    r'(?:\s*<div class="kpi-delta">(.*?)</div>)?', re.S)
+_INSIGHT = re.compile(r'class="insight-box ?([^"]*)"')
+
+
+def _text(markup):
+    text = html.unescape(_TAG.sub('', _BREAK.sub('\n', markup))).replace('**', '')
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def _markdown_block(value):
+    head = value.lstrip()
+    if head.startswith('<style') or 'fancy-divider' in head or head.strip() == '---':
+        return None
+    if 'kpi-card' in head:
+        cards = [{'style': style.strip(), 'label': _text(label), 'value': _text(val), 'delta': _text(delta or '')}
+                 for style, label, val, delta in _CARD.findall(head)]
+        return {'kind': 'kpis', 'cards': cards} if cards else None
+    if 'section-header' in head:
+        return {'kind': 'section', 'text': _text(head)}
+    m = _INSIGHT.search(head)
+    if m:
+        return {'kind': 'insight', 'style': m.group(1).strip(), 'text': _text(head)}
+    if head.startswith('# '):
+        return {'kind': 'title', 'text': head[2:].strip()}
+    if head.startswith('#'):
+        return {'kind': 'text', 'text': head.lstrip('#').strip()}
+    text = _text(head)
+    return {'kind': 'text', 'text': text} if text else None
+
+
+def _blocks(node):
+    out = []
+    for el in node.children.values():
+        kind = getattr(el, 'type', '')
+        if kind == 'plotly_chart':
+            out.append({'kind': 'figure', 'spec': el.proto.spec})
+        elif kind == 'markdown':
+            block = _markdown_block(el.value)
+            if block:
+                out.append(block)
+        elif hasattr(el, 'children'):
+            columns = list(el.children.values())
+            if columns and all(getattr(c, 'type', '') == 'column' for c in columns):
+                cells = [_blocks(c) for c in columns]
+                if any(b['kind'] in ('figure', 'kpis') for cell in cells for b in cell):
+                    out.append({'kind': 'row', 'cells': cells})
+                else:   # 글만 있는 열은 세로로 이어 붙인다
+                    out.extend(b for cell in cells for b in cell)
+            else:       # 탭 · expander 등은 펼쳐서
+                out.extend(_blocks(el))
+    return out
+
+
+def capture(pages=PAGES):
+    """AppTest 로 페이지를 차례로 실행해 {version, pages: [{page, blocks}]} (현재 프로세스의 DATA_DIR)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    # 파생 리포트는 워커 스레드에서 만들어진다 — '준비 중' 안내가 사라질 때까지 다시 실행
+    deadline = time.monotonic() + READY_TIMEOUT
+    while any(i.value.startswith(PREPARING) for i in at.info):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f'derived reports not ready after {READY_TIMEOUT}s')
+        time.sleep(1)
+        at.run()
+    version = _version(at)
+    out = []
+    for page in pages:
+        at.sidebar.radio[0].set_value(page).run()
+        if at.exception:
+            raise RuntimeError(f'{page}: {at.exception[0].message}')
+        out.append({'page': page, 'blocks': _blocks(at.main)})
+    if _version(at) != version:   # 캡처 도중 새 버전이 올라오면 처음부터
+        return capture(pages)
+    return {'version': version, 'pages': out}
+
+
+def _version(at):
+    return next((c.value.split(':', 1)[1].strip() for c in at.sidebar.caption
+                 if c.value.startswith('데이터 버전')), 'baseline')
+
+
+def capture_client(data_dir):
+    """클라이언트 하나를 새 인터프리터에서 캡처 — DATA_DIR 는 data.py import 시점에 정해진다."""
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        env = dict(os.environ, MOVEUNIV_DATA_DIR=os.path.abspath(data_dir))
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--capture-to', path],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if proc.returncode:
+            raise RuntimeError(f'capture failed for {data_dir}:\n{proc.stderr[-2000:]}')
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+
+# ═══════════════════════════════════════════════
+# Layout
+# ═══════════════════════════════════════════════
+@functools.lru_cache(maxsize=None)
+def _font(size):
+    for path in [FONT] + FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def _wrap(text, size, width):
+    font = _font(size)
+    lines = []
+    for para in text.split('\n'):
+        line = ''
+        for word in para.split(' '):
+            trial = f'{line} {word}' if line else word
+            if font.getlength(trial) <= width:
+                line = trial
+                continue
+            if line:
+                lines.append(line)
+            line = ''
+            for ch in word:   # 한 단어가 줄보다 길면 글자 단위로
+                if font.getlength(line + ch) > width and line:
+                    lines.append(line)
+                    line = ''
+                line += ch
+        lines.append(line)
+    return lines
+
+
+class Slide:
+    def __init__(self, title, heading=None):
+        self.title = title
+        self.heading = heading
+        self.items = []   # (kind, x, y, w, h, payload)
+
+    def add(self, kind, x, y, w, h, payload):
+        self.items.append((kind, x, y, w, h, payload))
+
+
+def _figure_height(spec):
+    height = json.loads(spec).get('layout', {}).get('height') or FIGURE_HEIGHT
+    return int(min(height, BOTTOM - TOP))
+
+
+def _measure(block, width):
+    kind = block['kind']
+    if kind == 'kpis':
+        return KPI_H
+    if kind == 'figure':
+        return _figure_height(block['spec'])
+    if kind in ('insight', 'text'):
+        pad = 2 * GAP if kind == 'insight' else 0
+        return pad + LINE_PX * len(_wrap(block['text'], TEXT_PX, width - pad - 12))
+    if kind == 'row':
+        cell_w = (width - GAP * (len(block['cells']) - 1)) // len(block['cells'])
+        return max(sum(_measure(b, cell_w) + GAP for b in cell) - GAP for cell in block['cells'] if cell)
+    return 0
+
+
+def _place(slide, block, x, y, w, h):
+    kind = block['kind']
+    if kind == 'row':
+        n = len(block['cells'])
+        cell_w = (w - GAP * (n - 1)) // n
+        for i, cell in enumerate(block['cells']):
+            cy = y
+            for b in cell:
+                bh = min(_measure(b, cell_w), y + h - cy)
+                if bh > 0:
+                    _place(slide, b, x + i * (cell_w + GAP), cy, cell_w, bh)
+                cy += bh + GAP
+    elif kind in ('insight', 'text'):
+        pad = 2 * GAP if kind == 'insight' else 0
+        lines = _wrap(block['text'], TEXT_PX, w - pad - 12)[:max(1, (h - pad) // LINE_PX)]
+        slide.add(kind, x, y, w, h, dict(block, lines=lines))
+    else:
+        slide.add(kind, x, y, w, h, block)
+
+
+def paginate(deck, client):
+    """페이지 블록을 슬라이드로. 섹션마다 새 슬라이드, 넘치면 '(계속)' 슬라이드."""
+    start, end = REPORT_PERIOD
+    slides = [Slide(client, f"디지털 마케팅 심화 분석 · {start.replace('-', '.')} ~ {end.replace('-', '.')}")]
+    for page in deck['pages']:
+        title, heading = page['page'], None
+        slide, y = Slide(title), TOP
+        slides.append(slide)
+        for block in page['blocks']:
+            if block['kind'] == 'title':
+                slide.title = title = block['text']
+                continue
+            if block['kind'] == 'section':
+                heading = block['text']
+                if slide.items:
+                    slide, y = Slide(title, heading), TOP
+                    slides.append(slide)
+                else:
+                    slide.heading = heading
+                continue
+            h = min(_measure(block, CONTENT_W), BOTTOM - TOP)
+            if y + h > BOTTOM and slide.items:
+                slide, y = Slide(title, f'{heading} (계속)' if heading else None), TOP
+                slides.append(slide)
+            _place(slide, block, MARGIN, y, CONTENT_W, h)
+            y += h + GAP
+    return [s for s in slides if s.items or s is slides[0]]
+
+
+# ═══════════════════════════════════════════════
+# Rasterize (process pool + content-addressed PNG cache)
+# ═══════════════════════════════════════════════
+def figure_path(spec, width, height, scale=FIGURE_SCALE, root=FIGURE_DIR):
+    digest = hashlib.sha256(f'{width}x{height}@{scale}\n{spec}'.encode()).hexdigest()
+    return os.path.join(root, digest[:2], f'{digest}.png')
+
+
+def _rasterize(job):
+    spec, width, height, scale, path = job
+    import plotly.io as pio
+
+    _write_atomic(path, pio.to_image(json.loads(spec), format='png', width=width, height=height, scale=scale))
+    return path
+
+
+def rasterize(slides, workers=None, root=FIGURE_DIR):
+    """슬라이드의 차트를 PNG 로 — 캐시에 없는 것만 풀에서. (새로 그림, 캐시 사용) 개수."""
+    jobs, cached = {}, 0
+    for slide in slides:
+        for kind, x, y, w, h, block in slide.items:
+            if kind != 'figure':
+                continue
+            path = block['image'] = figure_path(block['spec'], w, h, root=root)
+            if os.path.exists(path):
+                cached += 1
+            elif path not in jobs:
+                jobs[path] = (block['spec'], w, h, FIGURE_SCALE, path)
+    if len(jobs) == 1:
+        _rasterize(next(iter(jobs.values())))
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            list(pool.map(_rasterize, jobs.values()))
+    return len(jobs), cached
+
+
+# ═══════════════════════════════════════════════
+# Render
+# ═══════════════════════════════════════════════
+def _fit(path, w, h):
+    """이미지를 (w, h) 상자 안에 비율 유지로 — (이미지, x 오프셋, y 오프셋)."""
+    img = Image.open(path).convert('RGB')
+    ratio = min(w / img.width, h / img.height)
+    size = (max(1, int(img.width * ratio)), max(1, int(img.height * ratio)))
+    return img.resize(size, Image.LANCZOS), (w - size[0]) // 2, (h - size[1]) // 2
+
+
+def _centered(draw, cx, y, text, size, fill):
+    draw.text((cx - _font(size).getlength(text) / 2, y), text, font=_font(size), fill=fill)
+
+
+def render_image(slide, footer):
+    im = Image.new('RGB', (SLIDE_W, SLIDE_H), 'white')
+    d = ImageDraw.Draw(im)
+    d.text((MARGIN, 50), slide.title, font=_font(44), fill=NAVY)
+    if slide.heading:
+        d.text((MARGIN, 118), slide.heading, font=_font(28), fill=NAVY)
+        d.line((MARGIN, 165, SLIDE_W - MARGIN, 165), fill=BLUE, width=4)
+    for kind, x, y, w, h, block in slide.items:
+        if kind == 'kpis':
+            n = len(block['cards'])
+            cw = (w - GAP * (n - 1)) // n
+            for i, card in enumerate(block['cards']):
+                cx = x + i * (cw + GAP)
+                d.rounded_rectangle((cx, y, cx + cw, y + h), 24, fill=CARD_COLORS.get(card['style'], BLUE))
+                _centered(d, cx + cw / 2, y + 22, card['label'], 22, 'white')
+                _centered(d, cx + cw / 2, y + 60, card['value'], 44, 'white')
+                _centered(d, cx + cw / 2, y + 122, card['delta'], 20, 'white')
+        elif kind in ('insight', 'text'):
+            pad = 0
+            if kind == 'insight':
+                bg, edge = INSIGHT_COLORS.get(block['style'], INSIGHT_COLORS[''])
+                d.rectangle((x, y, x + w, y + h), fill=bg)
+                d.rectangle((x, y, x + 6, y + h), fill=edge)
+                pad = GAP
+            for i, line in enumerate(block['lines']):
+                d.text((x + pad + 12, y + pad + i * LINE_PX), line, font=_font(TEXT_PX), fill='#333333')
+        elif kind == 'figure':
+            img, dx, dy = _fit(block['image'], w, h)
+            im.paste(img, (x + dx, y + dy))
+    d.text((MARGIN, SLIDE_H - 50), footer, font=_font(18), fill=GREY)
+    return im
+
+
+def write_pdf(slides, path, client):
+    pages = [render_image(s, f'{client} | Prepared by Casey | {i + 1}/{len(slides)}') for i, s in enumerate(slides)]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=144)
+
+
+def write_pptx(slides, path, client):
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Emu, Pt
+
+    def emu(px):
+        return Emu(int(px * EMU_PER_PX))
+
+    def rgb(color):
+        return RGBColor.from_string(color.lstrip('#'))
+
+    def text_box(shapes, x, y, w, h, paragraphs, align=None):
+        frame = shapes.add_textbox(emu(x), emu(y), emu(w), emu(h)).text_frame
+        frame.word_wrap = True
+        for i, (text, px, color) in enumerate(paragraphs):
+            p = frame.paragraphs[0] if i == 0 else frame.add_paragraph()
+            p.text = text
+            p.font.size, p.font.name, p.font.color.rgb = Pt(px / 2), PPTX_FONT, rgb(color)
+            if align:
+                p.alignment = align
+        return frame
+
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = emu(SLIDE_W), emu(SLIDE_H)
+    blank = prs.slide_layouts[6]
+    for n, slide in enumerate(slides):
+        s = prs.slides.add_slide(blank)
+        text_box(s.shapes, MARGIN, 40, CONTENT_W, 70, [(slide.title, 44, NAVY)])
+        if slide.heading:
+            text_box(s.shapes, MARGIN, 110, CONTENT_W, 50, [(slide.heading, 28, NAVY)])
+            line = s.shapes.add_shape(MSO_SHAPE.RECTANGLE, emu(MARGIN), emu(163), emu(CONTENT_W), emu(4))
+            line.fill.solid()
+            line.fill.fore_color.rgb = rgb(BLUE)
+            line.line.fill.background()
+        for kind, x, y, w, h, block in slide.items:
+            if kind == 'kpis':
+                k = len(block['cards'])
+                cw = (w - GAP * (k - 1)) // k
+                for i, card in enumerate(block['cards']):
+                    box = s.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, emu(x + i * (cw + GAP)), emu(y), emu(cw), emu(h))
+                    box.fill.solid()
+                    box.fill.fore_color.rgb = rgb(CARD_COLORS.get(card['style'], BLUE))
+                    box.line.fill.background()
+                    text_box(s.shapes, x + i * (cw + GAP), y + 12, cw, h - 24,
+                             [(card['label'], 22, '#FFFFFF'), (card['value'], 44, '#FFFFFF'), (card['delta'], 20, '#FFFFFF')],
+                             align=PP_ALIGN.CENTER)
+            elif kind in ('insight', 'text'):
+                pad = 0
+                if kind == 'insight':
+                    bg, edge = INSIGHT_COLORS.get(block['style'], INSIGHT_COLORS[''])
+                    for color, bw in ((bg, w), (edge, 6)):
+                        rect = s.shapes.add_shape(MSO_SHAPE.RECTANGLE, emu(x), emu(y), emu(bw), emu(h))
+                        rect.fill.solid()
+                        rect.fill.fore_color.rgb = rgb(color)
+                        rect.line.fill.background()
+                    pad = GAP
+                text_box(s.shapes, x + pad + 12, y + pad, w - 2 * pad - 12, h - 2 * pad,
+                         [(line, TEXT_PX, '#333333') for line in block['text'].split('\n')])
+            elif kind == 'figure':
+                img, dx, dy = _fit(block['image'], w, h)
+                s.shapes.add_picture(block['image'], emu(x + dx), emu(y + dy), emu(img.width), emu(img.height))
+        text_box(s.shapes, MARGIN, SLIDE_H - 56, CONTENT_W, 40,
+                 [(f'{client} | Prepared by Casey | {n + 1}/{len(slides)}', 18, GREY)])
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    prs.save(path)
+
+
+WRITERS = {'pdf': write_pdf, 'pptx': write_pptx}
+
+
+# ═══════════════════════════════════════════════
+# Batch
+# ═══════════════════════════════════════════════
+def export(clients, out_dir, formats=FORMATS, workers=None, figure_dir=FIGURE_DIR):
+    """clients: {이름: 데이터 디렉터리}. 클라이언트 · 포맷별 파일 경로 목록."""
+    workers = workers or os.cpu_count()
+    names = list(clients)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(workers, len(names))) as pool:
+        decks = dict(zip(names, pool.map(capture_client, [clients[n] for n in names])))
+    t1 = time.perf_counter()
+    slides = {name: paginate(decks[name], name) for name in names}
+    rendered, cached = rasterize([s for deck in slides.values() for s in deck], workers, figure_dir)
+    t2 = time.perf_counter()
+    paths = []
+    for name in names:
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}_{decks[name]['version']}.{fmt}")
+            WRITERS[fmt](slides[name], path, name)
+            paths.append(path)
+    print(f'{len(names)} clients, {sum(map(len, slides.values()))} slides: capture {t1 - t0:.1f}s, '
+          f'figures {rendered} rendered / {cached} cached {t2 - t1:.1f}s, write {time.perf_counter() - t2:.1f}s')
+    return paths
+
+
+def _client(arg):
+    name, sep, path = arg.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f'expected NAME=DATA_DIR, got {arg!r}')
+    return name, path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='대시보드 페이지를 PDF / PPTX 덱으로 내보내기')
+    parser.add_argument('--client', type=_client, action='append', metavar='NAME=DATA_DIR',
+                        help='여러 번 지정 가능 (기본: 이사대학=DATA_DIR)')
+    parser.add_argument('--out', default='decks')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--figure-cache', default=FIGURE_DIR)
+    parser.add_argument('--capture-to', help=argparse.SUPPRESS)   # capture_client 의 하위 프로세스
+    args = parser.parse_args(argv)
+
+    if args.capture_to:
+        with open(args.capture_to, 'w', encoding='utf-8') as f:
+            json.dump(capture(), f, ensure_ascii=False)
+        return
+
+    clients = dict(args.client or [('이사대학', DATA_DIR)])
+    for path in export(clients, args.out, args.format, args.workers, args.figure_cache):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
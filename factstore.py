@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — 메모리 매핑 팩트 스토어
+Columnar on-disk fact tables opened with np.load(mmap_mode='r').
+
+테이블마다 디렉터리 하나, 적재(ingest) 한 번이 파티션 하나다. 파티션은 컬럼별
+.npy 파일이고, 문자열 컬럼은 테이블 공통 카테고리 목록의 코드로 저장한다.
+읽기는 manifest 만 파싱하고 컬럼 파일을 매핑하므로 수년치 이력도 시작이 거의
+즉시이며, 같은 파일을 매핑한 모든 프로세스(Streamlit 서버·병렬 워커·배치)가
+OS 페이지 캐시 한 벌을 공유한다.
+
+    store/google/_manifest.json
+    store/google/part-00000/{account,date,cost,...}.npy
+
+manifest 는 임시 파일 → os.replace 로 바꿔 끼우므로 읽는 쪽은 항상 완성된
+파티션 목록만 본다. 파티션이 여러 개면 읽을 때 이어 붙여야(복사) 하므로
+적재가 쌓이면 compact 로 하나로 합친다.
+
+    python factstore.py ingest google data/google_keyword_daily.parquet
+    python factstore.py compact google
+    python factstore.py info
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from data import DATA_DIR
+from metrics import GOOGLE_FACT_COLUMNS, META_FACT_COLUMNS
+
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+MANIFEST = '_manifest.json'
+TABLE_COLUMNS = {'google': GOOGLE_FACT_COLUMNS, 'meta': META_FACT_COLUMNS}
+INGEST_BATCH_ROWS = 1_000_000
+# 날짜는 초 단위 datetime64 — pandas 가 복사 없이 그대로 받는 해상도
+DATE_DTYPE = 'datetime64[s]'
+
+
+def _code_dtype(n_categories):
+    """pandas 가 Categorical 코드에 쓰는 최소 정수형 (같으면 매핑을 복사 없이 사용)."""
+    for dtype in ('int8', 'int16', 'int32'):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype('int64')
+
+
+def _write_json(path, obj):
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class FactStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ─── manifest ───
+    def _table_dir(self, table):
+        return os.path.join(self.root, table)
+
+    def manifest(self, table):
+        try:
+            with open(os.path.join(self._table_dir(table), MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def tables(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(t for t in os.listdir(self.root) if self.manifest(t) is not None)
+
+    def __contains__(self, table):
+        return self.manifest(table) is not None
+
+    def fingerprint(self, table):
+        """(manifest 크기, 수정 시각) — 적재·compact 때마다 바뀐다."""
+        try:
+            st = os.stat(os.path.join(self._table_dir(table), MANIFEST))
+        except FileNotFoundError:
+            return None
+        return (f'store/{table}', st.st_size, st.st_mtime_ns)
+
+    # ─── write ───
+    def append(self, table, df):
+        """DataFrame 하나를 새 파티션으로 추가."""
+        return self._ingest(table, [df], len(df))
+
+    def ingest_parquet(self, table, path, batch_rows=INGEST_BATCH_ROWS):
+        """Parquet 파일을 배치 단위로 읽어 파티션 하나로 적재 (메모리는 배치 크기만큼)."""
+        pf = pq.ParquetFile(path)
+        batches = (b.to_pandas(date_as_object=False) for b in pf.iter_batches(batch_size=batch_rows))
+        return self._ingest(table, batches, pf.metadata.num_rows)
+
+    def _ingest(self, table, frames, n_rows):
+        with self._lock:
+            tdir = self._table_dir(table)
+            os.makedirs(tdir, exist_ok=True)
+            manifest = self.manifest(table) or {'table': table, 'rows': 0, 'columns': {}, 'categories': {}, 'partitions': []}
+            parts = manifest['partitions']
+            part = f'part-{int(parts[-1]["name"][5:]) + 1 if parts else 0:05d}'
+            tmp_dir = os.path.join(tdir, f'.{part}.tmp')
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            columns = dict(manifest['columns'])
+            categories = {c: list(v) for c, v in manifest['categories'].items()}
+            lookup = {c: {v: i for i, v in enumerate(cats)} for c, cats in categories.items()}
+            files, offset = {}, 0
+            try:
+                for df in frames:
+                    if not columns:
+                        columns = {c: self._kind(df[c]) for c in df.columns}
+                    for col, kind in columns.items():
+                        if kind == 'category':
+                            values = self._encode_category(df[col], categories.setdefault(col, []), lookup.setdefault(col, {}))
+                            dtype = _code_dtype(len(categories[col]))
+                        else:
+                            values = self._encode(df[col], kind)
+                            dtype = values.dtype
+                        path = os.path.join(tmp_dir, f'{col}.npy')
+                        if col not in files:
+                            files[col] = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n_rows,))
+                        elif dtype.itemsize > files[col].dtype.itemsize:
+                            # 배치 중 카테고리가 코드형을 넘치면 넓은 형으로 옮겨 쓴다
+                            wide = np.lib.format.open_memmap(f'{path}.wide', mode='w+', dtype=dtype, shape=(n_rows,))
+                            wide[:offset] = files[col][:offset]
+                            del files[col]
+                            os.replace(f'{path}.wide', path)
+                            files[col] = wide
+                        files[col][offset:offset + len(df)] = values
+                    offset += len(df)
+                if offset != n_rows:
+                    raise ValueError(f'{table}: 행 수 불일치 ({offset:,} != {n_rows:,})')
+                for mm in files.values():
+                    mm.flush()
+                files.clear()
+                os.replace(tmp_dir, os.path.join(tdir, part))
+            except BaseException:
+                files.clear()
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+            manifest.update(
+                rows=manifest['rows'] + n_rows, columns=columns,
+                categories={c: v for c, v in categories.items() if columns.get(c) == 'category'},
+                partitions=parts + [{'name': part, 'rows': n_rows, 'ingested_at': time.time()}],
+            )
+            _write_json(os.path.join(tdir, MANIFEST), manifest)
+            return part
+
+    @staticmethod
+    def _kind(series):
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            return 'date'
+        if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+            return str(series.dtype)
+        return 'category'
+
+    @staticmethod
+    def _encode(series, kind):
+        if kind == 'date':
+            return series.to_numpy().astype(DATE_DTYPE)
+        return series.to_numpy(dtype=kind)
+
+    @staticmethod
+    def _encode_category(series, categories, lookup):
+        """배치 안의 고유값만 사전에서 찾고, 새 값은 목록 끝에 붙인다 (기존 코드 불변)."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        mapped = np.empty(len(uniques) + 1, dtype='int64')
+        mapped[-1] = -1  # 결측 (코드 -1)
+        for i, v in enumerate(map(str, uniques)):
+            code = lookup.get(v)
+            if code is None:
+                code = lookup[v] = len(categories)
+                categories.append(v)
+            mapped[i] = code
+        return mapped[codes]
+
+    def compact(self, table):
+        """파티션을 하나로 합친다 — 이후 읽기는 전 컬럼 복사 없이 매핑만."""
+        manifest = self.manifest(table)
+        if manifest is None or len(manifest['partitions']) <= 1:
+            return False
+        old = [p['name'] for p in manifest['partitions']]
+        tmp = FactStore(os.path.join(self.root, f'.{table}.compact'))
+        shutil.rmtree(tmp.root, ignore_errors=True)
+        tmp._ingest(table, [self.read(table)], manifest['rows'])
+        with self._lock:
+            if [p['name'] for p in (self.manifest(table) or {}).get('partitions', [])] != old:
+                shutil.rmtree(tmp.root, ignore_errors=True)
+                raise RuntimeError(f'{table}: compact 중 새 적재가 들어왔습니다 — 다시 실행하세요')
+            tdir = self._table_dir(table)
+            new = tmp.manifest(table)
+            name = f'part-{int(old[-1][5:]) + 1:05d}'
+            os.replace(os.path.join(tmp.root, table, new['partitions'][0]['name']), os.path.join(tdir, name))
+            new['partitions'][0]['name'] = name
+            _write_json(os.path.join(tdir, MANIFEST), new)
+        shutil.rmtree(tmp.root, ignore_errors=True)
+        # 이미 매핑 중인 프로세스는 unlink 된 파일을 계속 읽을 수 있다 (POSIX)
+        for part in old:
+            shutil.rmtree(os.path.join(tdir, part), ignore_errors=True)
+        return True
+
+    # ─── read ───
+    def column(self, table, col, manifest=None):
+        """컬럼 원시 배열 (파티션 하나면 읽기 전용 메모리 매핑 그대로)."""
+        manifest = manifest or self.manifest(table)
+        tdir = self._table_dir(table)
+        arrays = [np.load(os.path.join(tdir, p['name'], f'{col}.npy'), mmap_mode='r') for p in manifest['partitions']]
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays)
+
+    def read(self, table, columns=None):
+        """팩트 DataFrame — 숫자·날짜·카테고리 코드 모두 매핑된 파일을 그대로 참조."""
+        manifest = self.manifest(table)
+        if manifest is None:
+            raise KeyError(table)
+        data = {}
+        for col in columns or manifest['columns']:
+            kind = manifest['columns'][col]
+            arr = self.column(table, col, manifest)
+            if kind == 'category':
+                cats = manifest['categories'][col]
+                # 저장 코드형이 pandas 최소형과 다르면 여기서만 변환(복사)된다
+                want = _code_dtype(len(cats))
+                data[col] = pd.Categorical.from_codes(arr if arr.dtype == want else arr.astype(want),
+                                                      dtype=pd.CategoricalDtype(cats), validate=False)
+            else:
+                data[col] = arr
+        df = pd.DataFrame(data, copy=False)
+        # 증분 처리기(waste 등)가 이미 본 파티션을 건너뛸 수 있도록 (이름, 행 수) 기록
+        df.attrs['lineage'] = [(p['name'], p['rows']) for p in manifest['partitions']]
+        return df
+
+
+# ═══════════════════════════════════════════════
+# Lineage
+# ═══════════════════════════════════════════════
+def new_rows(facts, seen):
+    """증분 처리기의 워터마크 → (아직 안 본 첫 행, 현재 lineage).
+
+    facts.attrs['lineage'] 는 (파티션, 행 수) 목록이다. 이미 센 목록 seen 이 그
+    앞부분이면 seen 의 행 수 합부터 새 행이고, 아니면(파일 교체 · compact) 처음부터
+    다시 세야 하므로 None.
+    """
+    lineage = [tuple(p) for p in facts.attrs.get('lineage', [('facts', len(facts))])]
+    if lineage[:len(seen)] != list(seen):
+        return None, lineage
+    return sum(rows for _, rows in seen), lineage
+
+
+# ═══════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='메모리 매핑 팩트 스토어')
+    parser.add_argument('--root', default=STORE_DIR)
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('ingest', help='Parquet → 새 파티션')
+    p.add_argument('table', choices=sorted(TABLE_COLUMNS))
+    p.add_argument('paths', nargs='+')
+    p.add_argument('--compact', action='store_true', help='적재 후 파티션 합치기')
+    p = sub.add_parser('compact', help='파티션 합치기')
+    p.add_argument('table', choices=sorted(TABLE_COLUMNS))
+    sub.add_parser('info', help='테이블·파티션 요약')
+    args = parser.parse_args(argv)
+
+    store = FactStore(args.root)
+    if args.cmd == 'ingest':
+        for path in args.paths:
+            t0 = time.perf_counter()
+            part = store.ingest_parquet(args.table, path)
+            print(f'{args.table}/{part} ← {path} ({time.perf_counter() - t0:.1f}s)')
+        if args.compact and store.compact(args.table):
+            print(f'{args.table}: compacted')
+    elif args.cmd == 'compact':
+        print(f'{args.table}: {"compacted" if store.compact(args.table) else "nothing to do"}')
+    else:
+        for table in store.tables():
+            m = store.manifest(table)
+            t0 = time.perf_counter()
+            df = store.read(table)
+            print(f'{table}: {m["rows"]:,} rows · {len(m["partitions"])} partitions · '
+                  f'open {1000 * (time.perf_counter() - t0):.1f}ms · {", ".join(df.columns)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+이사대학 마케팅 분석 — 소재 피로도 모델
+Per-creative CTR / CVR / frequency decay fitted from incremental sufficient statistics.
+
+소재(계정 × 광고세트 × 소재)마다 일 단위로 합친 뒤, 소재 나이(첫 노출 이후 일수)에
+대해 로그 CTR · 로그 CVR 을 노출 · 클릭 가중 최소제곱으로 직선 적합한다.
+
+    log CTR(age) = a + b · age      →  CTR 이 launch 대비 FATIGUE_LEVEL 로 떨어지는 나이
+                                        = ln(FATIGUE_LEVEL) / b  (유효 수명)
+
+적합에 필요한 건 Σw, Σw·x, Σw·x², Σw·y, Σw·x·y 뿐이고 모두 더할 수 있으므로 새 날짜
+파티션이 오면 그 행만 더한다 (lineage 워터마크는 factstore.new_rows). 모든
+소재의 기울기 · 절편은 배열 연산 한 번으로 구한다. 평균 빈도(노출 / 도달)도 같은
+방식으로 나이에 대해 적합해 현재 빈도를 추정한다.
+
+x 는 고정 기준일(EPOCH) 이후 일수 — 제곱합이 커져 정밀도를 잃지 않도록.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from factstore import new_rows
+
+KEY_COLUMNS = ['account', 'adset', 'creative']
+SEP = '\x1f'
+EPOCH = np.datetime64('2025-01-01', 'D')
+FATIGUE_LEVEL = 0.75       # CTR 이 첫 노출 대비 25% 떨어지면 유효 수명 끝
+WARN_DAYS = 14             # 예상 교체일이 이 안이면 '교체 임박'
+MIN_DAYS = 14              # 노출 일수가 이보다 적으면 적합하지 않는다
+MIN_IMPRESSIONS = 2_000
+STATUS_ORDER = ['교체 필요', '교체 임박', '정상', '데이터 부족']
+
+# 적합 대상: 이름 → (가중치, 분자, 분모, 로그 변환)
+_FITS = {
+    'ctr': ('impressions', 'clicks', 'impressions', True),
+    'cvr': ('clicks', 'conversions', 'clicks', True),
+    'frequency': ('days', 'impressions', 'reach', False),
+}
+_STATS = ['w', 'wx', 'wxx', 'wy', 'wxy']
+_TOTALS = ['impressions', 'reach', 'clicks', 'cost', 'conversions', 'days']
+
+
+class FatigueModel:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.lineage = []
+        self.keys = []
+        self._index = {}
+        self.first_day = np.zeros(0, dtype='int64')   # EPOCH 기준 일수
+        self.last_day = np.zeros(0, dtype='int64')
+        self.totals = {c: np.zeros(0) for c in _TOTALS}
+        self.stats = {f: {s: np.zeros(0) for s in _STATS} for f in _FITS}
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ─── update ───
+    def sync(self, facts):
+        """팩트 전체를 받아 아직 안 센 파티션만 반영 (factstore.new_rows 워터마크)."""
+        if facts is None:
+            return 0
+        with self._lock:
+            start, lineage = new_rows(facts, self.lineage)
+            if start is None:
+                self._reset()
+                start = 0
+            if start >= len(facts):
+                return 0
+            self.update(facts.iloc[start:])
+            self.lineage = lineage
+            return len(facts) - start
+
+    def _ids(self, keys):
+        codes, uniques = pd.factorize(keys)
+        mapped = np.empty(len(uniques), dtype='int64')
+        for i, key in enumerate(uniques):
+            j = self._index.get(key)
+            if j is None:
+                j = self._index[key] = len(self.keys)
+                self.keys.append(key)
+            mapped[i] = j
+        n = len(self.keys)
+        grow = n - len(self.first_day)
+        if grow:
+            self.first_day = np.concatenate([self.first_day, np.full(grow, np.iinfo('int64').max)])
+            self.last_day = np.concatenate([self.last_day, np.full(grow, -1, dtype='int64')])
+            for c in _TOTALS:
+                self.totals[c] = np.concatenate([self.totals[c], np.zeros(grow)])
+            for f in _FITS:
+                for s in _STATS:
+                    self.stats[f][s] = np.concatenate([self.stats[f][s], np.zeros(grow)])
+        return mapped[codes]
+
+    def update(self, batch):
+        if not len(batch):
+            return
+        # 플랫폼을 합쳐 소재 × 일 단위로
+        daily = batch.groupby(KEY_COLUMNS + ['date'], observed=True, sort=False)[
+            ['impressions', 'reach', 'clicks', 'cost', 'conversions']].sum().reset_index()
+        key = daily['account'].astype(str)
+        for c in KEY_COLUMNS[1:]:
+            key = key + SEP + daily[c].astype(str)
+        ids = self._ids(key.to_numpy())
+        n = len(self.keys)
+        day = (daily['date'].to_numpy().astype('datetime64[D]') - EPOCH).astype('int64')
+
+        np.minimum.at(self.first_day, ids, day)
+        np.maximum.at(self.last_day, ids, day)
+        cols = {c: daily[c].to_numpy(dtype='float64') for c in ['impressions', 'reach', 'clicks', 'cost', 'conversions']}
+        cols['days'] = np.ones(len(daily))
+        for c in _TOTALS:
+            self.totals[c] += np.bincount(ids, weights=cols[c], minlength=n)
+
+        x = day.astype('float64')
+        for f, (weight, num, den, log) in _FITS.items():
+            w = cols[weight]
+            # 0 클릭 · 0 전환 날도 로그를 취할 수 있게 0.5 보정
+            y = np.log((cols[num] + 0.5) / (cols[den] + 1.0)) if log else cols[num] / np.maximum(cols[den], 1.0)
+            st = self.stats[f]
+            for s, v in (('w', w), ('wx', w * x), ('wxx', w * x * x), ('wy', w * y), ('wxy', w * x * y)):
+                st[s] += np.bincount(ids, weights=v, minlength=n)
+
+    # ─── fit ───
+    def _fit(self, name):
+        """(기울기 / 일, 절편) — 나이 분산이 없으면 기울기 NaN."""
+        st = self.stats[name]
+        den = st['w'] * st['wxx'] - st['wx'] ** 2
+        ok = (st['w'] > 0) & (den > 1e-9 * np.maximum(st['w'] ** 2, 1))
+        slope = np.where(ok, (st['w'] * st['wxy'] - st['wx'] * st['wy']) / np.where(ok, den, 1), np.nan)
+        intercept = (st['wy'] - np.nan_to_num(slope) * st['wx']) / np.maximum(st['w'], 1e-12)
+        return slope, intercept
+
+    def report(self, fatigue_level=FATIGUE_LEVEL, warn_days=WARN_DAYS, as_of=None):
+        """소재별 적합 결과 + 상태 · 예상 교체일. as_of 기본값은 데이터의 마지막 날."""
+        columns = KEY_COLUMNS + ['status', 'age_days', 'life_days', 'refresh_date', 'days_to_refresh',
+                                 'ctr_launch', 'ctr_now', 'ctr_weekly_change', 'cvr_now', 'cvr_weekly_change',
+                                 'frequency_now', 'impressions', 'clicks', 'conversions', 'cost', 'cpl']
+        if not self.keys:
+            return pd.DataFrame(columns=columns)
+        t = self.totals
+        today = int(self.last_day.max()) if as_of is None else int((np.datetime64(as_of, 'D') - EPOCH).astype('int64'))
+        first, last = self.first_day.astype('float64'), self.last_day.astype('float64')
+
+        ctr_b, ctr_a = self._fit('ctr')
+        cvr_b, cvr_a = self._fit('cvr')
+        freq_b, freq_a = self._fit('frequency')
+        ctr_launch = np.exp(ctr_a + np.nan_to_num(ctr_b) * first)
+        ctr_now = np.exp(ctr_a + np.nan_to_num(ctr_b) * last)
+        cvr_now = np.exp(cvr_a + np.nan_to_num(cvr_b) * last)
+        frequency_now = freq_a + np.nan_to_num(freq_b) * last
+
+        decaying = ctr_b < 0
+        life = np.where(decaying, np.log(fatigue_level) / np.where(decaying, ctr_b, -1), np.inf)
+        age = today - self.first_day
+        enough = (t['days'] >= MIN_DAYS) & (t['impressions'] >= MIN_IMPRESSIONS) & ~np.isnan(ctr_b)
+        to_refresh = life - age
+        status = np.select(
+            [~enough, to_refresh <= 0, to_refresh <= warn_days],
+            ['데이터 부족', '교체 필요', '교체 임박'], '정상')
+        refresh = np.where(enough & np.isfinite(life), self.first_day + np.ceil(np.where(np.isfinite(life), life, 0)), np.nan)
+
+        keys = pd.DataFrame([k.split(SEP) for k in self.keys], columns=KEY_COLUMNS)
+        out = keys.assign(
+            status=pd.Categorical(status, categories=STATUS_ORDER, ordered=True),
+            age_days=age,
+            life_days=np.round(np.where(enough & np.isfinite(life), life, np.nan)),
+            refresh_date=pd.Timestamp(EPOCH) + pd.to_timedelta(refresh, unit='D'),
+            days_to_refresh=np.round(np.where(enough & np.isfinite(life), to_refresh, np.nan)),
+            ctr_launch=np.round(100 * ctr_launch, 2),
+            ctr_now=np.round(100 * ctr_now, 2),
+            ctr_weekly_change=np.round(100 * np.expm1(7 * ctr_b), 1),
+            cvr_now=np.round(100 * cvr_now, 1),
+            cvr_weekly_change=np.round(100 * np.expm1(7 * cvr_b), 1),
+            frequency_now=np.round(frequency_now, 2),
+            impressions=t['impressions'].astype('int64'),
+            clicks=t['clicks'].astype('int64'),
+            conversions=t['conversions'].astype('int64'),
+            cost=t['cost'].round(),
+            cpl=np.rint(np.divide(t['cost'], t['conversions'], out=np.full(len(age), np.nan), where=t['conversions'] > 0)),
+        )
+        return out.sort_values(['status', 'cost'], ascending=[True, False], kind='stable').reset_index(drop=True)[columns]
+
+
+def decay_curve(row, days=None):
+    """report() 한 행 → (나이 배열, launch 대비 CTR %) — 적합 곡선 그리기용."""
+    horizon = days or int(max(row['age_days'], np.nan_to_num(row['life_days'])) * 1.2) + 1
+    age = np.arange(horizon + 1)
+    rate = np.log1p(row['ctr_weekly_change'] / 100) / 7
+    return age, 100 * np.exp(rate * age)
@@ -0,0 +1,55 @@
+"""
+이사대학 마케팅 분석 — 표·차트 숫자 표시 형식
+Display formats applied at render time; DataFrames keep numeric dtypes.
+
+표는 st.column_config 의 printf 형식, 차트 라벨은 plotly texttemplate(d3 형식)로
+브라우저에서 포맷한다. 셀마다 파이썬 f-string 을 돌리지 않으므로 행 수와 무관하게
+비용이 같고, 숫자 컬럼이 그대로라 표 헤더 정렬도 숫자 순서로 동작한다.
+"""
+
+import pandas as pd
+import streamlit as st
+
+WON = '₩%,d'
+COUNT = '%,d'
+PERCENT = '%.2f%%'
+MAN_WON = '%,d만'
+
+# 컬럼 이름으로 형식 추정 (Explore 결과처럼 스키마를 미리 모르는 표)
+CURRENCY_NAMES = {'cost', 'cpl', 'cpa', 'revenue', 'spend', 'forecast_cost', 'forecast_cpl', '비용', 'CPL', '광고비', '매출'}
+PERCENT_NAMES = {'ctr', 'cvr', 'roas', 'CTR', 'CVR', 'ROAS', '비중'}
+
+
+def won_text(axis='y'):
+    """plotly texttemplate — ₩ + 천 단위 구분 (예: ₩12,354)."""
+    return f'₩%{{{axis}:,.0f}}'
+
+
+def column_config(currency=(), counts=(), percent=(), man_won=(), labels=None):
+    """{컬럼: NumberColumn} — st.dataframe(column_config=...) 에 그대로 넘긴다.
+
+    labels 가 있으면 형식이 없는 컬럼도 표시 이름만 바꿔 넣는다.
+    """
+    labels = labels or {}
+    config = {col: st.column_config.Column(label) for col, label in labels.items()}
+    for cols, fmt in ((currency, WON), (counts, COUNT), (percent, PERCENT), (man_won, MAN_WON)):
+        for col in cols:
+            config[col] = st.column_config.NumberColumn(labels.get(col, col), format=fmt)
+    return config
+
+
+def auto_column_config(df):
+    """숫자 컬럼 이름으로 통화·비율·정수 형식을 고른다."""
+    currency, counts, percent = [], [], []
+    for col in df.columns:
+        dtype = df[col].dtype
+        if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            continue
+        name = str(col)
+        if name in CURRENCY_NAMES:
+            currency.append(col)
+        elif name in PERCENT_NAMES:
+            percent.append(col)
+        elif pd.api.types.is_integer_dtype(dtype):
+            counts.append(col)
+    return column_config(currency, counts, percent)
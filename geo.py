@@ -0,0 +1,406 @@
+"""
+이사대학 마케팅 분석 — 지역별 성과
+Region × week cost / conversion cube from location-bearing search terms and the location report.
+
+'지역+이사' 세그먼트(키워드 53개)와 PMax '맞춤타겟(지역이사)' 에셋그룹은 대시보드에서
+한 줄로만 보인다. 지역을 두 가지로 나눠 센다.
+
+    search     검색어(없으면 키워드)에 들어 있는 지역명 — "송파 포장이사", "분당 원룸이사"
+               → 유저가 이사 가려는 / 찾는 지역 (PMax 제외)
+    location   Google 위치 보고서(GEO_REPORT, 선택) — 광고를 본 유저의 위치
+               date, campaign, region(시/도), city(시/군/구), impressions, clicks, cost, conversions
+
+지역명은 GAZETTEER(시/도 17개 + 주요 시/군/구 · 생활권 별칭)로 (시/도, 시/군/구) 에
+붙인다. 해석은 고유 검색어 · 고유 (region, city) 쌍에만 하고 행은 코드 배열로
+따라가므로 비용은 행 수가 아니라 새 이름 수에 비례한다.
+
+합계는 (소스 × 지역 × 주 × 지표) 밀집 배열 하나에 bincount 로 더한다 (지역 ~100 ×
+주 ~수십 — 팩트가 수천만 행이어도 수십 KB). 검색어 팩트는 factstore.new_rows
+lineage 워터마크로 새 파티션만, 위치 보고서는 파일이 바뀌면 그 소스만 다시 읽는다.
+화면은 snapshot() 의 GeoCube 로 시/도 지도 → 시/군/구 · 주간 추이를 배열 합만으로 그린다.
+
+지도: MOVEUNIV_GEOJSON 에 시/도 경계 GeoJSON 이 있으면 단계구분도(choropleth),
+없으면 시/도 중심점 버블(오프라인에서도 그려짐).
+"""
+
+import functools
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow.parquet as pq
+
+from data import DATA_DIR
+from factstore import new_rows
+from metrics import PMAX_CAMPAIGN, safe_cpl, week_label
+
+GEO_REPORT = os.environ.get('MOVEUNIV_GEO_REPORT', os.path.join(DATA_DIR, 'google_location_daily.parquet'))
+GEOJSON = os.environ.get('MOVEUNIV_GEOJSON', '')
+REPORT_COLUMNS = ['date', 'campaign', 'region', 'city', 'impressions', 'clicks', 'cost', 'conversions']
+BATCH_ROWS = 1_000_000
+SOURCES = ['search', 'location']
+SOURCE_LABELS = {'search': '검색어 속 지역', 'location': '유저 위치 (위치 보고서)'}
+MEASURES = ['cost', 'conversions', 'clicks', 'impressions']
+UNASSIGNED = '미지정'
+MIN_CONVERSIONS = 5       # CPL 최고 · 최저 지역 비교에 필요한 최소 전환
+LAT_SCALE = 1.24          # 위도 36° 근처 경도 1° ≈ 위도 0.81° — 버블 지도 가로세로 비
+
+# ═══════════════════════════════════════════════
+# Gazetteer
+# ═══════════════════════════════════════════════
+# 시/도: 정식 명칭 → (약칭, 영문, 중심 위도, 경도)
+SIDO = {
+    '서울특별시': ('서울', 'Seoul', 37.5665, 126.9780),
+    '부산광역시': ('부산', 'Busan', 35.1796, 129.0756),
+    '대구광역시': ('대구', 'Daegu', 35.8714, 128.6014),
+    '인천광역시': ('인천', 'Incheon', 37.4563, 126.7052),
+    '광주광역시': ('광주', 'Gwangju', 35.1595, 126.8526),
+    '대전광역시': ('대전', 'Daejeon', 36.3504, 127.3845),
+    '울산광역시': ('울산', 'Ulsan', 35.5384, 129.3114),
+    '세종특별자치시': ('세종', 'Sejong', 36.4800, 127.2890),
+    '경기도': ('경기', 'Gyeonggi-do', 37.4138, 127.5183),
+    '강원특별자치도': ('강원', 'Gangwon-do', 37.8228, 128.1555),
+    '충청북도': ('충북', 'Chungcheongbuk-do', 36.6357, 127.4917),
+    '충청남도': ('충남', 'Chungcheongnam-do', 36.5184, 126.8000),
+    '전북특별자치도': ('전북', 'Jeollabuk-do', 35.7175, 127.1530),
+    '전라남도': ('전남', 'Jeollanam-do', 34.8679, 126.9910),
+    '경상북도': ('경북', 'Gyeongsangbuk-do', 36.4919, 128.8889),
+    '경상남도': ('경남', 'Gyeongsangnam-do', 35.4606, 128.2132),
+    '제주특별자치도': ('제주', 'Jeju-do', 33.4890, 126.4983),
+}
+
+# 시/군/구: (시/도 약칭, 정식 명칭, 위도, 경도, 별칭...)
+SIGUNGU = [
+    ('서울', '종로구', 37.5735, 126.9790), ('서울', '중구', 37.5641, 126.9979, '명동'),
+    ('서울', '용산구', 37.5326, 126.9905, '이태원'), ('서울', '성동구', 37.5634, 127.0369, '왕십리', '성수'),
+    ('서울', '광진구', 37.5385, 127.0823, '건대'), ('서울', '동대문구', 37.5744, 127.0396),
+    ('서울', '중랑구', 37.6063, 127.0925), ('서울', '성북구', 37.5894, 127.0167),
+    ('서울', '강북구', 37.6396, 127.0257, '수유'), ('서울', '도봉구', 37.6688, 127.0471),
+    ('서울', '노원구', 37.6542, 127.0568), ('서울', '은평구', 37.6027, 126.9291),
+    ('서울', '서대문구', 37.5791, 126.9368, '신촌'), ('서울', '마포구', 37.5663, 126.9019, '홍대', '합정'),
+    ('서울', '양천구', 37.5170, 126.8666, '목동'), ('서울', '강서구', 37.5509, 126.8495, '마곡'),
+    ('서울', '구로구', 37.4954, 126.8874), ('서울', '금천구', 37.4569, 126.8955, '가산'),
+    ('서울', '영등포구', 37.5264, 126.8962, '여의도'), ('서울', '동작구', 37.5124, 126.9393, '노량진'),
+    ('서울', '관악구', 37.4784, 126.9516, '신림', '봉천'), ('서울', '서초구', 37.4837, 127.0324, '방배'),
+    ('서울', '강남구', 37.5172, 127.0473, '역삼', '논현'), ('서울', '송파구', 37.5145, 127.1059, '잠실'),
+    ('서울', '강동구', 37.5301, 127.1238, '천호'),
+    ('부산', '해운대구', 35.1631, 129.1636), ('부산', '부산진구', 35.1629, 129.0532, '서면'),
+    ('부산', '강서구', 35.2122, 128.9806), ('부산', '중구', 35.1060, 129.0324),
+    ('대구', '수성구', 35.8581, 128.6307), ('대구', '중구', 35.8694, 128.6062),
+    ('인천', '남동구', 37.4473, 126.7314), ('인천', '부평구', 37.5070, 126.7219),
+    ('인천', '연수구', 37.4101, 126.6783, '송도'), ('인천', '중구', 37.4738, 126.6216),
+    ('경기', '수원시', 37.2636, 127.0286, '광교'), ('경기', '성남시', 37.4200, 127.1267, '분당', '판교'),
+    ('경기', '고양시', 37.6584, 126.8320, '일산'), ('경기', '용인시', 37.2411, 127.1776, '수지', '기흥'),
+    ('경기', '부천시', 37.5034, 126.7660), ('경기', '안산시', 37.3219, 126.8309),
+    ('경기', '안양시', 37.3943, 126.9568, '평촌'), ('경기', '화성시', 37.1995, 126.8312, '동탄'),
+    ('경기', '남양주시', 37.6360, 127.2165), ('경기', '평택시', 36.9921, 127.1129),
+    ('경기', '의정부시', 37.7381, 127.0337), ('경기', '파주시', 37.7599, 126.7800),
+    ('경기', '김포시', 37.6153, 126.7156), ('경기', '하남시', 37.5393, 127.2148, '미사'),
+    ('경기', '광명시', 37.4786, 126.8646),
+    ('충북', '청주시', 36.6424, 127.4890), ('충남', '천안시', 36.8151, 127.1139),
+    ('경남', '창원시', 35.2280, 128.6811), ('경북', '포항시', 36.0190, 129.3435),
+    ('전북', '전주시', 35.8242, 127.1480), ('강원', '춘천시', 37.8813, 127.7298),
+    ('강원', '원주시', 37.3422, 127.9202), ('제주', '제주시', 33.4996, 126.5312),
+]
+# 검색어에 지역명이 붙어 쓰일 때 ("강남이사") 떼어 볼 서비스 단어
+SERVICE_SUFFIXES = ('포장이사', '원룸이사', '용달이사', '이삿짐', '이사', '용달')
+NAME_SUFFIXES = ('특별자치시', '특별자치도', '특별시', '광역시', '시', '구', '군', '동', '역')
+
+
+def _gazetteer():
+    """지역 테이블 (0 = 미지정, 시/도 단위 행은 sigungu ''), 별칭 → 후보 지역 id."""
+    short_to_full = {v[0]: k for k, v in SIDO.items()}
+    rows = [(UNASSIGNED, UNASSIGNED, '', np.nan, np.nan)]
+    aliases = {}
+    for full, (short, eng, lat, lon) in SIDO.items():
+        rid = len(rows)
+        rows.append((full, short, '', lat, lon))
+        for name in (full, short, eng, eng.removesuffix('-do')):
+            aliases.setdefault(name.lower(), []).append(rid)
+    for short, name, lat, lon, *alts in SIGUNGU:
+        rid = len(rows)
+        rows.append((short_to_full[short], short, name, lat, lon))
+        # '수원시' → '수원' 도 별칭 (단 '제주시' → '제주' 처럼 시/도 약칭과 겹치면 시/도 쪽)
+        short_name = name[:-1] if len(name) > 2 and name[:-1] not in short_to_full else name
+        for alias in (name, short_name, *alts):
+            aliases.setdefault(alias.lower(), []).append(rid)
+    regions = pd.DataFrame(rows, columns=['sido', 'sido_short', 'sigungu', 'lat', 'lon'])
+    return regions, aliases
+
+
+REGIONS, ALIASES = _gazetteer()
+_SIDO_OF = pd.factorize(REGIONS['sido'])[0]          # 지역 id → 시/도 코드 (0 = 미지정)
+_SIDO_NAMES = list(dict.fromkeys(REGIONS['sido']))
+
+
+def _lookup(token):
+    token = token.lower()
+    if token in ALIASES:
+        return ALIASES[token]
+    for suffix in SERVICE_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix) + 1:
+            return _lookup(token[:-len(suffix)])
+    for suffix in NAME_SUFFIXES:
+        if token.endswith(suffix) and len(token) > len(suffix) + 1:
+            hit = ALIASES.get(token[:-len(suffix)])
+            if hit:
+                return hit
+    return None
+
+
+def resolve(name):
+    """검색어 · 위치 문자열 → 지역 id (0 = 지역 없음). 시/군/구가 있으면 그쪽, 같은 이름이면 시/도로 가른다."""
+    if not isinstance(name, str):
+        return 0
+    sido = None
+    found = []
+    for token in name.replace(',', ' ').split():
+        hits = _lookup(token)
+        if not hits:
+            continue
+        for rid in hits:
+            if REGIONS.at[rid, 'sigungu']:
+                found.append(rid)
+            elif sido is None:
+                sido = rid
+    if found:
+        if sido is not None:
+            inside = [rid for rid in found if _SIDO_OF[rid] == _SIDO_OF[sido]]
+            found = inside or found
+        return found[0]
+    return sido or 0
+
+
+def _resolve_codes(values):
+    """문자열 배열 → 지역 id 배열. 고유값만 해석한다 (categorical 이면 카테고리만)."""
+    codes, uniques = pd.factorize(values)
+    ids = np.fromiter((resolve(u) for u in uniques), dtype='int64', count=len(uniques))
+    return np.where(codes >= 0, ids[codes], 0)
+
+
+def _monday(dates):
+    """날짜 → 그 주 월요일 (1970-01-01 기준 일수). ISO 주 라벨이 연도를 넘어가도 순서가 맞는다."""
+    day = np.asarray(dates).astype('datetime64[D]').astype('int64')
+    return day - (day + 3) % 7
+
+
+# ═══════════════════════════════════════════════
+# Store
+# ═══════════════════════════════════════════════
+class GeoStore:
+    def __init__(self, report_path=GEO_REPORT):
+        self.report_path = report_path
+        self._lock = threading.Lock()
+        self.weeks = []                 # 월요일 일수 (들어온 순서)
+        self._week_index = {}
+        self.values = np.zeros((len(SOURCES), len(REGIONS), 0, len(MEASURES)))
+        self.lineage = {s: [] for s in SOURCES}
+        self._term_ids = {}             # 검색어 → 지역 id (한 번 해석한 건 다시 안 본다)
+
+    def _reset(self, source):
+        self.values[SOURCES.index(source)] = 0
+        self.lineage[source] = []
+
+    def _week_ids(self, mondays):
+        uniq, inverse = np.unique(mondays, return_inverse=True)
+        for m in uniq.tolist():
+            if m not in self._week_index:
+                self._week_index[m] = len(self.weeks)
+                self.weeks.append(m)
+        grow = len(self.weeks) - self.values.shape[2]
+        if grow:
+            pad = np.zeros(self.values.shape[:2] + (grow, len(MEASURES)))
+            self.values = np.concatenate([self.values, pad], axis=2)
+        return np.array([self._week_index[m] for m in uniq.tolist()], dtype='int64')[inverse]
+
+    def add(self, source, region_ids, dates, measures):
+        """(지역 id, 날짜, 지표들) 배열을 한 번의 bincount 로 더한다."""
+        if not len(region_ids):
+            return
+        weeks = self._week_ids(_monday(dates))
+        n_weeks = len(self.weeks)
+        flat = region_ids * n_weeks + weeks
+        size = len(REGIONS) * n_weeks
+        s = SOURCES.index(source)
+        for j, col in enumerate(MEASURES):
+            w = np.asarray(measures[col], dtype='float64')
+            self.values[s, :, :, j] += np.bincount(flat, weights=w, minlength=size).reshape(len(REGIONS), n_weeks)
+
+    # ─── sources ───
+    def _search_regions(self, batch):
+        terms = batch['search_term']
+        codes, uniques = pd.factorize(terms)
+        ids = np.fromiter((self._term_ids.setdefault(u, resolve(u)) for u in uniques), dtype='int64', count=len(uniques))
+        region = np.where(codes >= 0, ids[codes], 0)
+        # 검색어에 지역이 없으면 키워드의 지역 ("지역+이사" 키워드는 지역명을 달고 있다)
+        missing = region == 0
+        if missing.any():
+            region[missing] = _resolve_codes(batch['keyword'].to_numpy()[missing])
+        return region
+
+    def sync(self, facts=None):
+        """검색어 팩트(새 파티션만) + 위치 보고서(파일이 바뀌었으면)를 반영."""
+        with self._lock:
+            if facts is not None:
+                self._sync_search(facts)
+            elif self.lineage['search']:
+                self._reset('search')
+            self._sync_report()
+
+    def _sync_search(self, facts):
+        start, lineage = new_rows(facts, self.lineage['search'])
+        if start is None:
+            self._reset('search')
+            start = 0
+        if start < len(facts):
+            batch = facts.iloc[start:]
+            batch = batch[(batch['campaign'] != PMAX_CAMPAIGN).to_numpy()]
+            self.add('search', self._search_regions(batch), batch['date'].to_numpy(), batch)
+        self.lineage['search'] = lineage
+
+    def _sync_report(self):
+        path = self.report_path
+        if not path or not os.path.exists(path):
+            if self.lineage['location']:
+                self._reset('location')
+            return
+        st = os.stat(path)
+        part = [(f'{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}', 0)]
+        if self.lineage['location'] == part:
+            return
+        self._reset('location')
+        pairs = {}
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=REPORT_COLUMNS):
+            df = batch.to_pandas()
+            # (시/도, 시/군/구) 고유 쌍만 해석
+            rc, ru = pd.factorize(df['region'])
+            cc, cu = pd.factorize(df['city'])
+            rn = np.append(np.asarray(ru, dtype=object), '')     # 코드 -1(결측) → 마지막 ''
+            cn = np.append(np.asarray(cu, dtype=object), '')
+            uniq, inverse = np.unique((rc % len(rn)) * len(cn) + cc % len(cn), return_inverse=True)
+            names = [f'{rn[k // len(cn)]} {cn[k % len(cn)]}'.strip() for k in uniq.tolist()]
+            ids = np.fromiter((pairs.setdefault(n, resolve(n)) for n in names), dtype='int64', count=len(names))
+            self.add('location', ids[inverse], df['date'].to_numpy(), df)
+        self.lineage['location'] = part
+
+    def snapshot(self):
+        with self._lock:
+            order = np.argsort(self.weeks, kind='stable')
+            return GeoCube(self.values[:, :, order].copy(), np.asarray(self.weeks, dtype='int64')[order])
+
+
+# ═══════════════════════════════════════════════
+# Cube (화면용 스냅샷)
+# ═══════════════════════════════════════════════
+class GeoCube:
+    """(소스 × 지역 × 주 × 지표) 배열의 읽기 전용 스냅샷 — 모든 조회는 배열 합."""
+
+    def __init__(self, values, weeks):
+        self.values = values
+        self.weeks = weeks          # 주 시작(월요일) epoch day, 오름차순 — 조회는 이 위치로
+        self.week_labels = week_label(weeks.astype('datetime64[D]')).tolist() if len(weeks) else []
+
+    def has(self, source):
+        return bool(self.values[SOURCES.index(source)].any())
+
+    def sources(self):
+        return [s for s in SOURCES if self.has(s)]
+
+    def _slice(self, source, weeks=None):
+        """weeks: self.weeks 위치의 slice (None 이면 전체 기간)."""
+        v = self.values[SOURCES.index(source)]
+        if weeks is not None:
+            v = v[:, weeks]
+        return v.sum(axis=1)        # 지역 × 지표
+
+    @staticmethod
+    def _frame(index, sums, total_cost):
+        df = pd.DataFrame(sums, columns=MEASURES)
+        df.insert(0, 'region', index)
+        df['cpl'] = safe_cpl(df['cost'], df['conversions'])
+        df['share'] = np.round(100 * df['cost'] / total_cost, 1) if total_cost else 0.0
+        df['conversions'] = df['conversions'].round(1)
+        return df
+
+    def coverage(self, source):
+        """지역을 알 수 있는 비용 비중 (%)."""
+        v = self._slice(source)
+        total = v[:, 0].sum()
+        return round(100 * (1 - v[0, 0] / total), 1) if total else 0.0
+
+    def by_sido(self, source, weeks=None):
+        """시/도별 합계 + 중심 좌표 (미지정 제외, 비용 내림차순)."""
+        v = self._slice(source, weeks)
+        sums = np.zeros((len(_SIDO_NAMES), len(MEASURES)))
+        np.add.at(sums, _SIDO_OF, v)
+        df = self._frame(_SIDO_NAMES, sums, v[1:, 0].sum())
+        meta = REGIONS[REGIONS['sigungu'] == ''].set_index('sido')
+        df['short'] = df['region'].map(meta['sido_short'])
+        df['lat'] = df['region'].map(meta['lat'])
+        df['lon'] = df['region'].map(meta['lon'])
+        df = df[(df['region'] != UNASSIGNED) & (df['cost'] > 0)]
+        return df.sort_values('cost', ascending=False, kind='stable').reset_index(drop=True)
+
+    def by_sigungu(self, source, sido, weeks=None):
+        """한 시/도 안의 시/군/구별 합계 — 시/도 이름만 나온 검색어는 '(시/도 전체)' 한 줄."""
+        v = self._slice(source, weeks)
+        rows = np.flatnonzero(REGIONS['sido'].to_numpy() == sido)
+        names = [REGIONS.at[r, 'sigungu'] or '(시/도 전체)' for r in rows]
+        df = self._frame(names, v[rows], v[rows, 0].sum())
+        df = df[df['cost'] > 0]
+        return df.sort_values('cost', ascending=False, kind='stable').reset_index(drop=True)
+
+    def weekly(self, source, sido=None, weeks=None):
+        """주별 합계 (sido 를 주면 그 시/도만, weeks 는 _slice 와 같은 위치 slice)."""
+        weeks = slice(None) if weeks is None else weeks
+        v = self.values[SOURCES.index(source)][:, weeks]
+        mask = REGIONS['sido'].to_numpy() != UNASSIGNED if sido is None else REGIONS['sido'].to_numpy() == sido
+        df = self._frame(self.week_labels[weeks], v[mask].sum(axis=0), v[mask, :, 0].sum())
+        return df.rename(columns={'region': 'week'}).drop(columns='share')
+
+
+# ═══════════════════════════════════════════════
+# Figure
+# ═══════════════════════════════════════════════
+@functools.lru_cache(maxsize=2)
+def load_geojson(path=GEOJSON):
+    """시/도 경계 GeoJSON — 피처마다 속성 값 중 시/도로 해석되는 이름을 id 로 붙인다."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        geo = json.load(f)
+    for feature in geo.get('features', []):
+        for value in (feature.get('properties') or {}).values():
+            rid = resolve(value) if isinstance(value, str) else 0
+            if rid:
+                feature['id'] = REGIONS.at[rid, 'sido']
+                break
+    return geo
+
+
+def region_figure(df, value='cpl', geojson=None, selected=None, colorscale='RdYlGn_r'):
+    """시/도 프레임(GeoCube.by_sido) → 단계구분도 또는 중심점 버블. customdata 는 시/도 정식 명칭."""
+    text = [f"{s}<br>비용 ₩{c:,.0f} · 전환 {v:,.0f}<br>CPL ₩{p:,}" for s, c, v, p in
+            zip(df['short'], df['cost'], df['conversions'], df['cpl'])]
+    z = df[value].where(df[value] > 0) if value == 'cpl' else df[value]
+    if geojson is not None:
+        fig = go.Figure(go.Choropleth(
+            geojson=geojson, locations=df['region'], z=z, customdata=df['region'], text=text,
+            hoverinfo='text', colorscale=colorscale, marker_line_width=[3 if r == selected else 0.5 for r in df['region']],
+        ))
+        fig.update_geos(fitbounds='locations', visible=False)
+    else:
+        size = np.sqrt(df['cost'] / max(df['cost'].max(), 1)) * 60 + 8
+        fig = go.Figure(go.Scatter(
+            x=df['lon'], y=df['lat'], mode='markers+text', text=df['short'], textposition='middle center',
+            customdata=df['region'], hovertext=text, hoverinfo='text',
+            marker=dict(size=size, color=z, colorscale=colorscale, showscale=True, opacity=0.85,
+                        line=dict(width=[3 if r == selected else 0.5 for r in df['region']], color='#1B3A5C')),
+        ))
+        fig.update_xaxes(visible=False, range=[124.5, 130.5])
+        fig.update_yaxes(visible=False, range=[33.0, 38.7], scaleanchor='x', scaleratio=LAT_SCALE)
+        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)')
+    return fig
@@ -0,0 +1,160 @@
+"""
+이사대학 마케팅 분석 — 메시지 유형 태깅
+Message-taxonomy tags for Google keywords and Meta creatives, and the
+cross-channel CPL / CVR comparison computed from them.
+
+키워드·소재 이름에 규칙(부분 문자열)을 적용해 메시지 태그를 달고, 규칙에
+걸리지 않으면 세그먼트·광고세트 기본 태그를 쓴다. 하나의 자산이 여러 태그를
+가질 수 있다 ('원룸이사 비용' → 가격 + 소형이사). data/message_tags.csv 가
+있으면 (channel, name, tags) 행이 규칙보다 우선한다.
+
+집계는 팩트를 자산(세그먼트 × 키워드, 광고세트 × 소재) 단위로 bincount 한 번
+모은 뒤 (자산 × 태그) 불리언 행렬과 곱한다 — 태그 수와 무관하게 팩트는 한 번만
+훑는다.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data import DATA_DIR
+
+MESSAGE_TYPES = [
+    '가격/비교/견적', '브랜드 (이사대학)', '소형이사/원룸', '일반 이사',
+    '용달/화물', '커뮤니티 (에타)', '감성 (여자모델)', '기타',
+]
+
+# 이름에 들어 있으면 태그 (소문자 비교)
+MESSAGE_RULES = {
+    '가격/비교/견적': ['가격', '견적', '비용', '저렴', '비교'],
+    '브랜드 (이사대학)': ['이사대학'],
+    '소형이사/원룸': ['원룸', '투룸', '소형', '반포장'],
+    '용달/화물': ['용달', '화물', '다마스', '1톤'],
+    '커뮤니티 (에타)': ['에브리타임', '에타', '커뮤니티'],
+    '감성 (여자모델)': ['모델', '감성'],
+}
+
+# 규칙에 안 걸릴 때의 기본 태그
+SEGMENT_TAGS = {
+    '브랜드': '브랜드 (이사대학)', '원룸/소형': '소형이사/원룸', '가격/견적': '가격/비교/견적',
+    '용달/화물': '용달/화물', '일반이사': '일반 이사', '포장이사': '일반 이사',
+    '지역+이사': '일반 이사', '기타(영어+이삿짐센터)': '일반 이사',
+}
+ADSET_TAGS = {
+    '이사 가격': '가격/비교/견적', '가격 소재': '가격/비교/견적',
+    '에브리타임': '커뮤니티 (에타)', '여자 모델': '감성 (여자모델)',
+}
+
+TAGS_FILE = os.path.join(DATA_DIR, 'message_tags.csv')
+CHANNELS = ('Google', 'Meta')
+
+
+# ═══════════════════════════════════════════════
+# Tagging
+# ═══════════════════════════════════════════════
+def load_overrides(path=TAGS_FILE):
+    """message_tags.csv → {(channel, name): [태그, …]} (태그는 '|' 구분)."""
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, dtype=str).fillna('')
+    return {(r.channel, r.name): [t for t in r.tags.split('|') if t in MESSAGE_TYPES]
+            for r in df.itertuples()}
+
+
+def tag_matrix(names, groups, fallback, channel, overrides=None):
+    """(자산 × MESSAGE_TYPES) 불리언 행렬. 자산마다 최소 한 개의 태그."""
+    names = pd.Series(names, dtype=str).reset_index(drop=True)
+    lowered = names.str.lower()
+    m = np.zeros((len(names), len(MESSAGE_TYPES)), dtype=bool)
+    for tag, words in MESSAGE_RULES.items():
+        m[:, MESSAGE_TYPES.index(tag)] = lowered.str.contains('|'.join(words), regex=True).to_numpy()
+    # 규칙 미적중 → 그룹(세그먼트·광고세트) 기본 태그, 그것도 없으면 기타
+    base = pd.Series(groups, dtype=str).map(fallback).fillna('기타').map(MESSAGE_TYPES.index).to_numpy()
+    empty = ~m.any(axis=1)
+    m[np.flatnonzero(empty), base[empty]] = True
+    for (ch, name), tags in (overrides or {}).items():
+        if ch != channel or not tags:
+            continue
+        for i in np.flatnonzero(names.to_numpy() == name):
+            m[i] = False
+            m[i, [MESSAGE_TYPES.index(t) for t in tags]] = True
+    return m
+
+
+# ═══════════════════════════════════════════════
+# Assets
+# ═══════════════════════════════════════════════
+def _assets_from_facts(facts, group, name):
+    """팩트 → (그룹 × 이름) 자산 합계. 한 번의 bincount."""
+    g_codes, g_uniques = pd.factorize(facts[group])
+    n_codes, n_uniques = pd.factorize(facts[name])
+    size = len(g_uniques) * len(n_uniques)
+    key = g_codes.astype('int64') * len(n_uniques) + n_codes
+    keys = np.flatnonzero(np.bincount(key, minlength=size))
+    sums = {m: np.bincount(key, weights=facts[m].to_numpy(dtype='float64'), minlength=size)[keys]
+            for m in ('cost', 'conversions', 'clicks')}
+    return pd.DataFrame({
+        'group': np.asarray(g_uniques, dtype=object)[keys // len(n_uniques)].astype(str),
+        'name': np.asarray(n_uniques, dtype=object)[keys % len(n_uniques)].astype(str),
+        **sums,
+    })
+
+
+def google_assets(facts=None, google_intent=None):
+    if facts is not None:
+        return _assets_from_facts(facts, 'segment', 'keyword')
+    gi = google_intent
+    return pd.DataFrame({'group': gi['segment'], 'name': gi['segment'], 'cost': gi['cost'],
+                         'conversions': gi['conversions'], 'clicks': gi['clicks']})
+
+
+def meta_assets(facts=None, meta_adset=None):
+    if facts is not None:
+        return _assets_from_facts(facts, 'adset', 'creative')
+    ma = meta_adset
+    adset = ma['소재'].str.replace('"', '', regex=False)
+    return pd.DataFrame({'group': adset, 'name': adset, 'cost': ma['비용'], 'conversions': ma['전환'],
+                         'clicks': np.rint(ma['전환'] / (ma['CVR'] / 100))})
+
+
+# ═══════════════════════════════════════════════
+# Cross-channel
+# ═══════════════════════════════════════════════
+def _effect_labels(ratio):
+    """채널 평균 CPL 대비 배수 → 효과 라벨."""
+    return np.select([np.isnan(ratio), ratio <= 0.6, ratio <= 0.9, ratio <= 1.2, ratio <= 1.6],
+                     ['—', '최고', '좋음', '보통', '나쁨'], '최악')
+
+
+def message_cross(google, meta, overrides=None):
+    """메시지 유형 × 채널 비용·전환·CPL·CVR (+ 채널, 효과)."""
+    out = pd.DataFrame({'메시지 유형': MESSAGE_TYPES})
+    present = np.zeros(len(MESSAGE_TYPES), dtype=bool)
+    # 효과는 채널 안에서의 상대 효율 (Meta CPL 이 전반적으로 낮아 채널 간 직접 비교는 왜곡)
+    best_ratio = np.full(len(MESSAGE_TYPES), np.nan)
+    for channel, assets, fallback in (('Google', google, SEGMENT_TAGS), ('Meta', meta, ADSET_TAGS)):
+        m = tag_matrix(assets['name'], assets['group'], fallback, channel, overrides).astype('float64')
+        cost, conv, clicks = (m.T @ assets[c].to_numpy(dtype='float64') for c in ('cost', 'conversions', 'clicks'))
+        cpl = np.divide(cost, conv, out=np.full_like(cost, np.nan), where=conv > 0)
+        cvr = np.divide(conv, clicks, out=np.full_like(cost, np.nan), where=clicks > 0) * 100
+        out[f'{channel} 비용'] = cost.round()
+        out[f'{channel} 전환'] = conv.round(1)
+        out[f'{channel} CPL'] = cpl.round()
+        out[f'{channel} CVR'] = cvr.round(1)
+        present |= cost > 0
+        total_conv = assets['conversions'].sum()
+        if total_conv > 0:
+            best_ratio = np.fmin(best_ratio, cpl / (assets['cost'].sum() / total_conv))
+    has = {ch: out[f'{ch} 비용'].to_numpy() > 0 for ch in CHANNELS}
+    out['채널'] = np.select([has['Google'] & has['Meta'], has['Google']], ['Both', 'Google'], 'Meta')
+    out['효과'] = _effect_labels(best_ratio)
+    return out[present].reset_index(drop=True)
+
+
+def message_cross_from_dataset(dataset):
+    return message_cross(
+        google_assets(dataset.facts.get('google'), dataset['google_intent']),
+        meta_assets(dataset.facts.get('meta'), dataset['meta_adset']),
+        load_overrides(),
+    )
@@ -0,0 +1,186 @@
+"""
+이사대학 마케팅 분석 — 지표 집계
+일 단위 팩트 테이블(키워드·검색어 × 일, 플랫폼 × 광고세트 × 소재 × 일)을
+대시보드 테이블 스키마(google_intent, google_campaign_weekly, meta_adset,
+meta_platform_weekly)로 롤업한다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ═══════════════════════════════════════════════
+# Fact schemas
+# ═══════════════════════════════════════════════
+GOOGLE_FACT_COLUMNS = [
+    'account', 'date', 'week', 'campaign', 'segment', 'keyword', 'match_type',
+    'search_term', 'impressions', 'clicks', 'cost', 'conversions',
+]
+META_FACT_COLUMNS = [
+    'account', 'date', 'week', 'platform', 'adset', 'target', 'creative',
+    'impressions', 'reach', 'clicks', 'cost', 'conversions',
+]
+
+PMAX_CAMPAIGN = 'PMax'
+
+
+# ═══════════════════════════════════════════════
+# Helpers
+# ═══════════════════════════════════════════════
+def week_label(dates, year=True):
+    """ISO 연도-주차 라벨 ('2025-W45', '2026-W01').
+
+    여러 해에 걸친 데이터에서 같은 주차 번호가 합쳐지지 않도록 ISO 연도를 붙인다.
+    year=False 는 기준 대시보드 테이블(data.py)의 'W45' 형식.
+    """
+    iso = pd.DatetimeIndex(pd.to_datetime(dates)).isocalendar()
+    weeks = np.char.add('W', np.char.zfill(iso['week'].to_numpy().astype(str), 2))
+    if not year:
+        return weeks
+    return np.char.add(np.char.add(iso['year'].to_numpy().astype(str), '-'), weeks)
+
+
+def safe_cpl(cost, conversions):
+    """전환 0건이면 0 (주간 테이블의 기존 표기와 동일)."""
+    cost = np.asarray(cost, dtype='float64')
+    conversions = np.asarray(conversions, dtype='float64')
+    out = np.zeros_like(cost)
+    np.divide(cost, conversions, out=out, where=conversions > 0)
+    return np.rint(out).astype('int64')
+
+
+def safe_rate(num, den, scale=100.0, decimals=2):
+    num = np.asarray(num, dtype='float64')
+    den = np.asarray(den, dtype='float64')
+    out = np.zeros_like(num)
+    np.divide(num, den, out=out, where=den > 0)
+    return np.round(out * scale, decimals)
+
+
+def _week_order(df):
+    # 주차 라벨은 연도를 넘어가므로(W52 → W01) 실제 날짜 순서로 정렬한다
+    first = df.groupby('week', observed=True)['date'].min().sort_values()
+    return list(first.index)
+
+
+def _filter_account(df, account):
+    if account is None:
+        return df
+    return df[df['account'] == account]
+
+
+# ═══════════════════════════════════════════════
+# Google rollups
+# ═══════════════════════════════════════════════
+def google_intent_from_facts(facts, account=None):
+    df = _filter_account(facts, account)
+    df = df[df['campaign'] != PMAX_CAMPAIGN]
+    agg = df.groupby('segment', observed=True).agg(
+        keywords=('keyword', 'nunique'),
+        cost=('cost', 'sum'),
+        conversions=('conversions', 'sum'),
+        clicks=('clicks', 'sum'),
+        impressions=('impressions', 'sum'),
+    ).reset_index()
+    agg['cost'] = agg['cost'].round().astype('int64')
+    agg['conversions'] = agg['conversions'].round().astype('int64')
+    agg['cpl'] = safe_cpl(agg['cost'], agg['conversions'])
+    agg = agg.sort_values('cpl', key=lambda s: s.where(s > 0, np.inf), kind='stable')
+    return agg[['segment', 'keywords', 'cost', 'conversions', 'cpl', 'clicks', 'impressions']].reset_index(drop=True)
+
+
+def google_campaign_weekly_from_facts(facts, account=None):
+    df = _filter_account(facts, account)
+    agg = df.groupby(['campaign', 'week'], observed=True).agg(
+        cost=('cost', 'sum'), conv=('conversions', 'sum'),
+    ).reset_index()
+    agg['cost'] = agg['cost'].round().astype('int64')
+    agg['conv'] = agg['conv'].round(2)
+    agg['cpl'] = safe_cpl(agg['cost'], agg['conv'])
+    agg['week'] = pd.Categorical(agg['week'], categories=_week_order(df), ordered=True)
+    agg = agg.sort_values(['campaign', 'week'])
+    agg['week'] = agg['week'].astype(str)
+    return agg[['campaign', 'week', 'cost', 'conv', 'cpl']].reset_index(drop=True)
+
+
+def google_keyword_from_facts(facts, account=None):
+    """키워드 보고서 — 세그먼트 × 키워드 × 매치유형 합계 (PMax 애셋그룹 포함)."""
+    df = _filter_account(facts, account)
+    agg = df.groupby(['segment', 'keyword', 'match_type'], observed=True).agg(
+        impressions=('impressions', 'sum'),
+        clicks=('clicks', 'sum'),
+        cost=('cost', 'sum'),
+        conversions=('conversions', 'sum'),
+    ).reset_index()
+    agg['cost'] = agg['cost'].round().astype('int64')
+    agg['conversions'] = agg['conversions'].round(1)
+    # 전환 0 키워드는 CPL 없음(NaN) — 정렬에서 방향과 무관하게 맨 뒤로 간다
+    agg['cpl'] = np.where(agg['conversions'] > 0, safe_cpl(agg['cost'], agg['conversions']), np.nan)
+    agg['ctr'] = safe_rate(agg['clicks'], agg['impressions'])
+    agg['cvr'] = safe_rate(agg['conversions'], agg['clicks'])
+    for col in ('segment', 'keyword', 'match_type'):
+        agg[col] = agg[col].astype(str)
+    return agg
+
+# ═══════════════════════════════════════════════
+# Meta rollups
+# ═══════════════════════════════════════════════
+# 메시지 유형 — 광고세트 이름 기준 (data.meta_adset 과 동일한 분류)
+META_MESSAGE_TYPES = {
+    '이사 가격': '가격', '가격 소재': '가격', '공통 소재': '기타', '에브리타임': '커뮤니티',
+    '여자 모델': '감성', '소재 ALL': '혼합', '신규 소재(12월)': '신규', '신규 소재(11월)': '신규',
+}
+# 차트용 짧은 이름 (없으면 공백 제거)
+META_SHORT_NAMES = {
+    '공통 소재': '공통', '에브리타임': '에타', '신규 소재(12월)': '신규(12)', '신규 소재(11월)': '신규(11)',
+}
+
+
+def _efficiency_labels(agg):
+    # data.meta_adset 의 '효율' 라벨 규칙을 데이터로 재현
+    labels = np.full(len(agg), '보통', dtype=object)
+    median_cpl = agg.loc[agg['전환'] >= 5, 'CPL'].median()
+    labels[agg['CPL'].to_numpy() > median_cpl * 1.2] = '비효율'
+    labels[agg['CPL'].to_numpy() > median_cpl * 2] = 'WORST'
+    labels[agg['CTR'].to_numpy().argmax()] = 'CTR최고'
+    labels[agg['비용'].to_numpy().argmax()] = 'MAIN'
+    enough = agg['전환'].to_numpy() >= 5
+    if enough.any():
+        cpl = np.where(enough, agg['CPL'].to_numpy(), np.inf)
+        labels[cpl.argmin()] = 'BEST'
+    labels[~enough] = '표본부족'
+    return labels
+
+
+def meta_adset_from_facts(facts, account=None):
+    df = _filter_account(facts, account)
+    agg = df.groupby(['adset', 'target'], observed=True).agg(
+        비용=('cost', 'sum'), 전환=('conversions', 'sum'),
+        clicks=('clicks', 'sum'), impressions=('impressions', 'sum'),
+    ).reset_index()
+    agg['비용'] = agg['비용'].round().astype('int64')
+    agg['전환'] = agg['전환'].round().astype('int64')
+    agg['CPL'] = safe_cpl(agg['비용'], agg['전환'])
+    agg['CTR'] = safe_rate(agg['clicks'], agg['impressions'])
+    agg['CVR'] = safe_rate(agg['전환'], agg['clicks'], decimals=1)
+    agg['예산비중'] = safe_rate(agg['비용'], np.full(len(agg), agg['비용'].sum()), decimals=1)
+    agg = agg.sort_values('CPL', key=lambda s: s.where(s > 0, np.inf), kind='stable').reset_index(drop=True)
+    agg['소재'] = '"' + agg['adset'].astype(str) + '"'
+    agg['소재_short'] = agg['adset'].astype(str).map(META_SHORT_NAMES).fillna(
+        agg['adset'].astype(str).str.replace(' ', '', regex=False))
+    agg['타겟'] = agg['target'].astype(str)
+    agg['효율'] = _efficiency_labels(agg)
+    agg['메시지유형'] = agg['adset'].astype(str).map(META_MESSAGE_TYPES).fillna('기타')
+    return agg[['소재', '소재_short', '타겟', '비용', '전환', 'CPL', 'CTR', 'CVR', '예산비중', '효율', '메시지유형']]
+
+
+def meta_platform_weekly_from_facts(facts, account=None):
+    df = _filter_account(facts, account)
+    agg = df.groupby(['platform', 'week'], observed=True).agg(
+        cost=('cost', 'sum'), conv=('conversions', 'sum'),
+    ).reset_index()
+    agg['cpl'] = safe_cpl(agg['cost'], agg['conv'])
+    agg['week'] = pd.Categorical(agg['week'], categories=_week_order(df), ordered=True)
+    agg = agg.sort_values(['platform', 'week'])
+    agg['week'] = agg['week'].astype(str)
+    return agg[['platform', 'week', 'cpl']].reset_index(drop=True)
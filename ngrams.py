@@ -0,0 +1,170 @@
+"""
+이사대학 마케팅 분석 — 검색어 n-gram 마이닝
+Hashed-counter unigram / bigram mining over the search-term report.
+
+'용달/화물', '기타(영어+이삿짐센터)' 처럼 키워드가 많은 세그먼트에는 성격이 전혀
+다른 검색어가 섞여 있다. 검색어를 단어 · 두 단어 묶음(n-gram)으로 쪼개
+(세그먼트, n-gram) 마다 비용 · 클릭 · 노출 · 전환을 한 번의 패스로 더한다.
+
+카운터는 고정 크기 해시 테이블(BUCKETS 칸)이라 검색어가 수천만 개여도 메모리는
+일정하다. 칸마다 처음 들어온 n-gram 의 지문을 두고, 다른 n-gram 이 같은 칸에
+떨어지면 collided 로 표시한다 (합계가 과대 추정될 수 있음). 배치마다 먼저
+(세그먼트, 검색어) 로 합친 뒤 고유 검색어만 토큰화하므로 비용은 행 수가 아니라
+새 검색어 수에 비례한다. 파티션 워터마크는 factstore.new_rows.
+
+결과
+  negatives    전환 없이 NEGATIVE_COST 이상 쓴 n-gram — 제외 키워드 후보
+  suggestions  세그먼트 비용의 MIN_SHARE 이상이면서 CPL 이 세그먼트 평균과 크게 다른
+               n-gram — 새 의도 세그먼트로 분리할 후보
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import SEARCH_CPL
+from factstore import new_rows
+from metrics import PMAX_CAMPAIGN, safe_cpl
+
+BUCKETS = 1 << 20
+MAX_N = 2
+NEGATIVE_COST = SEARCH_CPL
+MIN_SHARE = 0.05          # 세그먼트 비용 중 이 비율 이상 쓰는 n-gram 만 분리 후보
+MAX_SHARE = 0.9           # 세그먼트 대부분에 들어 있는 단어(예: '용달')는 세그먼트 그 자체
+SPLIT_RATIO = (0.7, 1.4)  # 세그먼트 CPL 대비 이 범위 밖이면 분리 후보
+MIN_CONVERSIONS = 3       # 전환 1~2건짜리 CPL 은 우연 — 분리 판단에서 제외
+SEP = '\x1f'
+
+_MEASURES = ['cost', 'clicks', 'impressions', 'conversions']
+
+
+def _grams(terms, max_n=MAX_N):
+    """고유 검색어 Series → (검색어 위치, n, n-gram) 프레임. 한 검색어 안 중복 n-gram 은 한 번."""
+    tokens = terms.str.split().explode().dropna()
+    pos = tokens.index.to_numpy()
+    words = tokens.to_numpy(dtype=object)
+    frames = [pd.DataFrame({'term': pos, 'n': 1, 'gram': words})]
+    for n in range(2, max_n + 1):
+        same = np.ones(len(words) - n + 1, dtype=bool) if len(words) >= n else np.zeros(0, dtype=bool)
+        gram = pd.Series(words[:len(same)], dtype=object)
+        for k in range(1, n):
+            same &= pos[k:k + len(same)] == pos[:len(same)]
+            gram = gram + ' ' + pd.Series(words[k:k + len(same)], dtype=object)
+        frames.append(pd.DataFrame({'term': pos[:len(same)][same], 'n': n, 'gram': gram.to_numpy()[same]}))
+    return pd.concat(frames, ignore_index=True).drop_duplicates(['term', 'gram'])
+
+
+class NgramMiner:
+    def __init__(self, buckets=BUCKETS, max_n=MAX_N):
+        if buckets & (buckets - 1):
+            raise ValueError('buckets must be a power of two')
+        self.buckets = buckets
+        self.max_n = max_n
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.lineage = []
+        self.counts = {c: np.zeros(self.buckets) for c in _MEASURES}
+        self.fingerprint = np.zeros(self.buckets, dtype='uint64')   # 0 = 빈 칸
+        self.collided = np.zeros(self.buckets, dtype=bool)
+        self.labels = {}            # 칸 → (세그먼트, n, n-gram)
+        self.segments = {}          # 세그먼트 → 합계 (CPL 비교 기준)
+
+    def __len__(self):
+        return len(self.labels)
+
+    # ─── update ───
+    def sync(self, facts):
+        """팩트 전체를 받아 아직 안 센 파티션만 반영 (factstore.new_rows 워터마크)."""
+        if facts is None:
+            return 0
+        with self._lock:
+            start, lineage = new_rows(facts, self.lineage)
+            if start is None:
+                self._reset()
+                start = 0
+            if start >= len(facts):
+                return 0
+            self.update(facts.iloc[start:])
+            self.lineage = lineage
+            return len(facts) - start
+
+    def update(self, batch):
+        batch = batch[batch['campaign'] != PMAX_CAMPAIGN]   # PMax 는 검색어 보고서가 아니다
+        if not len(batch):
+            return
+        terms = batch.groupby(['segment', 'search_term'], observed=True, sort=False)[_MEASURES].sum().reset_index()
+        for seg, part in terms.groupby('segment', observed=True, sort=False)[_MEASURES]:
+            total = self.segments.setdefault(str(seg), dict.fromkeys(_MEASURES, 0.0))
+            for c in _MEASURES:
+                total[c] += float(part[c].sum())
+
+        grams = _grams(terms['search_term'].astype(str), self.max_n)
+        segment = terms['segment'].astype(str).to_numpy(dtype=object)[grams['term'].to_numpy()]
+        keys = segment + SEP + grams['gram'].to_numpy(dtype=object)
+        h = pd.util.hash_array(keys)
+        bucket = (h & np.uint64(self.buckets - 1)).astype('int64')
+        fp = (h >> np.uint64(32)) | np.uint64(1)
+        for c in _MEASURES:
+            self.counts[c] += np.bincount(bucket, weights=terms[c].to_numpy(dtype='float64')[grams['term'].to_numpy()],
+                                          minlength=self.buckets)
+
+        # 칸 주인: 빈 칸이면 이번 배치의 첫 n-gram, 지문이 다르면 충돌 표시
+        first = pd.Series(np.arange(len(bucket))).groupby(bucket).first().to_numpy()
+        owner = self.fingerprint[bucket[first]]
+        new = first[owner == 0]
+        self.fingerprint[bucket[new]] = fp[new]
+        n = grams['n'].to_numpy()
+        gram = grams['gram'].to_numpy(dtype=object)
+        for i in new:
+            self.labels[int(bucket[i])] = (segment[i], int(n[i]), gram[i])
+        self.collided[bucket[fp != self.fingerprint[bucket]]] = True
+
+    # ─── report ───
+    def table(self):
+        """점유된 칸 → 세그먼트 · n-gram 단위 합계."""
+        occupied = np.fromiter(self.labels, dtype='int64', count=len(self.labels))
+        labels = [self.labels[b] for b in occupied]
+        out = pd.DataFrame(labels, columns=['segment', 'n', 'ngram'])
+        for c in _MEASURES:
+            out[c] = self.counts[c][occupied]
+        out['cpl'] = safe_cpl(out['cost'], out['conversions'])
+        out['collided'] = self.collided[occupied]
+        return out
+
+    def negatives(self, min_cost=NEGATIVE_COST):
+        """세그먼트를 합쳐 전환 0 · 비용 min_cost 이상인 n-gram (비용 내림차순)."""
+        t = self.table()
+        agg = t.groupby(['n', 'ngram'], as_index=False).agg(
+            cost=('cost', 'sum'), clicks=('clicks', 'sum'), impressions=('impressions', 'sum'),
+            conversions=('conversions', 'sum'), segments=('segment', lambda s: ', '.join(sorted(s))),
+            collided=('collided', 'any'))
+        out = agg[(agg['conversions'] == 0) & (agg['cost'] >= min_cost)]
+        return out.sort_values('cost', ascending=False, kind='stable').reset_index(drop=True)
+
+    def suggestions(self, min_share=MIN_SHARE, max_share=MAX_SHARE, ratio=SPLIT_RATIO, min_conversions=MIN_CONVERSIONS):
+        """세그먼트 안에서 비용 비중이 크고 CPL 이 세그먼트 평균과 크게 다른 n-gram."""
+        cols = ['segment', 'ngram', 'n', 'action', 'share', 'cost', 'conversions', 'cpl', 'segment_cpl', 'cpl_ratio', 'collided']
+        if not self.segments:
+            return pd.DataFrame(columns=cols)
+        t = self.table()
+        seg = pd.DataFrame.from_dict(self.segments, orient='index')
+        t = t[t['conversions'] >= min_conversions].join(seg[['cost', 'conversions']].add_prefix('segment_'), on='segment')
+        t['share'] = np.round(100 * t['cost'] / t['segment_cost'], 1)
+        t['segment_cpl'] = safe_cpl(t['segment_cost'], t['segment_conversions'])
+        t['cpl_ratio'] = np.round(t['cpl'] / t['segment_cpl'].where(t['segment_cpl'] > 0), 2)
+        lo, hi = ratio
+        keep = t['share'].between(100 * min_share, 100 * max_share) & ((t['cpl_ratio'] <= lo) | (t['cpl_ratio'] >= hi))
+        out = t[keep].assign(action=np.where(t.loc[keep, 'cpl_ratio'] <= lo, '분리 · 입찰 강화', '분리 · 별도 카피/입찰 축소'))
+        return out[cols].sort_values(['segment', 'cost'], ascending=[True, False], kind='stable').reset_index(drop=True)
+
+    def report(self):
+        return {
+            'negatives': self.negatives(),
+            'suggestions': self.suggestions(),
+            'ngrams': len(self.labels),
+            'buckets': self.buckets,
+            'collided': int(self.collided.sum()),
+        }
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — 병렬 재계산
+Per-account × per-segment analytics on a process pool over shared memory.
+
+팩트 테이블을 계정 순으로 정렬한 숫자 컬럼(코드·비용·전환 …)으로 바꿔
+multiprocessing.shared_memory 에 한 번만 올린다. 워커는 블록 이름으로 붙어
+복사 없이 NumPy 배열로 읽고, 작업 단위(테이블 × 차원 × 계정 구간)마다
+  - 합계 지표 (비용·전환·CPL·CTR·CVR)
+  - 다음 주 예측 (최근 8주 선형 추세)
+  - CVR 유의성 (같은 계정 나머지 대비 two-proportion z-test, 세그먼트는 PMax 제외)
+를 bincount 한 번으로 계산해 작은 결과만 돌려준다.
+
+    python parallel.py --workers 8
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from metrics import PMAX_CAMPAIGN, safe_cpl, safe_rate
+
+# 테이블별 재계산 차원
+DIMENSIONS = {
+    'google': ['segment', 'campaign'],
+    'meta': ['adset', 'creative', 'platform'],
+}
+# 차원별로 빼는 행 — PMax 는 세그먼트가 아니다 (google_intent_from_facts 와 같은 기준).
+# 빠진 행은 코드 -1 로 두어 합계·z-test 의 '계정 나머지' 어디에도 들어가지 않는다
+EXCLUDE = {'segment': ('campaign', PMAX_CAMPAIGN)}
+MEASURES = ['cost', 'conversions', 'clicks', 'impressions']
+FORECAST_WEEKS = 8
+SIGNIFICANCE = 0.05
+# 이보다 작으면 프로세스를 띄우는 비용이 더 크다 — 현재 프로세스에서 바로 계산
+INLINE_ROWS = 200_000
+
+
+# ═══════════════════════════════════════════════
+# Shared memory
+# ═══════════════════════════════════════════════
+class SharedColumns:
+    """NumPy 컬럼들을 SharedMemory 블록으로 올리고, 워커에 넘길 spec 을 만든다."""
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.spec = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[:] = arr
+            self._blocks.append(shm)
+            self.spec[name] = (shm.name, arr.dtype.str, arr.shape)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_ATTACHED = {}
+
+
+def attach(spec):
+    """spec → {컬럼: ndarray} (워커 프로세스당 블록마다 한 번만 붙는다)."""
+    arrays = {}
+    for name, (shm_name, dtype, shape) in spec.items():
+        shm = _ATTACHED.get(shm_name)
+        if shm is None:
+            # spawn 워커는 부모의 resource tracker 를 공유 — unlink 는 생성한 부모가 한다
+            shm = _ATTACHED[shm_name] = SharedMemory(name=shm_name)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+    return arrays
+
+
+# ═══════════════════════════════════════════════
+# Prepare
+# ═══════════════════════════════════════════════
+def _codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype('int32'), list(series.cat.categories.astype(str))
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype('int32'), list(map(str, uniques))
+
+
+def prepare(facts, dims):
+    """계정 순 정렬된 숫자 컬럼 + 라벨 + 계정 구간."""
+    account, accounts = _codes(facts['account'])
+    # export·datagen 결과는 보통 계정별로 연속 — 이미 정렬돼 있으면 재배열 생략
+    order = slice(None) if np.all(account[:-1] <= account[1:]) else np.argsort(account, kind='stable')
+    # 주차는 월요일 기준 주 번호 (연도를 넘는 이력에서도 'W44' 라벨이 겹치지 않게)
+    days = pd.to_datetime(facts['date']).to_numpy().astype('datetime64[D]').astype('int64')
+    week_no = (days + 3) // 7
+    first_week = week_no.min()
+    week = (week_no - first_week).astype('int32')
+    week_labels = [str(np.datetime64(int((first_week + i) * 7 - 3), 'D')) for i in range(week.max() + 1)]
+    arrays = {'account': account[order], 'week': week[order]}
+    labels = {'account': accounts, 'week': week_labels}
+    for m in MEASURES:
+        arrays[m] = facts[m].to_numpy(dtype='float64')[order]
+    for d in dims:
+        codes, cats = _codes(facts[d])
+        if d in EXCLUDE:
+            col, value = EXCLUDE[d]
+            codes = np.where((facts[col] == value).to_numpy(), -1, codes).astype('int32')
+        arrays[d] = codes[order]
+        labels[d] = cats
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(arrays['account'], minlength=len(accounts)))])
+    return arrays, labels, bounds
+
+
+# ═══════════════════════════════════════════════
+# Analytics (worker)
+# ═══════════════════════════════════════════════
+def _trend_forecast(weekly):
+    """행(그룹)별 최근 FORECAST_WEEKS 주 선형 추세로 다음 주 값 (음수는 0)."""
+    y = weekly[:, -FORECAST_WEEKS:]
+    k = y.shape[1]
+    if k < 2:
+        return y[:, -1] if k else np.zeros(len(weekly))
+    t = np.arange(k, dtype='float64')
+    tc = t - t.mean()
+    slope = ((y - y.mean(axis=1, keepdims=True)) @ tc) / (tc @ tc)
+    return np.maximum(y.mean(axis=1) + slope * (k - t.mean()), 0)
+
+
+def group_analytics(arrays, dim, n_groups, n_weeks, start, end):
+    codes = arrays[dim][start:end]
+    keep = codes >= 0
+    rows = slice(None) if keep.all() else keep
+    codes = codes[rows]
+    week = arrays['week'][start:end][rows].astype('int64')
+    measure = {m: arrays[m][start:end][rows] for m in MEASURES}
+    tot = {m: np.bincount(codes, weights=measure[m], minlength=n_groups) for m in MEASURES}
+    present = np.flatnonzero((tot['impressions'] > 0) | (tot['cost'] > 0))
+
+    flat = codes.astype('int64') * n_weeks + week
+    weekly_cost = np.bincount(flat, weights=measure['cost'], minlength=n_groups * n_weeks).reshape(n_groups, n_weeks)
+    weekly_conv = np.bincount(flat, weights=measure['conversions'], minlength=n_groups * n_weeks).reshape(n_groups, n_weeks)
+    # 계정 안에서 실제 데이터가 있는 주까지만 예측 입력으로 사용
+    active_weeks = np.flatnonzero(np.bincount(week, minlength=n_weeks))
+    last = active_weeks[-1] + 1 if len(active_weeks) else 0
+    forecast_cost = _trend_forecast(weekly_cost[present, :last])
+    forecast_conv = _trend_forecast(weekly_conv[present, :last])
+
+    conv, clicks = tot['conversions'][present], tot['clicks'][present]
+    rest_conv, rest_clicks = tot['conversions'].sum() - conv, tot['clicks'].sum() - clicks
+    p1 = np.divide(conv, clicks, out=np.zeros_like(conv), where=clicks > 0)
+    p2 = np.divide(rest_conv, rest_clicks, out=np.zeros_like(conv), where=rest_clicks > 0)
+    pooled = np.divide(conv + rest_conv, clicks + rest_clicks, out=np.zeros_like(conv), where=(clicks + rest_clicks) > 0)
+    se = np.sqrt(pooled * (1 - pooled) * (np.divide(1, clicks, out=np.zeros_like(conv), where=clicks > 0)
+                                          + np.divide(1, rest_clicks, out=np.zeros_like(conv), where=rest_clicks > 0)))
+    z = np.divide(p1 - p2, se, out=np.zeros_like(conv), where=se > 0)
+    p_value = np.array([math.erfc(abs(v) / math.sqrt(2)) for v in z])
+
+    return pd.DataFrame({
+        'group': present,
+        'cost': tot['cost'][present],
+        'conversions': conv,
+        'clicks': clicks,
+        'impressions': tot['impressions'][present],
+        'cvr_z': np.round(z, 3),
+        'p_value': np.round(p_value, 4),
+        'forecast_cost': np.rint(forecast_cost),
+        'forecast_conversions': np.round(forecast_conv, 2),
+    })
+
+
+def _run_task(task, arrays=None):
+    table, spec, dim, n_groups, n_weeks, account, start, end = task
+    out = group_analytics(attach(spec) if arrays is None else arrays, dim, n_groups, n_weeks, start, end)
+    out.insert(0, 'account', account)
+    out.insert(0, 'dimension', dim)
+    out.insert(0, 'table', table)
+    return out
+
+
+# ═══════════════════════════════════════════════
+# Recompute (parent)
+# ═══════════════════════════════════════════════
+def _finish(frames, labels_by_table):
+    results = {}
+    for df in frames:
+        if df.empty:
+            continue
+        table, dim = df['table'].iat[0], df['dimension'].iat[0]
+        labels = labels_by_table[table]
+        df = df.copy()
+        df['account'] = np.asarray(labels['account'])[df['account'].to_numpy()]
+        df['group'] = np.asarray(labels[dim])[df['group'].to_numpy()]
+        results.setdefault(dim, []).append(df)
+    out = {}
+    for dim, parts in results.items():
+        df = pd.concat(parts, ignore_index=True).drop(columns=['table', 'dimension'])
+        df = df.rename(columns={'group': dim})
+        df['cpl'] = safe_cpl(df['cost'], df['conversions'])
+        df['ctr'] = safe_rate(df['clicks'], df['impressions'])
+        df['cvr'] = safe_rate(df['conversions'], df['clicks'])
+        df['significant'] = df['p_value'] < SIGNIFICANCE
+        df['forecast_cpl'] = safe_cpl(df['forecast_cost'], df['forecast_conversions'])
+        out[dim] = df
+    return out
+
+
+def recompute(facts, dims=None, workers=None):
+    """facts = {'google': df, 'meta': df} → {차원: 계정 × 그룹 분석 DataFrame}."""
+    dims = dims or DIMENSIONS
+    facts = {t: df for t, df in facts.items() if t in dims and len(df)}
+    if not facts:
+        return {}
+    workers = workers or os.cpu_count() or 1
+    total_rows = sum(len(df) for df in facts.values())
+    inline = workers == 1 or total_rows < INLINE_ROWS
+
+    shared, tasks, labels_by_table = [], [], {}
+    try:
+        for table, df in facts.items():
+            arrays, labels, bounds = prepare(df, dims[table])
+            labels_by_table[table] = labels
+            if inline:
+                spec = arrays
+            else:
+                block = SharedColumns(arrays)
+                shared.append(block)
+                spec = block.spec
+            n_weeks = len(labels['week'])
+            for dim in dims[table]:
+                for a in range(len(labels['account'])):
+                    tasks.append((table, spec, dim, len(labels[dim]), n_weeks, a, bounds[a], bounds[a + 1]))
+
+        if inline:
+            frames = [_run_task(t, arrays=t[1]) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+                frames = list(pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    finally:
+        for block in shared:
+            block.close()
+    return _finish(frames, labels_by_table)
+
+
+# ═══════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════
+def main(argv=None):
+    from data import DATA_DIR
+    from refresh import load_facts
+
+    parser = argparse.ArgumentParser(description='세그먼트·소재·플랫폼 분석 병렬 재계산')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--out', default=None, help='결과 Parquet 디렉터리 (기본: data-dir/analytics)')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    facts = load_facts(args.data_dir)
+    t1 = time.perf_counter()
+    results = recompute(facts, workers=args.workers)
+    t2 = time.perf_counter()
+    out_dir = args.out or os.path.join(args.data_dir, 'analytics')
+    os.makedirs(out_dir, exist_ok=True)
+    for dim, df in results.items():
+        df.to_parquet(os.path.join(out_dir, f'{dim}.parquet'), index=False)
+        print(f'{dim}: {len(df):,} rows')
+    print(f'load {t1 - t0:.1f}s · recompute {t2 - t1:.1f}s → {out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+이사대학 마케팅 분석 — 백그라운드 데이터 갱신
+Versioned dataset snapshots rebuilt off the Streamlit request path.
+
+RefreshWorker 는 프로세스당 하나(st.cache_resource)만 뜨는 데몬 스레드다.
+데이터 디렉터리의 팩트 파일이 바뀌면 새 Dataset 을 처음부터 끝까지 만든 뒤
+(팩트 로드 → 대시보드 테이블 롤업 → 정합성 검증 → 파생 객체 계산) 참조 하나만 바꿔
+끼운다. 검증(validation.py)에서 허용 오차를 넘은 버전은 올리지 않는다.
+롤업 · 파생 객체는 ReportCache(reportcache.py)가 있으면 버전별로 디스크에 남겨
+다음 프로세스가 다시 계산하지 않는다.
+화면은 rerun 마다 current() 로 스냅샷 하나를 받아 쓰므로 재계산을 기다리지 않고,
+반쯤 갱신된 숫자를 보는 일도 없다. 워커를 만들 때는 data.py 집계 테이블만 바로
+올리고(derived 비어 있음), 파생 객체가 든 첫 버전도 워커 스레드에서 만든다.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import pyarrow.parquet as pq
+
+from data import BASELINE_TABLES, DATA_DIR, GOOGLE_FACTS, META_FACTS
+from factstore import FactStore
+from metrics import (
+    google_intent_from_facts, google_campaign_weekly_from_facts,
+    meta_adset_from_facts, meta_platform_weekly_from_facts,
+)
+from validation import ValidationError, Validator, blocking, validate
+
+log = logging.getLogger(__name__)
+
+BASELINE_VERSION = 'baseline'
+REFRESH_INTERVAL = 60
+
+# 팩트 테이블의 문자열 컬럼은 pandas categorical 로 읽는다 (메모리 절약)
+GOOGLE_DICT_COLUMNS = ['account', 'week', 'campaign', 'segment', 'keyword', 'match_type', 'search_term']
+META_DICT_COLUMNS = ['account', 'week', 'platform', 'adset', 'target', 'creative']
+
+
+@dataclass(frozen=True)
+class Dataset:
+    version: str
+    tables: MappingProxyType
+    facts: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    derived: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    built_at: float = field(default_factory=time.time)
+    validation: object = None      # validation.validate() 리포트 (검증했으면)
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    @property
+    def source(self):
+        return 'baseline' if self.version == BASELINE_VERSION else 'facts'
+
+
+# ═══════════════════════════════════════════════
+# Build
+# ═══════════════════════════════════════════════
+FACT_FILES = {'google': GOOGLE_FACTS, 'meta': META_FACTS}
+
+
+def fact_store(data_dir=DATA_DIR):
+    return FactStore(os.path.join(data_dir, 'store'))
+
+
+def fingerprint(data_dir=DATA_DIR):
+    """팩트 파일 (이름, 크기, 수정 시각) — 바뀌면 새 버전. 스토어에 있는 테이블은 manifest 기준."""
+    store = fact_store(data_dir)
+    parts = []
+    for table, name in FACT_FILES.items():
+        fp = store.fingerprint(table)
+        if fp is not None:
+            parts.append(fp)
+            continue
+        try:
+            st = os.stat(os.path.join(data_dir, name))
+        except FileNotFoundError:
+            continue
+        parts.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(parts)
+
+
+def watch_fingerprint(paths=()):
+    """팩트 밖의 입력 파일 (예: 내부 예약 DB) — 바뀌면 파생 객체만 다시 만든다 (버전 id 는 팩트 기준)."""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        parts.append((path, st.st_size, st.st_mtime_ns))
+    return tuple(parts)
+
+
+def dataset_version(fp):
+    if not fp:
+        return BASELINE_VERSION
+    return hashlib.sha256(repr(fp).encode()).hexdigest()[:16]
+
+
+def load_facts(data_dir=DATA_DIR):
+    """메모리 매핑 스토어(data_dir/store)를 우선 — 없는 테이블만 Parquet 을 읽어 올린다."""
+    store = fact_store(data_dir)
+    facts = {}
+    for table, name in FACT_FILES.items():
+        if table in store:
+            facts[table] = store.read(table)
+            continue
+        path = os.path.join(data_dir, name)
+        if os.path.exists(path):
+            dict_columns = GOOGLE_DICT_COLUMNS if table == 'google' else META_DICT_COLUMNS
+            df = pq.read_table(path, read_dictionary=dict_columns).to_pandas(date_as_object=False)
+            st = os.stat(path)
+            # Parquet 은 통째로 다시 쓰이므로 파일 자체가 파티션 하나
+            df.attrs['lineage'] = [(f'{name}:{st.st_size}:{st.st_mtime_ns}', len(df))]
+            facts[table] = df
+    return facts
+
+
+def rollup_tables(facts):
+    """팩트 → data.py 스키마의 대시보드 테이블 (팩트가 있는 채널만)."""
+    tables = {}
+    if 'google' in facts:
+        tables['google_intent'] = google_intent_from_facts(facts['google'])
+        tables['google_campaign_weekly'] = google_campaign_weekly_from_facts(facts['google'])
+    if 'meta' in facts:
+        tables['meta_adset'] = meta_adset_from_facts(facts['meta'])
+        tables['meta_platform_weekly'] = meta_platform_weekly_from_facts(facts['meta'])
+    return tables
+
+
+def build_dataset(data_dir=DATA_DIR, derived=None, fp=None, cache=None, watch_fp=(), uncached=(),
+                  validator=None):
+    """새 Dataset 을 완성된 상태로 만든다 (팩트 없으면 data.py 집계 테이블 그대로).
+
+    cache(ReportCache) 가 있으면 롤업 · 파생 객체를 버전별로 디스크에서 읽거나 계산해 넣는다.
+    validator(validation.Validator) 가 있으면 파생 객체 전에 정합성을 검사하고, 팩트 버전이
+    허용 오차를 넘으면 ValidationError 를 던진다. 파생 객체 하나가 실패하면 로그를 남기고
+    None 으로 둔다.
+    """
+    fp = fingerprint(data_dir) if fp is None else fp
+    version = dataset_version(fp)
+    facts = load_facts(data_dir) if fp else {}
+    if cache is not None and facts:
+        rollups = cache.get_or_build(version, 'tables', lambda: rollup_tables(facts))
+    else:
+        rollups = rollup_tables(facts)
+    dataset = Dataset(version, MappingProxyType({**BASELINE_TABLES, **rollups}), MappingProxyType(facts))
+    report = None
+    if validator is not None:
+        report = validate(dataset, validator)
+        if facts and blocking(report):
+            raise ValidationError(version, report)
+    built = {}
+    for name, fn in (derived or {}).items():
+        try:
+            if cache is None or name in uncached:
+                built[name] = fn(dataset)
+            else:
+                built[name] = cache.get_or_build(version, name, lambda: fn(dataset), extra=watch_fp)
+        except Exception:  # 리포트 하나가 실패해도 버전은 올린다 (화면은 None 섹션을 건너뜀)
+            log.exception('derived report %s failed for dataset %s', name, version)
+            built[name] = None
+    return Dataset(dataset.version, dataset.tables, dataset.facts, MappingProxyType(built), validation=report)
+
+
+# ═══════════════════════════════════════════════
+# Worker
+# ═══════════════════════════════════════════════
+class RefreshWorker:
+    def __init__(self, data_dir=DATA_DIR, derived=None, interval=REFRESH_INTERVAL, watch=(),
+                 cache=None, uncached=(), validator=None):
+        self.data_dir = data_dir
+        self.derived = dict(derived or {})
+        self.interval = interval
+        self.watch = tuple(watch)
+        self.cache = cache
+        self.uncached = frozenset(uncached)
+        self.validator = Validator() if validator is None else validator
+        self.last_error = None
+        self.rejected = None           # 검증에서 막힌 마지막 버전의 ValidationError
+        self.building = False
+        self._fingerprint = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        # 첫 화면은 즉시: data.py 집계 테이블만 먼저 올리고, 파생 객체 · 팩트 버전은 워커 스레드에서 만든다
+        self._current = Dataset(BASELINE_VERSION, MappingProxyType(dict(BASELINE_TABLES)))
+
+    @property
+    def ready(self):
+        """파생 객체가 든 버전이 한 번이라도 올라갔는지."""
+        return self._fingerprint is not None
+
+    def current(self):
+        return self._current
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='dataset-refresh', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def refresh_now(self):
+        """현재 스레드에서 바로 갱신 (배치 스크립트·테스트용). 새 버전이면 True."""
+        fp = fingerprint(self.data_dir)
+        key = (fp, watch_fingerprint(self.watch))
+        if key == self._fingerprint:
+            return False
+        self.building = True
+        try:
+            dataset = build_dataset(self.data_dir, self.derived, fp=fp, cache=self.cache,
+                                    watch_fp=key[1], uncached=self.uncached, validator=self.validator)
+        except ValidationError as e:
+            # 같은 파일로 다시 만들어도 결과는 같다 — 파일이 바뀔 때까지 직전 버전 유지
+            if not self.ready:
+                # 아직 파생 객체가 없으면 직전 버전 대신 베이스라인을 완성해 올린다
+                self._current = build_dataset(self.data_dir, self.derived, fp=(), cache=self.cache,
+                                              watch_fp=key[1], uncached=self.uncached,
+                                              validator=self.validator)
+            self._fingerprint = key
+            self.rejected = e
+            log.warning('%s — keeping dataset %s', e, self._current.version)
+            return False
+        finally:
+            self.building = False
+        self._fingerprint = key
+        self.rejected = None
+        self._current = dataset
+        log.info('dataset %s live', dataset.version)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_now()
+                self.last_error = None
+            except Exception as e:  # 실패해도 직전 버전은 계속 서비스
+                self.last_error = e
+                log.exception('dataset refresh failed')
+            self._wake.wait(self.interval)
+            self._wake.clear()
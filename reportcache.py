@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — 사전 계산 리포트 캐시
+Content-addressed on-disk cache of rollup tables and derived report objects.
+
+새 Streamlit 프로세스는 데이터 버전마다 팩트 롤업 · 파생 객체(분석 테이블, 키워드
+인덱스, 메시지 크로스 등)를 처음부터 다시 계산한다. 배포 직후 첫 방문자가 이 비용을
+떠안지 않도록, 계산 결과를 pickle 로 디스크에 두고 다음 프로세스가 그대로 읽는다.
+
+    cache/refs/<key>.json      키 → 객체 해시 (+ 버전 · 이름 · 계산 시간)
+    cache/objects/ab/<sha256>  pickle 바이트 (내용 해시 = 파일 이름)
+
+키 = sha256(코드 버전, 리포트 기간, 데이터셋 버전, 외부 입력 지문, 이름). 코드 버전은
+이 디렉터리 .py 파일 내용의 해시라, 배포로 계산 로직이 바뀌면 이전 캐시는 자연히
+안 쓰인다. 내용이 같은 결과(예: 팩트 없는 파생 객체)는 객체 파일 하나를 공유한다.
+
+배포 스크립트에서 서버를 띄우기 전에 한 번:
+
+    python reportcache.py warm
+    python reportcache.py prune --keep 3
+    python reportcache.py info
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+from data import DATA_DIR, REPORT_PERIOD
+
+CACHE_DIR = os.environ.get('MOVEUNIV_CACHE_DIR', os.path.join(DATA_DIR, 'cache'))
+
+log = logging.getLogger(__name__)
+
+
+def _code_version():
+    """이 디렉터리 파이썬 소스 전체의 해시 — 코드가 바뀌면 캐시 키도 바뀐다."""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            h.update(os.path.basename(path).encode())
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ReportCache:
+    def __init__(self, root=CACHE_DIR, period=REPORT_PERIOD):
+        self.root = root
+        self.period = tuple(period)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, version, name, extra=()):
+        parts = [CODE_VERSION, list(self.period), version, repr(extra), name]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode()).hexdigest()
+
+    def _ref_path(self, key):
+        return os.path.join(self.root, 'refs', f'{key}.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    # ─── get / put ───
+    def get(self, key):
+        """(있음, 값). 파일이 깨졌거나 내용 해시가 다르면 없는 것으로 본다."""
+        try:
+            with open(self._ref_path(key), encoding='utf-8') as f:
+                digest = json.load(f)['object']
+            with open(self._object_path(digest), 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError, KeyError):
+            return False, None
+        if hashlib.sha256(data).hexdigest() != digest:
+            log.warning('report cache object %s corrupt', digest)
+            return False, None
+        try:
+            return True, pickle.loads(data)
+        except Exception:  # 클래스 정의가 바뀐 옛 객체 등
+            log.warning('report cache object %s unreadable', digest, exc_info=True)
+            return False, None
+
+    def put(self, key, value, version, name, seconds=None):
+        """저장하면 True — pickle 할 수 없는 객체(DB 연결 등)나 쓰기 실패는 False."""
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            log.warning('report %s not cacheable', name, exc_info=True)
+            return False
+        digest = hashlib.sha256(data).hexdigest()
+        ref = {'object': digest, 'version': version, 'name': name, 'period': list(self.period),
+               'code': CODE_VERSION, 'bytes': len(data), 'seconds': seconds, 'created': time.time()}
+        try:
+            if not os.path.exists(self._object_path(digest)):
+                _write_atomic(self._object_path(digest), data)
+            _write_atomic(self._ref_path(key), json.dumps(ref, ensure_ascii=False).encode())
+        except OSError:  # 읽기 전용 디렉터리 — 캐시 없이 계속
+            log.warning('report cache not written to %s', self.root, exc_info=True)
+            return False
+        return True
+
+    def get_or_build(self, version, name, build, extra=()):
+        key = self.key(version, name, extra)
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+        t0 = time.perf_counter()
+        value = build()
+        self.put(key, value, version, name, round(time.perf_counter() - t0, 3))
+        return value
+
+    # ─── maintenance ───
+    def refs(self):
+        out = []
+        for path in glob.glob(os.path.join(self.root, 'refs', '*.json')):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    ref = json.load(f)
+            except (OSError, ValueError):
+                continue
+            out.append(dict(ref, path=path))
+        return sorted(out, key=lambda r: r['created'])
+
+    def prune(self, keep=3):
+        """최근 keep 개 데이터 버전의 ref 만 남기고, 참조되지 않는 객체 파일은 지운다."""
+        refs = self.refs()
+        recent = []
+        for r in reversed(refs):
+            if (r['version'], r['code']) not in recent:
+                recent.append((r['version'], r['code']))
+        recent = set(recent[:keep])
+        live = set()
+        removed = 0
+        for r in refs:
+            if (r['version'], r['code']) in recent:
+                live.add(r['object'])
+            else:
+                os.remove(r['path'])
+                removed += 1
+        for path in glob.glob(os.path.join(self.root, 'objects', '*', '*')):
+            if os.path.basename(path) not in live and not path.endswith('.tmp'):
+                os.remove(path)
+        return removed
+
+
+# ═══════════════════════════════════════════════
+# Warm-up
+# ═══════════════════════════════════════════════
+def warm(data_dir=DATA_DIR, cache=None):
+    """대시보드와 같은 파생 정의로 현재 데이터 버전(팩트가 없으면 베이스라인)을 계산해 캐시에 채운다."""
+    from refresh import RefreshWorker
+    from reports import UNCACHED, WATCH, dashboard_derived
+
+    cache = cache or ReportCache()
+    worker = RefreshWorker(data_dir, dashboard_derived(), watch=WATCH, cache=cache, uncached=UNCACHED)
+    worker.refresh_now()
+    return worker.current(), cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리포트 사전 계산 캐시')
+    parser.add_argument('--root', default=CACHE_DIR)
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('warm', help='현재 데이터 버전의 롤업 · 파생 리포트를 미리 계산')
+    p.add_argument('--data-dir', default=DATA_DIR)
+    p = sub.add_parser('prune', help='오래된 데이터 버전 캐시 삭제')
+    p.add_argument('--keep', type=int, default=3)
+    sub.add_parser('info')
+    args = parser.parse_args(argv)
+
+    cache = ReportCache(args.root)
+    if args.cmd == 'warm':
+        t0 = time.perf_counter()
+        dataset, cache = warm(args.data_dir, cache)
+        print(f'dataset {dataset.version}: {cache.misses} built, {cache.hits} cached '
+              f'in {time.perf_counter() - t0:.1f}s → {cache.root}')
+    elif args.cmd == 'prune':
+        print(f'removed {cache.prune(args.keep)} refs')
+    else:
+        for r in cache.refs():
+            print(f"{r['version']:>16}  {r['name']:<24} {r['bytes'] / 1e6:8.2f} MB  {r['seconds'] or 0:7.2f}s  code {r['code']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+이사대학 마케팅 분석 — 대시보드 파생 리포트 정의
+Derived per-version report objects shared by the app and the cache warm-up.
+
+데이터 버전마다 한 번 계산해 Dataset.derived 에 넣는 객체들. app.py 의
+RefreshWorker 와 reportcache.py warm 이 같은 정의를 써야 캐시 키가 맞는다.
+"""
+
+from attribution import TOUCHPOINTS, AttributionStore, attribution_report
+from bookings import BOOKINGS_DB, BookingStore, booking_report
+from creatives import CreativeIndex, load_creative_table
+from explore import QueryEngine
+from fatigue import FatigueModel
+from geo import GEO_REPORT, GeoStore
+from messages import TAGS_FILE, message_cross_from_dataset
+from metrics import google_keyword_from_facts
+from ngrams import NgramMiner
+from tables import TableIndex
+from timeseries import DailySeries
+from waste import WasteTracker
+
+# 바뀌면 파생 객체를 다시 만드는 팩트 밖 입력
+WATCH = (BOOKINGS_DB, f'{BOOKINGS_DB}-wal', TOUCHPOINTS, GEO_REPORT, TAGS_FILE)
+# 디스크 캐시에 넣지 않는 파생 객체 (DuckDB 연결은 프로세스마다 새로)
+UNCACHED = frozenset({'query_engine'})
+
+
+def dashboard_derived(waste=None, bookings=None, ngrams=None, fatigue=None, geo=None, attribution=None):
+    waste = waste or WasteTracker()  # 버전이 바뀌어도 누적 카운터는 유지 (새 파티션만 반영)
+    ngrams = ngrams or NgramMiner()
+    fatigue = fatigue or FatigueModel()   # 소재 피로 충분통계도 새 날짜 파티션만 더한다
+    geo = geo or GeoStore()               # 지역 × 주 배열 — 검색어 팩트는 새 파티션만
+    bookings = bookings or BookingStore()  # 예약 DB 도 워터마크 이후 행만 읽는다
+    attribution = attribution or AttributionStore()  # 터치포인트 로그는 파일이 바뀔 때만 다시 읽는다
+    return {
+        'creative_index': lambda ds: CreativeIndex(load_creative_table(ds.facts.get('meta'))),
+        'query_engine': QueryEngine,
+        'keyword_index': lambda ds: TableIndex(
+            google_keyword_from_facts(ds.facts['google']),
+            sort_columns=['cost', 'conversions', 'cpl', 'clicks', 'impressions', 'ctr', 'cvr', 'keyword'],
+            filter_columns=['segment', 'match_type'], search_column='keyword',
+        ) if 'google' in ds.facts else None,
+        'message_cross': message_cross_from_dataset,
+        'waste': lambda ds: (waste.sync(ds.facts.get('google')), waste.report())[1] if 'google' in ds.facts else None,
+        'google_daily': lambda ds: DailySeries.from_facts(ds.facts['google'], 'segment') if 'google' in ds.facts else None,
+        'ngrams': lambda ds: (ngrams.sync(ds.facts.get('google')), ngrams.report())[1] if 'google' in ds.facts else None,
+        'fatigue': lambda ds: (fatigue.sync(ds.facts.get('meta')), fatigue.report())[1] if 'meta' in ds.facts else None,
+        'geo': lambda ds: _geo_cube(geo, ds),
+        'bookings': lambda ds: booking_report(bookings, ds),
+        'attribution': lambda ds: attribution_report(ds, attribution),
+    }
+
+
+def _geo_cube(geo, ds):
+    geo.sync(ds.facts.get('google'))
+    cube = geo.snapshot()
+    return cube if cube.sources() else None
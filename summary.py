@@ -0,0 +1,63 @@
+"""
+이사대학 마케팅 분석 — 요약 지표
+Dataset 스냅샷 하나에서 KPI 합계와 캠페인 · 세그먼트 · 플랫폼 CPL 을 계산한다.
+대시보드 카드(app.py)와 JSON API(api.py)가 같은 함수를 쓴다 — 팩트가 있으면
+팩트 합계, 없으면 Executive Summary 의 보고 수치.
+"""
+
+import pandas as pd
+
+from data import GOOGLE_CONV, GOOGLE_SPEND, META_CONV, META_SPEND
+from metrics import safe_cpl
+
+
+# ═══════════════════════════════════════════════
+# Aggregates
+# ═══════════════════════════════════════════════
+def campaign_cpl(ds):
+    """Google 캠페인별 비용 · 전환 · CPL — 팩트가 있으면 주간 롤업 합계."""
+    if 'google' in ds.facts:
+        agg = ds['google_campaign_weekly'].groupby('campaign', as_index=False)[['cost', 'conv']].sum()
+        df = pd.DataFrame({'campaign': agg['campaign'], 'cost': agg['cost'], 'conversions': agg['conv']})
+    else:
+        gc = ds['google_campaign']
+        df = pd.DataFrame({'campaign': gc['캠페인'], 'cost': gc['비용'], 'conversions': gc['전환']})
+    df['cpl'] = safe_cpl(df['cost'], df['conversions'])
+    return df.sort_values('cost', ascending=False, kind='stable')
+
+
+def segment_cpl(ds):
+    gi = ds['google_intent']
+    return gi[['segment', 'keywords', 'cost', 'conversions', 'cpl', 'clicks', 'impressions']]
+
+
+def platform_cpl(ds):
+    """Meta 플랫폼별 비용 · 전환 · CPL."""
+    facts = ds.facts.get('meta')
+    if facts is not None:
+        agg = facts.groupby('platform', observed=True)[['cost', 'conversions']].sum().reset_index()
+        df = pd.DataFrame({'platform': agg['platform'].astype(str), 'cost': agg['cost'], 'conversions': agg['conversions']})
+    else:
+        agg = ds['meta_plat_month'].groupby('플랫폼', as_index=False)[['비용', '전환']].sum()
+        df = pd.DataFrame({'platform': agg['플랫폼'], 'cost': agg['비용'], 'conversions': agg['전환']})
+    df['cpl'] = safe_cpl(df['cost'], df['conversions'])
+    return df.sort_values('cost', ascending=False, kind='stable')
+
+
+def kpis(ds):
+    """채널 · 전체 광고비 · 전환 · CPL. 베이스라인은 Executive Summary 와 같은 보고 수치."""
+    if ds.facts:
+        google = campaign_cpl(ds)[['cost', 'conversions']].sum() if 'google' in ds.facts else None
+        meta = platform_cpl(ds)[['cost', 'conversions']].sum() if 'meta' in ds.facts else None
+    else:
+        google = pd.Series({'cost': GOOGLE_SPEND, 'conversions': GOOGLE_CONV})
+        meta = pd.Series({'cost': META_SPEND, 'conversions': META_CONV})
+    channels = {name: s for name, s in (('google', google), ('meta', meta)) if s is not None}
+    spend = sum(float(s['cost']) for s in channels.values())
+    conv = sum(float(s['conversions']) for s in channels.values())
+    out = {name: {'spend': float(s['cost']), 'conversions': float(s['conversions']),
+                  'cpl': float(safe_cpl(s['cost'], s['conversions'])),
+                  'spend_share': round(100 * float(s['cost']) / spend, 1) if spend else None}
+           for name, s in channels.items()}
+    out['total'] = {'spend': spend, 'conversions': conv, 'cpl': float(safe_cpl(spend, conv))}
+    return out
@@ -0,0 +1,105 @@
+"""
+이사대학 마케팅 분석 — 대용량 표 인덱스
+Server-side sort / filter / paging for tables too large to ship to the browser.
+
+표를 한 번 받아 정렬 컬럼마다 argsort 를 미리 계산하고 필터 컬럼은 카테고리
+코드로 바꿔 둔다. 질의는 위치 배열만 만들고 화면에는 한 페이지 분량의 행만
+보낸다. 소재 갤러리(creatives.CreativeIndex)도 이 인덱스 위에 만든다.
+
+검색 컬럼(키워드)은 소문자 정렬 순서의 고유값 목록과, 그 순서로 정렬된 행
+위치를 함께 가진다. 접두어 검색은 고유값에 searchsorted 두 번 → 연속된 행
+구간 하나라서 행 수와 무관하게 즉시 끝나고, 현재 정렬·필터 안에서 그 키워드가
+처음 나오는 페이지로 바로 이동할 수 있다.
+"""
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+class TableIndex:
+    def __init__(self, df, sort_columns, filter_columns=(), search_column=None):
+        self.df = df.reset_index(drop=True)
+        self.sort_columns = list(sort_columns)
+        self.search_column = search_column
+        n = len(self.df)
+
+        # 정렬 순서: 결측은 방향과 무관하게 항상 맨 뒤
+        self._order = {}
+        for col in self.sort_columns:
+            values = self.df[col]
+            if pd.api.types.is_numeric_dtype(values.dtype):
+                v = values.to_numpy(dtype='float64')
+                asc = np.argsort(np.where(np.isnan(v), np.inf, v), kind='stable')
+                desc = np.argsort(np.where(np.isnan(v), np.inf, -v), kind='stable')
+            else:
+                codes, _ = pd.factorize(values, sort=True)
+                asc = np.argsort(np.where(codes < 0, np.iinfo('int64').max, codes), kind='stable')
+                desc = np.argsort(np.where(codes < 0, np.iinfo('int64').max, -codes), kind='stable')
+            self._order[col] = (asc, desc)
+
+        self.filters = {}
+        self._filter_codes = {}
+        for col in filter_columns:
+            codes, uniques = pd.factorize(self.df[col], sort=True)
+            self.filters[col] = [str(u) for u in uniques]
+            self._filter_codes[col] = codes
+
+        if search_column is not None:
+            codes, uniques = pd.factorize(self.df[search_column])
+            keys = np.asarray([str(u).lower() for u in uniques])
+            rank = np.empty(len(keys), dtype='int64')
+            key_order = np.argsort(keys, kind='stable')
+            rank[key_order] = np.arange(len(keys))
+            row_rank = rank[codes]
+            self._keys = keys[key_order]
+            self._by_key = np.argsort(row_rank, kind='stable')
+            self._key_bounds = np.searchsorted(row_rank[self._by_key], np.arange(len(keys) + 1))
+        else:
+            self._keys = np.asarray([], dtype=str)
+            self._by_key = np.arange(n)
+            self._key_bounds = np.zeros(1, dtype='int64')
+
+    def __len__(self):
+        return len(self.df)
+
+    def query(self, sort, ascending=True, filters=None):
+        """필터를 통과한 행 위치를 정렬 순서대로 반환."""
+        asc, desc = self._order[sort]
+        order = asc if ascending else desc
+        if not filters:
+            return order
+        mask = np.ones(len(self.df), dtype=bool)
+        for col, values in filters.items():
+            if values:
+                cats = self.filters[col]
+                mask &= np.isin(self._filter_codes[col], [cats.index(v) for v in values if v in cats])
+        return order[mask[order]]
+
+    def match_rows(self, prefix):
+        """검색 컬럼이 prefix 로 시작하는 행 위치 (대소문자 무시)."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return self._by_key[:0]
+        lo = np.searchsorted(self._keys, prefix, side='left')
+        hi = np.searchsorted(self._keys, prefix + '\U0010ffff', side='left')
+        return self._by_key[self._key_bounds[lo]:self._key_bounds[hi]]
+
+    def locate(self, positions, prefix):
+        """positions(현재 정렬·필터) 안에서 prefix 가 처음 나오는 순번, 없으면 None."""
+        rows = self.match_rows(prefix)
+        if not len(rows):
+            return None
+        rank = np.full(len(self.df), len(positions), dtype='int64')
+        rank[positions] = np.arange(len(positions))
+        first = rank[rows].min()
+        return None if first >= len(positions) else int(first)
+
+    def page(self, positions, page, page_size):
+        start = page * page_size
+        return self.df.iloc[positions[start:start + page_size]]
+
+    @staticmethod
+    def page_count(positions, page_size):
+        return max(1, -(-len(positions) // page_size))
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datagen import generate_google, generate_meta  # noqa: E402
+from factstore import FactStore  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def google_facts(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('facts') / 'google.parquet')
+    generate_google(path, accounts=2, keywords=40, days=56)
+    return pq.read_table(path).to_pandas(date_as_object=False)
+
+
+@pytest.fixture(scope='session')
+def meta_facts(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('facts') / 'meta.parquet')
+    generate_meta(path, accounts=2, days=56)
+    return pq.read_table(path).to_pandas(date_as_object=False)
+
+
+@pytest.fixture
+def growing(tmp_path):
+    """df 를 날짜 순 n 조각으로 FactStore 에 차례로 적재 → 적재마다 읽은 팩트 (lineage 포함)."""
+    def load(table, df, n=3):
+        store = FactStore(str(tmp_path / 'store'))
+        days = df['date'].to_numpy().astype('datetime64[D]')
+        cuts = np.array_split(np.unique(days), n)
+        out = []
+        for part in cuts:
+            store.append(table, df[np.isin(days, part)])
+            out.append(store.read(table))
+        return out
+    return load
@@ -0,0 +1,76 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from attribution import MODELS, Attribution, AttributionStore, attribute, read_touchpoints
+from datagen import generate_touchpoints
+
+
+@pytest.fixture(scope='module')
+def touchpoints(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('touch') / 'touchpoints.parquet')
+    generate_touchpoints(path, users=5_000, days=56)
+    return path
+
+
+def _log(rows):
+    df = pd.DataFrame(rows, columns=['user_id', 'ts', 'channel', 'campaign', 'event'])
+    df['ts'] = pd.to_datetime(df['ts'])
+    return df
+
+
+def test_credits_sum_to_attributed_conversions(touchpoints):
+    engine = attribute(read_touchpoints(touchpoints))
+    assert engine.conversions > 0
+    credits = engine.credits()
+    for m in MODELS:
+        assert credits[m].sum() == pytest.approx(engine.conversions - engine.unattributed)
+
+
+def test_batch_size_does_not_change_result(touchpoints):
+    whole = attribute(read_touchpoints(touchpoints)).credits().sort_values(['channel', 'campaign'])
+    small = attribute(read_touchpoints(touchpoints, batch_rows=997)).credits().sort_values(['channel', 'campaign'])
+    pd.testing.assert_frame_equal(whole.reset_index(drop=True), small.reset_index(drop=True))
+
+
+def test_single_path_weights():
+    engine = Attribution(lookback_days=30)
+    engine.feed(_log([
+        (1, '2025-11-01', 'Google', 'g', 'click'),      # 룩백 밖
+        (1, '2025-12-01', 'Meta', 'm1', 'click'),
+        (1, '2025-12-05', 'Google', 'g', 'click'),
+        (1, '2025-12-09', 'Meta', 'm2', 'click'),
+        (1, '2025-12-10', 'Meta', 'm2', 'conversion'),
+        (2, '2025-12-10', 'Meta', 'm1', 'conversion'),   # 터치 없는 전환
+    ]))
+    engine.finish()
+    credits = engine.credits().set_index('campaign')
+    assert engine.conversions == 2
+    assert engine.unattributed == 1
+    assert engine.multi_channel == 1
+    assert credits['last_click'].to_dict() == {'m1': 0.0, 'g': 0.0, 'm2': 1.0}
+    assert credits['linear'].to_dict() == pytest.approx({'m1': 1 / 3, 'g': 1 / 3, 'm2': 1 / 3})
+    assert credits['position_based'].to_dict() == pytest.approx({'m1': 0.4, 'g': 0.2, 'm2': 0.4})
+    assert credits['time_decay']['m2'] > credits['time_decay']['g'] > credits['time_decay']['m1']
+
+
+def test_unsorted_log_is_rejected():
+    engine = Attribution()
+    engine.feed(_log([(1, '2025-12-05', 'Google', 'g', 'click'), (1, '2025-12-01', 'Meta', 'm', 'conversion')]))
+    with pytest.raises(ValueError):
+        engine.finish()
+
+
+def test_store_reuses_engine_until_file_changes(touchpoints, tmp_path):
+    path = str(tmp_path / 'touchpoints.parquet')
+    shutil.copy(touchpoints, path)
+    store = AttributionStore(path)
+    engine = store.sync()
+    assert store.sync() is engine
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert store.sync() is not engine
+    os.remove(path)
+    assert store.sync() is None
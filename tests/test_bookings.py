@@ -0,0 +1,91 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from bookings import BookingStore
+
+SCHEMA = """
+CREATE TABLE leads (lead_id TEXT PRIMARY KEY, click_id TEXT, channel TEXT, campaign TEXT,
+                    ad_group TEXT, asset TEXT, created_at TEXT);
+CREATE TABLE bookings (booking_id TEXT, lead_id TEXT, booked_at TEXT, revenue INTEGER);
+"""
+
+
+def _leads(ids):
+    return [(f'L{i}', f'c{i}', 'Google' if i % 2 else 'Meta', f'camp{i % 3}', f'grp{i % 4}', f'kw{i % 5}',
+             '2025-11-02') for i in ids]
+
+
+def _write(path, leads, bookings, replace=False):
+    if replace and os.path.exists(path):
+        os.remove(path)
+    con = sqlite3.connect(path)
+    if replace or not con.execute("SELECT name FROM sqlite_master WHERE name = 'leads'").fetchone():
+        con.executescript(SCHEMA)
+    con.executemany('INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?, ?)', leads)
+    con.executemany('INSERT INTO bookings VALUES (?, ?, ?, ?)', bookings)
+    con.commit()
+    con.close()
+
+
+def _bookings(lead_ids, start=0):
+    rng = np.random.default_rng(start)
+    return [(f'B{start + j}', f'L{i}', '2025-11-03', int(r)) for j, (i, r) in
+            enumerate(zip(lead_ids, rng.choice([50_000, 80_000, -50_000], len(lead_ids))))]
+
+
+def _state(store):
+    view = store.view('campaign')
+    return store.totals(), view.sort_values(['channel', 'campaign']).reset_index(drop=True)
+
+
+def test_incremental_sync_matches_full_read(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    _write(path, _leads(range(100)), _bookings(range(0, 100, 3)) + _bookings([150, 160], start=500))
+    store = BookingStore(path)
+    assert store.sync() == (100, 36)
+    assert store.pending == 2                   # 리드가 아직 없는 예약은 보류
+    _write(path, _leads(range(100, 200)), _bookings(range(100, 200, 7), start=1000))
+    assert store.sync() == (100, 15)
+    assert store.pending == 0
+
+    full = BookingStore(path)
+    full.sync()
+    (t1, v1), (t2, v2) = _state(store), _state(full)
+    assert t1 == t2
+    pd.testing.assert_frame_equal(v1, v2)
+
+
+def test_replaced_db_starts_over(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    _write(path, _leads(range(50)), _bookings(range(50)))
+    store = BookingStore(path)
+    store.sync()
+    # 다시 만든 DB: 이미 본 리드가 워터마크 뒤 rowid 로 들어온다
+    _write(path, _leads(range(200, 230)) + _leads(range(50)), _bookings(range(50)), replace=True)
+    store.sync()
+    _write(path, [], _bookings([3], start=999))
+    store.sync()
+
+    full = BookingStore(path)
+    full.sync()
+    assert len(store) == len(full) == 80
+    assert store.duplicates == 0
+    assert _state(store)[0] == _state(full)[0]
+
+
+def test_duplicate_lead_ids_are_ignored(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA.replace('lead_id TEXT PRIMARY KEY', 'lead_id TEXT'))
+    con.executemany('INSERT INTO leads VALUES (?, ?, ?, ?, ?, ?, ?)', _leads(range(10)) + _leads([2, 3]))
+    con.executemany('INSERT INTO bookings VALUES (?, ?, ?, ?)', [('B0', 'L2', '2025-11-03', 10_000)])
+    con.commit()
+    con.close()
+    store = BookingStore(path)
+    store.sync()
+    assert len(store) == 10
+    assert store.duplicates == 2
+    assert store.totals()['bookings'] == 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from factstore import FactStore, new_rows
+
+
+def _plain(df):
+    """카테고리 → 문자열, 날짜 해상도 통일 (저장 전후 값 비교용)."""
+    out = df.reset_index(drop=True).copy()
+    for c in out.columns:
+        if isinstance(out[c].dtype, pd.CategoricalDtype) or out[c].dtype == object:
+            out[c] = out[c].astype(str)
+        elif pd.api.types.is_datetime64_any_dtype(out[c].dtype):
+            out[c] = out[c].astype('datetime64[s]')
+    return out
+
+
+def test_round_trip(tmp_path, google_facts):
+    store = FactStore(str(tmp_path))
+    half = len(google_facts) // 2
+    store.append('google', google_facts.iloc[:half])
+    store.append('google', google_facts.iloc[half:])
+    facts = store.read('google')
+    assert facts.attrs['lineage'] == [('part-00000', half), ('part-00001', len(google_facts) - half)]
+    pd.testing.assert_frame_equal(_plain(facts), _plain(google_facts))
+
+
+def test_new_categories_keep_existing_codes(tmp_path):
+    store = FactStore(str(tmp_path))
+    store.append('t', pd.DataFrame({'k': ['a', 'b'], 'v': [1.0, 2.0]}))
+    before = store.column('t', 'k').copy()
+    store.append('t', pd.DataFrame({'k': ['c', 'a'], 'v': [3.0, 4.0]}))
+    assert store.manifest('t')['categories']['k'] == ['a', 'b', 'c']
+    np.testing.assert_array_equal(store.column('t', 'k')[:2], before)
+    assert store.read('t')['k'].astype(str).tolist() == ['a', 'b', 'c', 'a']
+
+
+def test_compact(tmp_path, meta_facts):
+    store = FactStore(str(tmp_path))
+    for part in np.array_split(np.arange(len(meta_facts)), 3):
+        store.append('meta', meta_facts.iloc[part])
+    before = store.read('meta')
+    assert store.compact('meta')
+    after = store.read('meta')
+    assert after.attrs['lineage'] == [('part-00003', len(meta_facts))]
+    assert sorted(p.name for p in (tmp_path / 'meta').iterdir() if p.is_dir()) == ['part-00003']
+    pd.testing.assert_frame_equal(_plain(after), _plain(before))
+    assert not store.compact('meta')
+
+
+def test_new_rows():
+    df = pd.DataFrame({'v': range(10)})
+    df.attrs['lineage'] = [('p0', 4), ('p1', 6)]
+    assert new_rows(df, []) == (0, [('p0', 4), ('p1', 6)])
+    assert new_rows(df, [('p0', 4)]) == (4, [('p0', 4), ('p1', 6)])
+    assert new_rows(df, [('p0', 4), ('p1', 6)])[0] == 10
+    assert new_rows(df, [('p9', 4)])[0] is None           # compact · 교체 → 처음부터
+    plain = pd.DataFrame({'v': range(3)})
+    assert new_rows(plain, []) == (0, [('facts', 3)])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fatigue import KEY_COLUMNS, FatigueModel
+
+
+def _report(model):
+    return model.report().sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+
+def test_incremental_sync_matches_full_recount(meta_facts, growing):
+    steps = growing('meta', meta_facts)
+    inc = FatigueModel()
+    for facts in steps:
+        assert inc.sync(facts) > 0
+    assert inc.sync(steps[-1]) == 0
+    full = FatigueModel()
+    full.sync(steps[-1])
+    pd.testing.assert_frame_equal(_report(inc), _report(full))
+
+
+def test_recovers_known_decay():
+    days = pd.date_range('2025-11-02', periods=60, freq='D')
+    impressions = np.full(len(days), 100_000.0)
+    ctr = 0.02 * np.exp(-0.01 * np.arange(len(days)))      # 주당 약 -6.8%
+    clicks = np.round(impressions * ctr)
+    df = pd.DataFrame({
+        'account': 'account-001', 'adset': 'A', 'creative': 'c1', 'platform': 'Instagram', 'date': days,
+        'impressions': impressions, 'reach': impressions / 2, 'clicks': clicks, 'cost': 10_000.0,
+        'conversions': np.round(clicks * 0.1),
+    })
+    model = FatigueModel()
+    model.sync(df)
+    row = model.report().iloc[0]
+    assert row['ctr_weekly_change'] == pytest.approx(100 * np.expm1(-0.07), abs=0.3)
+    assert row['life_days'] == pytest.approx(np.log(0.75) / -0.01, abs=1)
+    assert row['status'] == '교체 필요'
+    assert row['frequency_now'] == pytest.approx(2.0)
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from datagen import generate_locations
+from geo import REGIONS, GeoStore, resolve
+from metrics import PMAX_CAMPAIGN
+
+
+def _region(name):
+    return tuple(REGIONS.loc[resolve(name), ['sido', 'sigungu']])
+
+
+def test_resolve():
+    assert _region('강남 포장이사') == ('서울특별시', '강남구')
+    assert _region('서울 원룸이사') == ('서울특별시', '')
+    assert _region('moving seoul') == ('서울특별시', '')
+    assert _region('수원 용달') == ('경기도', '수원시')
+    assert resolve('이사') == 0
+
+
+def test_incremental_sync_matches_full_recount(google_facts, growing):
+    steps = growing('google', google_facts)
+    inc = GeoStore(report_path=None)
+    for facts in steps:
+        inc.sync(facts)
+    full = GeoStore(report_path=None)
+    full.sync(steps[-1])
+    a, b = inc.snapshot(), full.snapshot()
+    np.testing.assert_array_equal(a.weeks, b.weeks)
+    np.testing.assert_allclose(a.values, b.values)
+    search = google_facts[google_facts['campaign'] != PMAX_CAMPAIGN]
+    assert a.values[0, :, :, 0].sum() == pytest.approx(search['cost'].sum())
+
+
+def test_week_slices_add_up(google_facts):
+    store = GeoStore(report_path=None)
+    store.sync(google_facts)
+    cube = store.snapshot()
+    half = len(cube.weeks) // 2
+    total = cube.by_sido('search').set_index('region')['cost']
+    parts = (cube.by_sido('search', slice(None, half)).set_index('region')['cost']
+             .add(cube.by_sido('search', slice(half, None)).set_index('region')['cost'], fill_value=0))
+    np.testing.assert_allclose(parts.reindex(total.index), total)
+    assert cube.weekly('search')['cost'].sum() == pytest.approx(total.sum())
+    assert len(cube.weekly('search', weeks=slice(half, None))) == len(cube.weeks) - half
+
+
+def test_location_report_reread_on_change(tmp_path, google_facts):
+    google_path = str(tmp_path / 'google.parquet')
+    google_facts.to_parquet(google_path)
+    report = str(tmp_path / 'locations.parquet')
+    generate_locations(report, google_path)
+    store = GeoStore(report_path=report)
+    store.sync()
+    cost = store.snapshot().values[1, :, :, 0].sum()
+    assert cost == pytest.approx(google_facts['cost'].sum(), rel=0.01)   # 반올림 · 노출 0 행 제외
+    store.sync()
+    assert store.snapshot().values[1, :, :, 0].sum() == pytest.approx(cost)    # 그대로면 다시 더하지 않는다
+    os.remove(report)
+    store.sync()
+    assert not store.snapshot().has('location')
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from metrics import PMAX_CAMPAIGN
+from ngrams import NgramMiner, _grams
+
+BUCKETS = 1 << 16
+
+
+def _table(miner):
+    return miner.table().sort_values(['segment', 'n', 'ngram']).reset_index(drop=True)
+
+
+def test_grams_dedupe_within_term():
+    g = _grams(pd.Series(['포장 이사 포장 이사', '용달']))
+    pairs = sorted(zip(g['term'], g['n'], g['gram']))
+    assert pairs == [(0, 1, '이사'), (0, 1, '포장'), (0, 2, '이사 포장'), (0, 2, '포장 이사'), (1, 1, '용달')]
+
+
+def test_incremental_sync_matches_full_recount(google_facts, growing):
+    steps = growing('google', google_facts)
+    inc = NgramMiner(buckets=BUCKETS)
+    for facts in steps:
+        assert inc.sync(facts) > 0
+    assert inc.sync(steps[-1]) == 0
+    full = NgramMiner(buckets=BUCKETS)
+    full.sync(steps[-1])
+    pd.testing.assert_frame_equal(_table(inc), _table(full))
+    pd.testing.assert_frame_equal(pd.DataFrame(inc.segments).sort_index(axis=1),
+                                  pd.DataFrame(full.segments).sort_index(axis=1))
+
+
+def test_unigram_totals_match_facts(google_facts):
+    miner = NgramMiner(buckets=BUCKETS)
+    miner.sync(google_facts)
+    t = miner.table()
+    assert not t['collided'].any()
+    search = google_facts[google_facts['campaign'] != PMAX_CAMPAIGN]
+    seg, word = search['segment'].iloc[0], str(search['search_term'].iloc[0]).split()[0]
+    rows = search[(search['segment'] == seg) & search['search_term'].astype(str).str.split().map(lambda w: word in w)]
+    got = t[(t['segment'] == seg) & (t['n'] == 1) & (t['ngram'] == word)]
+    assert got['cost'].item() == pytest.approx(rows['cost'].sum())
+    assert got['conversions'].item() == pytest.approx(rows['conversions'].sum())
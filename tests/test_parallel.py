@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+import parallel
+from metrics import PMAX_CAMPAIGN, google_intent_from_facts
+
+
+@pytest.fixture
+def facts(google_facts, meta_facts):
+    return {'google': google_facts, 'meta': meta_facts}
+
+
+def test_process_pool_matches_inline(facts, monkeypatch):
+    inline = parallel.recompute(facts, workers=1)
+    monkeypatch.setattr(parallel, 'INLINE_ROWS', 0)
+    pooled = parallel.recompute(facts, workers=2)
+    assert inline.keys() == pooled.keys() == {'segment', 'campaign', 'adset', 'creative', 'platform'}
+    for dim in inline:
+        pd.testing.assert_frame_equal(inline[dim], pooled[dim])
+
+
+def test_segments_exclude_pmax(facts, google_facts):
+    out = parallel.recompute(facts, workers=1)
+    assert PMAX_CAMPAIGN not in set(out['segment']['segment'])
+    assert PMAX_CAMPAIGN in set(out['campaign']['campaign'])
+    intent = google_intent_from_facts(google_facts)
+    assert out['segment']['cost'].sum() == pytest.approx(intent['cost'].sum())
+    assert out['campaign']['cost'].sum() == pytest.approx(google_facts['cost'].sum())
@@ -0,0 +1,34 @@
+import pytest
+
+from data import GOOGLE_FACTS, META_FACTS
+from refresh import BASELINE_VERSION, RefreshWorker
+
+
+def _boom(ds):
+    raise RuntimeError('boom')
+
+
+@pytest.fixture
+def data_dir(tmp_path, google_facts, meta_facts):
+    google_facts.to_parquet(tmp_path / GOOGLE_FACTS)
+    meta_facts.to_parquet(tmp_path / META_FACTS)
+    return str(tmp_path)
+
+
+def test_failing_derived_report_still_publishes(data_dir):
+    worker = RefreshWorker(data_dir, derived={'rows': lambda ds: len(ds.facts['google']), 'broken': _boom})
+    assert not worker.ready
+    assert worker.refresh_now()
+    ds = worker.current()
+    assert worker.ready
+    assert ds.source == 'facts'
+    assert dict(ds.derived) == {'rows': len(ds.facts['google']), 'broken': None}
+    assert not worker.refresh_now()              # 파일이 그대로면 다시 만들지 않는다
+
+
+def test_baseline_without_facts(tmp_path):
+    worker = RefreshWorker(str(tmp_path), derived={'broken': _boom})
+    assert worker.current().version == BASELINE_VERSION
+    worker.refresh_now()
+    assert worker.ready
+    assert worker.current().derived['broken'] is None
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from tables import TableIndex
+
+
+def _index():
+    df = pd.DataFrame({
+        'keyword': ['포장이사', 'Moving', '용달', '포장 견적', 'move abroad', '원룸이사'],
+        'cost': [300.0, np.nan, 100.0, 300.0, 50.0, np.nan],
+        'segment': ['포장이사', '외국인', None, '포장이사', '외국인', '원룸/소형'],
+        'match_type': ['exact', 'broad', 'exact', 'phrase', 'broad', 'exact'],
+    })
+    return TableIndex(df, ['cost', 'segment'], filter_columns=['match_type'], search_column='keyword')
+
+
+def test_missing_values_sort_last_both_ways():
+    idx = _index()
+    assert idx.query('cost').tolist() == [4, 2, 0, 3, 1, 5]
+    assert idx.query('cost', ascending=False).tolist() == [0, 3, 2, 4, 1, 5]
+    assert idx.query('segment').tolist()[-1] == 2
+    assert idx.query('segment', ascending=False).tolist()[-1] == 2
+
+
+def test_filters_keep_sort_order():
+    idx = _index()
+    assert idx.query('cost', ascending=False, filters={'match_type': ['exact']}).tolist() == [0, 2, 5]
+    assert idx.query('cost', filters={'match_type': ['없는 값']}).tolist() == []
+
+
+def test_prefix_search_and_locate():
+    idx = _index()
+    assert sorted(idx.match_rows('MOV').tolist()) == [1, 4]
+    assert sorted(idx.match_rows('포장').tolist()) == [0, 3]
+    assert idx.match_rows('  ').tolist() == []
+    order = idx.query('cost', ascending=False)
+    assert idx.locate(order, 'mov') == 3
+    assert idx.locate(order, 'zzz') is None
+
+
+def test_paging():
+    idx = _index()
+    order = idx.query('cost')
+    assert idx.page(order, 1, 4).index.tolist() == [1, 5]
+    assert TableIndex.page_count(order, 4) == 2
+    assert TableIndex.page_count(order[:0], 4) == 1
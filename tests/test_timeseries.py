@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from timeseries import downsample, lttb, minmax
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = pd.date_range('2025-11-02', periods=1_000, freq='D').to_numpy()
+    y = np.sin(np.linspace(0, 6 * np.pi, 1_000))
+    y[437] = 10.0
+    idx = lttb(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+    assert 437 in idx
+
+
+def test_lttb_passthrough():
+    assert lttb(np.arange(10), np.arange(10), 50).tolist() == list(range(10))
+    assert lttb(np.arange(10), np.arange(10), 2).tolist() == list(range(10))
+
+
+def test_minmax_never_drops_spikes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10_000)
+    y[1234], y[8765] = 50.0, -50.0
+    y[:10] = np.nan
+    idx = minmax(y, 200)
+    assert {0, 1234, 8765, 9999} <= set(idx.tolist())
+    assert len(idx) <= 202
+
+
+def test_downsample_returns_values():
+    x = np.arange(5_000)
+    y = np.cos(x / 100.0)
+    xs, ys = downsample(x, y, n_out=500)
+    np.testing.assert_array_equal(ys, y[xs])
+    assert len(xs) == 500
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from validation import Validator
+
+
+def _state(validator):
+    out = {}
+    for table, st in validator.state.items():
+        out[table] = (st['rows'], st['bad'], st['schema'], st['sums'].sort_index(), st['days'])
+    return out
+
+
+def _assert_same(a, b):
+    assert a.keys() == b.keys()
+    for table in a:
+        (rows1, bad1, schema1, sums1, days1), (rows2, bad2, schema2, sums2, days2) = a[table], b[table]
+        assert (rows1, bad1, schema1) == (rows2, bad2, schema2)
+        pd.testing.assert_frame_equal(sums1, sums2)
+        np.testing.assert_array_equal(days1, days2)
+
+
+def test_incremental_sync_matches_full_recount(google_facts, meta_facts, growing):
+    google, meta = growing('google', google_facts), growing('meta', meta_facts)
+    inc = Validator()
+    for g, m in zip(google, meta):
+        assert inc.sync({'google': g, 'meta': m}) > 0
+    assert inc.sync({'google': google[-1], 'meta': meta[-1]}) == 0
+    full = Validator()
+    full.sync({'google': google[-1], 'meta': meta[-1]})
+    _assert_same(_state(inc), _state(full))
+    assert inc.fact_report() == full.fact_report() == []
+
+
+def test_bad_rows_and_missing_days(google_facts):
+    days = google_facts['date']
+    bad = google_facts[days != days.min() + pd.Timedelta(days=3)].reset_index(drop=True)
+    bad.loc[0, 'cost'] = -1.0
+    bad.loc[1, 'clicks'] = bad.loc[1, 'impressions'] + 1
+    validator = Validator()
+    validator.sync({'google': bad})
+    found = {(row[1], row[3]) for row in validator.fact_report()}
+    assert ('schema', 'negative') in found
+    assert ('metric', 'clicks > impressions') in found
+    assert ('coverage', str((days.min() + pd.Timedelta(days=3)).date())) in found
+
+
+def test_dropped_table_is_forgotten(google_facts, meta_facts):
+    validator = Validator()
+    validator.sync({'google': google_facts, 'meta': meta_facts})
+    validator.sync({'google': google_facts})
+    assert set(validator.state) == {'google'}
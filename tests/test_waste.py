@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from metrics import PMAX_CAMPAIGN
+from waste import KEY_COLUMNS, WasteTracker
+
+
+def _report(tracker):
+    return tracker.report(zero_conv_cost=0, stale_cost=0).sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+
+def test_incremental_sync_matches_full_recount(google_facts, growing):
+    steps = growing('google', google_facts)
+    inc = WasteTracker(state_path=None)
+    for facts in steps:
+        assert inc.sync(facts) > 0
+    assert inc.sync(steps[-1]) == 0
+    full = WasteTracker(state_path=None)
+    full.sync(steps[-1])
+    pd.testing.assert_frame_equal(_report(inc), _report(full))
+
+
+def test_state_file_resumes(tmp_path, google_facts, growing):
+    steps = growing('google', google_facts)
+    path = str(tmp_path / 'state' / 'waste.npz')
+    first = WasteTracker(state_path=path)
+    first.sync(steps[0])
+    resumed = WasteTracker(state_path=path)
+    assert resumed.lineage == first.lineage
+    assert resumed.sync(steps[-1]) == len(steps[-1]) - len(steps[0])
+    full = WasteTracker(state_path=None)
+    full.sync(steps[-1])
+    pd.testing.assert_frame_equal(_report(resumed), _report(full))
+
+
+def test_replaced_facts_start_over(google_facts, growing):
+    steps = growing('google', google_facts)
+    tracker = WasteTracker(state_path=None)
+    tracker.sync(steps[-1])
+    replaced = steps[0].copy()
+    replaced.attrs['lineage'] = [('google.parquet:1:2', len(replaced))]
+    assert tracker.sync(replaced) == len(replaced)
+    full = WasteTracker(state_path=None)
+    full.sync(steps[0])
+    pd.testing.assert_frame_equal(_report(tracker), _report(full))
+
+
+def test_totals_match_facts(google_facts):
+    tracker = WasteTracker(state_path=None)
+    tracker.sync(google_facts)
+    search = google_facts[google_facts['campaign'] != PMAX_CAMPAIGN]
+    assert tracker.arrays['cost'].sum() == pytest.approx(search['cost'].sum())
+    assert len(tracker) == len(search.groupby(KEY_COLUMNS, observed=True))
+
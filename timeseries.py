@@ -0,0 +1,154 @@
+"""
+이사대학 마케팅 분석 — 시계열 차트
+Downsampled line charts: LTTB / min-max per series, WebGL above a point budget.
+
+주간 13포인트 차트는 그대로 그리지만, 일 단위 × 수년 × 수백 시리즈가 되면
+figure JSON 이 수 MB 가 된다. line_figure 는 px.line 과 같은 long-format 입력을
+받아 시리즈마다 화면 폭에 맞는 점 수로 줄이고(LTTB 또는 min/max), 전체 점 수가
+WEBGL_POINTS 를 넘으면 Scattergl 로 바꾼다.
+
+Streamlit 은 plotly 줌(relayout) 이벤트를 서버로 보내지 않으므로, 확대는 날짜
+구간 입력으로 대신한다. DailySeries 가 (시리즈 × 일) 행렬을 미리 만들어 두고
+구간을 자르면, 좁은 구간일수록 원본 해상도에 가까운 점이 다시 그려진다.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+MAX_POINTS = 800        # 시리즈당 점 수 (차트 폭 px 정도)
+TOTAL_POINTS = 60_000   # 차트 전체 점 수 상한 — 시리즈가 많으면 시리즈당 점 수를 줄인다
+MIN_POINTS = 100
+WEBGL_POINTS = 5_000    # 전체 점 수가 이보다 많으면 Scattergl
+LTTB_POINTS = 20_000    # LTTB 는 버킷 단위 루프 — 출력 점이 이보다 많으면 벡터화된 min/max 사용
+
+
+# ═══════════════════════════════════════════════
+# Downsampling
+# ═══════════════════════════════════════════════
+def _numeric_x(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    if np.issubdtype(x.dtype, np.number):
+        return x.astype('float64')
+    return np.arange(len(x), dtype='float64')
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets — 모양을 보존하는 점 n_out 개의 위치."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _numeric_x(x)
+    y = np.nan_to_num(np.asarray(y, dtype='float64'))
+    # 첫·끝 점은 고정, 사이를 n_out - 2 개 버킷으로
+    bounds = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    idx = np.empty(n_out, dtype='int64')
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        nlo, nhi = (bounds[i + 1], bounds[i + 2]) if i + 2 < len(bounds) else (n - 1, n)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def minmax(y, n_out):
+    """버킷마다 최솟값·최댓값 위치 — 스파이크를 절대 놓치지 않는다."""
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = n_out // 2
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = np.asarray(y, dtype='float64')
+    blocks = padded.reshape(buckets, size)
+    valid = ~np.all(np.isnan(blocks), axis=1)
+    offsets = np.arange(buckets)[valid] * size
+    lo = offsets + np.nanargmin(blocks[valid], axis=1)
+    hi = offsets + np.nanargmax(blocks[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+
+def downsample(x, y, n_out=MAX_POINTS, method='lttb'):
+    idx = lttb(x, y, n_out) if method == 'lttb' else minmax(y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+# ═══════════════════════════════════════════════
+# Figure
+# ═══════════════════════════════════════════════
+def line_figure(df, x, y, color, color_discrete_map=None, markers=False,
+                max_points=MAX_POINTS, method='auto'):
+    """px.line(df, x, y, color=...) 대응 — 시리즈별 다운샘플 + 필요 시 WebGL."""
+    color_discrete_map = color_discrete_map or {}
+    series = [(name, g[x].to_numpy(), g[y].to_numpy()) for name, g in df.groupby(color, sort=False, observed=True)]
+    n_out = max(MIN_POINTS, min(max_points, TOTAL_POINTS // max(len(series), 1)))
+    if method == 'auto':
+        method = 'lttb' if n_out * len(series) <= LTTB_POINTS else 'minmax'
+    sampled = [(name,) + downsample(xs, ys, n_out, method) for name, xs, ys in series]
+    total = sum(len(xs) for _, xs, _ in sampled)
+    trace = go.Scattergl if total > WEBGL_POINTS else go.Scatter
+    # 점이 많으면 마커는 생략 (선만)
+    mode = 'lines+markers' if markers and total <= WEBGL_POINTS else 'lines'
+    palette = iter(['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880'] * 64)
+    fig = go.Figure()
+    for name, xs, ys in sampled:
+        fig.add_trace(trace(
+            x=xs, y=ys, name=str(name), mode=mode,
+            line=dict(color=color_discrete_map.get(name) or next(palette)),
+            hovertemplate=f'{color}={name}<br>{x}=%{{x}}<br>{y}=%{{y:,}}<extra></extra>',
+        ))
+    fig.update_layout(legend_title_text=color)
+    return fig
+
+
+# ═══════════════════════════════════════════════
+# Daily series (zoom re-query)
+# ═══════════════════════════════════════════════
+class DailySeries:
+    """(시리즈 × 일) 합계 행렬 — 구간을 자를 때마다 원본 일 단위 해상도로 다시 그린다."""
+
+    def __init__(self, dates, labels, measures):
+        self.dates = dates
+        self.labels = list(labels)
+        self.measures = measures
+
+    @classmethod
+    def from_facts(cls, facts, dim, measures=('cost', 'conversions')):
+        days = facts['date'].to_numpy().astype('datetime64[D]')
+        first = days.min()
+        day = (days - first).astype('int64')
+        n_days = int(day.max()) + 1
+        codes, labels = pd.factorize(facts[dim], sort=True)
+        flat = codes.astype('int64') * n_days + day
+        matrices = {
+            m: np.bincount(flat, weights=facts[m].to_numpy(dtype='float64'), minlength=len(labels) * n_days).reshape(len(labels), n_days)
+            for m in measures
+        }
+        return cls(first + np.arange(n_days), [str(l) for l in labels], matrices)
+
+    def window(self, start=None, end=None):
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'D'), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'D'), side='right'))
+        return slice(lo, hi)
+
+    def frame(self, metric, start=None, end=None, series=None):
+        """long-format DataFrame (date, 시리즈, 값) — 'cpl' 은 비용 / 전환."""
+        sl = self.window(start, end)
+        rows = [i for i, l in enumerate(self.labels) if series is None or l in series]
+        if metric == 'cpl':
+            cost, conv = self.measures['cost'][rows, sl], self.measures['conversions'][rows, sl]
+            values = np.divide(cost, conv, out=np.full_like(cost, np.nan), where=conv > 0)
+        else:
+            values = self.measures[metric][rows, sl]
+        dates = self.dates[sl]
+        return pd.DataFrame({
+            'date': np.tile(dates, len(rows)),
+            'series': np.repeat([self.labels[i] for i in rows], len(dates)),
+            metric: values.ravel(),
+        })
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+이사대학 마케팅 분석 — 데이터 정합성 검증
+Vectorized reconciliation of dashboard tables and fact partitions before a version goes live.
+
+검사 네 가지
+  schema     테이블 · 팩트 컬럼과 숫자 타입, 측정값의 결측 · 음수
+  totals     합계 vs 분해 (예: google_campaign 비용 합 vs GOOGLE_SPEND, 롤업 합 vs 팩트 합)
+  metric     cpl == rint(cost / conv), clicks ≤ impressions, reach ≤ impressions 등
+  coverage   주간 테이블의 주차 누락 · 중간 공백, 팩트의 빠진 날짜, 주차 라벨 vs 날짜
+
+집계 테이블은 몇십 행이라 매번 전부 본다. 팩트의 행 단위 검사는 factstore.new_rows
+lineage 워터마크로 새 파티션만 보고 (불량 행 수 · 합계 · 날짜를 누적), 합계 검사는
+누적한 팩트 합계와 롤업을 비교하므로 증분 적재마다 새 행 수에 비례하는 비용만 든다.
+
+허용 오차를 넘으면 severity 'error' — 팩트에서 나온 버전이면 RefreshWorker 가 그 버전을
+올리지 않고 직전 버전을 계속 서비스한다. data.py 의 손으로 옮긴 보고서 수치끼리 안 맞는
+건 'warning' 으로만 남긴다 (베이스라인은 되돌아갈 버전이 없다).
+
+    python validation.py                   # 현재 데이터 디렉터리 검증, error 가 있으면 exit 1
+    python validation.py --data-dir /data/moveuniv --all
+"""
+
+import argparse
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import (
+    BASELINE_TABLES, DATA_DIR, GOOGLE_CONV, GOOGLE_SPEND, META_CONV, META_SPEND,
+    REPORT_PERIOD, TOTAL_CONV, TOTAL_SPEND,
+)
+from factstore import new_rows
+from metrics import GOOGLE_FACT_COLUMNS, META_FACT_COLUMNS, PMAX_CAMPAIGN, safe_cpl, week_label
+
+TOTAL_TOLERANCE = 0.005      # 합계 vs 분해: 상대 오차 (+ 합친 행마다 반올림 0.5)
+CPL_TOLERANCE = 0.01         # cpl vs rint(cost / conv): 상대 오차 (+ 1원)
+ROW_TOLERANCE = 0.0          # 팩트 불량 행 비율 — 결측 · 음수 · 라벨 불일치는 한 행도 안 된다
+VIEW_THROUGH_TOLERANCE = 0.01   # 전환 > 클릭 은 조회 후 전환일 수 있어 1% 까지 허용
+SEVERITY_ORDER = ['error', 'warning']
+REPORT_COLUMNS = ['severity', 'check', 'table', 'key', 'detail', 'expected', 'actual', 'diff', 'tolerance']
+
+FACT_COLUMNS = {'google': GOOGLE_FACT_COLUMNS, 'meta': META_FACT_COLUMNS}
+FACT_MEASURES = {
+    'google': ['impressions', 'clicks', 'cost', 'conversions'],
+    'meta': ['impressions', 'reach', 'clicks', 'cost', 'conversions'],
+}
+FACT_GROUP = {'google': 'campaign', 'meta': 'platform'}   # 팩트 합계를 누적할 단위
+
+# 테이블 → (비용, 전환, CPL) 컬럼
+CPL_COLUMNS = {
+    'google_intent': ('cost', 'conversions', 'cpl'),
+    'google_campaign': ('비용', '전환', 'CPL'),
+    'pmax_asset': ('비용', '전환', 'CPL'),
+    'meta_adset': ('비용', '전환', 'CPL'),
+    'meta_plat_month': ('비용', '전환', 'CPL'),
+    'google_campaign_weekly': ('cost', 'conv', 'cpl'),
+}
+# 주간 테이블 → 엔티티 컬럼
+WEEKLY_TABLES = {
+    'google_campaign_weekly': 'campaign',
+    'google_intent_weekly': 'segment',
+    'meta_platform_weekly': 'platform',
+    'meta_adset_weekly': 'adset',
+}
+
+
+def _kinds(df):
+    return {c: 'num' if pd.api.types.is_numeric_dtype(df[c]) else 'str' for c in df.columns}
+
+
+# 대시보드가 기대하는 스키마 = data.py 테이블의 컬럼 · 타입 (롤업도 같은 스키마로 만든다)
+SCHEMAS = {name: _kinds(df) for name, df in BASELINE_TABLES.items()}
+
+
+# ═══════════════════════════════════════════════
+# Reconciliations (합계 vs 분해)
+# ═══════════════════════════════════════════════
+def _sum(table, col, by=None, where=None):
+    def fn(ds, facts):
+        df = ds[table]
+        if where is not None:
+            df = df[where(df)]
+        if by is None:
+            return pd.Series({'': df[col].sum()}), len(df)
+        return df.groupby(by)[col].sum().rename(str), len(df)
+    return fn
+
+
+def _const(value):
+    return lambda ds, facts: (pd.Series({'': value}), 0)
+
+
+def _fact_sum(table, col, where=None):
+    """Validator 가 누적한 팩트 합계 (FACT_GROUP 단위) — 팩트를 다시 훑지 않는다."""
+    def fn(ds, facts):
+        sums = facts[table]['sums']
+        if where is not None:
+            sums = sums[where(sums.index.to_series())]
+        return pd.Series({'': sums[col].sum()}), 0
+    return fn
+
+
+def _fact_by(table, col):
+    return lambda ds, facts: (facts[table]['sums'][col].rename(str), 0)
+
+
+# (검사 이름, 참조 테이블, 왼쪽, 오른쪽, 'equal' | 'subset')
+# 'subset' 은 왼쪽이 오른쪽의 일부 (키워드 보고서 ⊂ 검색 캠페인) — 넘칠 때만 불일치
+LITERAL_TOTALS = [
+    ('google_campaign 비용 = GOOGLE_SPEND', ['google_campaign'], _sum('google_campaign', '비용'), _const(GOOGLE_SPEND), 'equal'),
+    ('google_campaign 전환 = GOOGLE_CONV', ['google_campaign'], _sum('google_campaign', '전환'), _const(GOOGLE_CONV), 'equal'),
+    ('google_campaign_weekly 비용 = GOOGLE_SPEND', ['google_campaign_weekly'],
+     _sum('google_campaign_weekly', 'cost'), _const(GOOGLE_SPEND), 'equal'),
+    ('google_campaign_weekly 전환 = GOOGLE_CONV', ['google_campaign_weekly'],
+     _sum('google_campaign_weekly', 'conv'), _const(GOOGLE_CONV), 'equal'),
+    ('캠페인별 주간 비용 합 = google_campaign 비용', ['google_campaign_weekly', 'google_campaign'],
+     _sum('google_campaign_weekly', 'cost', by='campaign'), _sum('google_campaign', '비용', by='캠페인'), 'equal'),
+    ('pmax_asset 비용 = PMax 캠페인 비용', ['pmax_asset', 'google_campaign'],
+     _sum('pmax_asset', '비용'), _sum('google_campaign', '비용', where=lambda d: d['캠페인'] == PMAX_CAMPAIGN), 'equal'),
+    ('google_intent 비용 ⊂ 검색 캠페인 비용', ['google_intent', 'google_campaign_weekly'],
+     _sum('google_intent', 'cost'), _sum('google_campaign_weekly', 'cost', where=lambda d: d['campaign'] != PMAX_CAMPAIGN), 'subset'),
+    ('meta_plat_month 비용 = META_SPEND', ['meta_plat_month'], _sum('meta_plat_month', '비용'), _const(META_SPEND), 'equal'),
+    ('meta_plat_month 전환 = META_CONV', ['meta_plat_month'], _sum('meta_plat_month', '전환'), _const(META_CONV), 'equal'),
+    ('meta_adset 비용 = META_SPEND', ['meta_adset'], _sum('meta_adset', '비용'), _const(META_SPEND), 'equal'),
+    ('meta_adset 전환 = META_CONV', ['meta_adset'], _sum('meta_adset', '전환'), _const(META_CONV), 'equal'),
+    ('meta_creative_month 전환 ⊂ META_CONV', ['meta_creative_month'],
+     _sum('meta_creative_month', '전환'), _const(META_CONV), 'subset'),
+    ('GOOGLE_SPEND + META_SPEND = TOTAL_SPEND', [], _const(GOOGLE_SPEND + META_SPEND), _const(TOTAL_SPEND), 'equal'),
+    ('GOOGLE_CONV + META_CONV = TOTAL_CONV', [], _const(GOOGLE_CONV + META_CONV), _const(TOTAL_CONV), 'equal'),
+]
+
+# 롤업 vs 누적 팩트 합계 — 팩트가 있는 채널만
+FACT_TOTALS = [
+    ('google', '캠페인별 주간 비용 합 = 팩트 비용', ['google_campaign_weekly'],
+     _sum('google_campaign_weekly', 'cost', by='campaign'), _fact_by('google', 'cost'), 'equal'),
+    ('google', '캠페인별 주간 전환 합 = 팩트 전환', ['google_campaign_weekly'],
+     _sum('google_campaign_weekly', 'conv', by='campaign'), _fact_by('google', 'conversions'), 'equal'),
+    ('google', 'google_intent 비용 = 검색 팩트 비용', ['google_intent'],
+     _sum('google_intent', 'cost'), _fact_sum('google', 'cost', where=lambda k: k != PMAX_CAMPAIGN), 'equal'),
+    ('google', 'google_intent 전환 = 검색 팩트 전환', ['google_intent'],
+     _sum('google_intent', 'conversions'), _fact_sum('google', 'conversions', where=lambda k: k != PMAX_CAMPAIGN), 'equal'),
+    ('meta', 'meta_adset 비용 = 팩트 비용', ['meta_adset'], _sum('meta_adset', '비용'), _fact_sum('meta', 'cost'), 'equal'),
+    ('meta', 'meta_adset 전환 = 팩트 전환', ['meta_adset'], _sum('meta_adset', '전환'), _fact_sum('meta', 'conversions'), 'equal'),
+]
+
+
+# ═══════════════════════════════════════════════
+# Incremental fact checks
+# ═══════════════════════════════════════════════
+def _row_checks(table, batch):
+    """새 파티션 → {검사: 불량 행 수} (전부 컬럼 단위 배열 연산)."""
+    measures = FACT_MEASURES[table]
+    values = {c: batch[c].to_numpy(dtype='float64', na_value=np.nan) for c in measures}
+    out = {
+        'null': int(batch[FACT_COLUMNS[table]].isna().any(axis=1).sum()),
+        'negative': int(np.logical_or.reduce([values[c] < 0 for c in measures]).sum()),
+        'clicks > impressions': int((values['clicks'] > values['impressions']).sum()),
+        'conversions > clicks': int((values['conversions'] > values['clicks']).sum()),
+    }
+    if 'reach' in values:
+        out['reach > impressions'] = int((values['reach'] > values['impressions']).sum())
+    # 주차 라벨 vs 날짜: (날짜, 라벨) 고유 쌍만 비교
+    date_codes, dates = pd.factorize(batch['date'])
+    week_codes, weeks = pd.factorize(batch['week'])
+    pair = date_codes.astype('int64') * (len(weeks) + 1) + week_codes
+    uniq, counts = np.unique(pair, return_counts=True)
+    d, w = np.divmod(uniq, len(weeks) + 1)
+    ok = (d >= 0) & (w >= 0)
+    expected = week_label(dates[d[ok]])
+    out['week label'] = int(counts[ok][expected != np.asarray(weeks, dtype=object)[w[ok]].astype(str)].sum())
+    return out
+
+
+ROW_TOLERANCES = {'conversions > clicks': VIEW_THROUGH_TOLERANCE}
+ROW_CHECK_KINDS = {'null': 'schema', 'negative': 'schema', 'week label': 'coverage'}   # 나머지는 metric
+
+
+class Validator:
+    """팩트 테이블별 불량 행 수 · 합계 · 날짜를 파티션 단위로 누적한다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = {}
+
+    def _empty(self, table):
+        return {'lineage': [], 'rows': 0, 'bad': {}, 'schema': [],
+                'sums': pd.DataFrame(columns=FACT_MEASURES[table], dtype='float64'),
+                'days': np.zeros(0, dtype='datetime64[D]')}
+
+    def sync(self, facts):
+        """팩트 dict 전체를 받아 아직 안 본 파티션만 검사 (factstore.new_rows 워터마크)."""
+        added = 0
+        with self._lock:
+            for table, df in facts.items():
+                if table not in FACT_COLUMNS:
+                    continue
+                st = self.state.get(table)
+                start, lineage = new_rows(df, st['lineage'] if st else [])
+                if st is None or start is None:
+                    st = self.state[table] = self._empty(table)
+                    start = 0
+                if start < len(df):
+                    self.update(table, st, df.iloc[start:])
+                    added += len(df) - start
+                st['lineage'] = lineage
+            for table in set(self.state) - set(facts):
+                del self.state[table]
+        return added
+
+    def update(self, table, st, batch):
+        missing = [c for c in FACT_COLUMNS[table] if c not in batch.columns]
+        st['schema'] = missing or [c for c in FACT_MEASURES[table] if not pd.api.types.is_numeric_dtype(batch[c])]
+        st['rows'] += len(batch)
+        if st['schema']:
+            return
+        for check, n in _row_checks(table, batch).items():
+            st['bad'][check] = st['bad'].get(check, 0) + n
+        group = FACT_GROUP[table]
+        sums = batch.groupby(batch[group].astype(str), observed=True)[FACT_MEASURES[table]].sum()
+        st['sums'] = sums if st['sums'].empty else st['sums'].add(sums, fill_value=0)
+        st['days'] = np.union1d(st['days'], pd.unique(batch['date'].to_numpy().astype('datetime64[D]')))
+
+    # ─── report ───
+    def fact_report(self):
+        rows = []
+        for table, st in self.state.items():
+            for col in st['schema']:
+                rows.append(('error', 'schema', f'facts:{table}', col, 'missing or non-numeric', np.nan, np.nan, np.nan, 0.0))
+            for check, bad in st['bad'].items():
+                tol = ROW_TOLERANCES.get(check, ROW_TOLERANCE)
+                if bad > tol * st['rows']:
+                    rows.append(('error', ROW_CHECK_KINDS.get(check, 'metric'), f'facts:{table}', check, 'bad rows',
+                                 tol * st['rows'], bad, bad / max(st['rows'], 1), tol))
+            days = st['days']
+            if len(days):
+                span = np.arange(days[0], days[-1] + np.timedelta64(1, 'D'))
+                for day in np.setdiff1d(span, days):
+                    rows.append(('error', 'coverage', f'facts:{table}', str(day), 'no rows', np.nan, 0, np.nan, 0.0))
+        return rows
+
+    def weeks(self):
+        """팩트가 덮는 날짜 범위의 주차 라벨 (주간 테이블 커버리지 기준)."""
+        days = [st['days'] for st in self.state.values() if len(st['days'])]
+        if not days:
+            return None
+        lo = min(d[0] for d in days)
+        hi = max(d[-1] for d in days)
+        return _period_weeks(lo, hi)
+
+
+# ═══════════════════════════════════════════════
+# Table checks
+# ═══════════════════════════════════════════════
+def _period_weeks(start, end, year=True):
+    return list(dict.fromkeys(week_label(pd.date_range(start, end, freq='D'), year=year)))
+
+
+def _schema(name, df, severity):
+    rows = []
+    for col, kind in SCHEMAS.get(name, {}).items():
+        if col not in df.columns:
+            rows.append((severity, 'schema', name, col, f'missing ({kind})', np.nan, np.nan, np.nan, 0.0))
+        elif kind == 'num':
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                rows.append((severity, 'schema', name, col, f'dtype {df[col].dtype}', np.nan, np.nan, np.nan, 0.0))
+            else:
+                bad = int((df[col].isna() | (df[col] < 0)).sum())
+                if bad:
+                    rows.append((severity, 'schema', name, col, 'null or negative', 0, bad, np.nan, 0.0))
+    return rows
+
+
+def _cpl(name, df, severity):
+    cost, conv, cpl = CPL_COLUMNS[name]
+    if not {cost, conv, cpl} <= set(df.columns):
+        return []
+    expected = safe_cpl(df[cost], df[conv])
+    actual = df[cpl].to_numpy(dtype='float64')
+    diff = actual - expected
+    bad = np.abs(diff) > np.maximum(1.0, CPL_TOLERANCE * np.abs(expected))
+    key = df.loc[bad].iloc[:, 0].astype(str).to_numpy()
+    if 'week' in df.columns:
+        key = key + ' / ' + df.loc[bad, 'week'].astype(str).to_numpy()
+    return [(severity, 'metric', name, k, cpl, e, a, d, CPL_TOLERANCE)
+            for k, e, a, d in zip(key, expected[bad], actual[bad], diff[bad] / np.maximum(expected[bad], 1))]
+
+
+def _coverage(name, df, weeks, severity):
+    entity = WEEKLY_TABLES[name]
+    if not {entity, 'week'} <= set(df.columns):
+        return []
+    rows = [(severity, 'coverage', name, w, 'week missing', np.nan, np.nan, np.nan, 0.0)
+            for w in weeks if w not in set(df['week'])]
+    # 엔티티의 첫 주 ~ 마지막 주 사이에 빠진 주 (앞뒤로 끝난 건 집행 기간 차이라 제외)
+    order = {w: i for i, w in enumerate(weeks)}
+    pos = df['week'].map(order)
+    grid = pd.crosstab(df[entity], pos)
+    grid = grid.reindex(columns=range(len(weeks)), fill_value=0) > 0
+    seen = grid.to_numpy()
+    inside = np.maximum.accumulate(seen, axis=1) & np.maximum.accumulate(seen[:, ::-1], axis=1)[:, ::-1]
+    for i, j in zip(*np.nonzero(inside & ~seen)):
+        rows.append((severity, 'coverage', name, f'{grid.index[i]} / {weeks[j]}', 'gap', np.nan, np.nan, np.nan, 0.0))
+    return rows
+
+
+def _totals(name, tables, left, right, kind, ds, facts, severity):
+    lhs, n = left(ds, facts)
+    rhs, _ = right(ds, facts)
+    lhs, rhs = lhs.align(rhs, fill_value=0)
+    lhs, rhs = lhs.astype('float64'), rhs.astype('float64')
+    diff = lhs - rhs
+    allowed = TOTAL_TOLERANCE * rhs.abs() + 0.5 * n
+    bad = diff > allowed if kind == 'subset' else diff.abs() > allowed
+    table = tables[0] if tables else 'data.py'
+    return [(severity, 'totals', table, f'{name}' + (f' [{k}]' if k else ''), kind, rhs[k], lhs[k],
+             diff[k] / max(abs(rhs[k]), 1), TOTAL_TOLERANCE) for k in diff.index[bad]]
+
+
+def validate(ds, validator=None):
+    """Dataset → 불일치 리포트 DataFrame (REPORT_COLUMNS). 팩트에서 나온 테이블의 위반만 'error'."""
+    from_facts = {name for name, df in ds.tables.items() if BASELINE_TABLES.get(name) is not df}
+    level = lambda names: 'error' if from_facts & set(names) else 'warning'
+    rows = []
+    facts = {}
+    if validator is not None and ds.facts:
+        validator.sync(ds.facts)
+        facts = validator.state
+        rows += validator.fact_report()
+    fact_weeks = validator.weeks() if facts else None
+
+    for name, df in ds.tables.items():
+        rows += _schema(name, df, level([name]))
+        if name in CPL_COLUMNS:
+            rows += _cpl(name, df, level([name]))
+        if name in WEEKLY_TABLES:
+            weeks = fact_weeks if name in from_facts and fact_weeks else _period_weeks(*REPORT_PERIOD, year=False)
+            rows += _coverage(name, df, weeks, level([name]))
+
+    for check in LITERAL_TOTALS:
+        # 팩트 롤업으로 바뀐 테이블은 보고서 수치와 비교하지 않는다
+        if not from_facts & set(check[1]):
+            rows += _totals(*check, ds, facts, 'warning')
+    for table, *check in FACT_TOTALS:
+        if table in facts and set(check[1]) <= from_facts:
+            rows += _totals(*check, ds, facts, 'error')
+
+    report = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+    report['severity'] = pd.Categorical(report['severity'], categories=SEVERITY_ORDER, ordered=True)
+    return report.sort_values(['severity', 'check', 'table'], kind='stable').reset_index(drop=True)
+
+
+def blocking(report):
+    return bool((report['severity'] == 'error').any())
+
+
+class ValidationError(ValueError):
+    """허용 오차를 넘은 데이터 버전 — report 에 불일치 목록."""
+
+    def __init__(self, version, report):
+        errors = report[report['severity'] == 'error']
+        super().__init__(f'dataset {version}: {len(errors)} validation errors '
+                         f'({", ".join(sorted(set(errors["check"])))})')
+        self.version = version
+        self.report = report
+
+
+# ═══════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════
+def main(argv=None):
+    from refresh import build_dataset
+
+    parser = argparse.ArgumentParser(description='데이터 정합성 검증 (error 가 있으면 exit 1)')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--all', action='store_true', help='warning 까지 출력')
+    args = parser.parse_args(argv)
+
+    try:
+        ds = build_dataset(args.data_dir, validator=Validator())
+        report = ds.validation
+    except ValidationError as e:
+        report = e.report
+    shown = report if args.all else report[report['severity'] == 'error']
+    with pd.option_context('display.width', 200, 'display.max_rows', None, 'display.max_colwidth', 60):
+        print(shown.to_string(index=False) if len(shown) else 'no discrepancies')
+    counts = report['severity'].value_counts()
+    print(f"\n{counts.get('error', 0)} errors, {counts.get('warning', 0)} warnings")
+    return 1 if blocking(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
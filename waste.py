@@ -0,0 +1,183 @@
+"""
+이사대학 마케팅 분석 — 0전환 키워드 낭비 탐지
+Incremental per-keyword spend / conversion counters with a partition watermark.
+
+키워드(계정 × 캠페인 × 세그먼트 × 키워드 × 매치유형)마다 누적 비용·클릭·전환과
+'마지막 전환 이후 비용'을 들고 있다가, 새로 들어온 행만 더한다. 팩트 DataFrame 의
+attrs['lineage'] (파티션 이름, 행 수) 목록이 이전에 처리한 목록으로 시작하면 뒤에
+붙은 파티션만 읽고, 아니면(compact · Parquet 재생성) 처음부터 다시 센다.
+새 파티션은 기존보다 최신 날짜라고 가정한다 (적재 순서 = 시간 순서).
+
+상태는 data/state/waste.npz 에 저장해 프로세스를 다시 띄워도 이어서 센다.
+"""
+
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data import DATA_DIR, SEARCH_CPL
+from factstore import new_rows
+from metrics import PMAX_CAMPAIGN
+
+STATE_PATH = os.path.join(DATA_DIR, 'state', 'waste.npz')
+KEY_COLUMNS = ['account', 'campaign', 'segment', 'keyword', 'match_type']
+SEP = '\x1f'
+
+# 전환 없이 검색 평균 CPL 만큼 쓰면 '전환 0', 평균 CPL 2배를 마지막 전환 이후 쓰면 '장기 미전환'
+ZERO_CONV_COST = SEARCH_CPL
+STALE_COST = SEARCH_CPL * 2
+DAYS_PER_MONTH = 30.4
+# 데이터 마지막 날 기준 이 기간 동안 지출이 없던 키워드는 이미 멈춘 것 — 절감액에서 뺀다
+ACTIVE_DAYS = 14
+
+log = logging.getLogger(__name__)
+
+_COUNTERS = ['cost', 'clicks', 'conversions', 'cost_since_conv']
+_DAYS = ['first_day', 'last_day', 'last_conv_day']   # epoch day (int64), 전환 없으면 -1
+
+
+class WasteTracker:
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._reset()
+        if state_path and os.path.exists(state_path):
+            self._load()
+
+    def _reset(self):
+        self.lineage = []
+        self.keys = []
+        self._index = {}
+        self.arrays = {c: np.zeros(0) for c in _COUNTERS}
+        self.arrays.update({c: np.zeros(0, dtype='int64') for c in _DAYS})
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ─── state ───
+    def _load(self):
+        with np.load(self.state_path, allow_pickle=False) as z:
+            self.keys = list(z['keys'])
+            self.lineage = [(str(n), int(r)) for n, r in zip(z['lineage_names'], z['lineage_rows'])]
+            self.arrays = {c: z[c].copy() for c in _COUNTERS + _DAYS}
+        self._index = {k: i for i, k in enumerate(self.keys)}
+
+    def save(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = f'{self.state_path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp, keys=np.asarray(self.keys, dtype=str),
+                 lineage_names=np.asarray([n for n, _ in self.lineage], dtype=str),
+                 lineage_rows=np.asarray([r for _, r in self.lineage], dtype='int64'),
+                 **self.arrays)
+        os.replace(tmp, self.state_path)
+
+    # ─── update ───
+    def sync(self, facts):
+        """팩트 전체를 받아 아직 안 센 파티션만 반영. 새로 센 행 수를 반환."""
+        if facts is None:
+            return 0
+        with self._lock:
+            start, lineage = new_rows(facts, self.lineage)
+            if start is None:
+                self._reset()
+                start = 0
+            if start >= len(facts):
+                return 0
+            self.update(facts.iloc[start:])
+            self.lineage = lineage
+            try:
+                self.save()
+            except OSError:  # 읽기 전용 데이터 디렉터리 — 메모리 상태로 계속
+                log.warning('waste state not saved to %s', self.state_path, exc_info=True)
+            return len(facts) - start
+
+    def _ids(self, batch):
+        """배치 행 → 키 번호 (처음 보는 키는 뒤에 추가). 문자열 작업은 배치 안 고유 조합만."""
+        codes, uniques = zip(*(pd.factorize(batch[c]) for c in KEY_COLUMNS))
+        combined = np.zeros(len(batch), dtype='int64')
+        for c, u in zip(codes, uniques):
+            combined = combined * len(u) + c
+        combos, inverse = np.unique(combined, return_inverse=True)
+        ids = np.empty(len(combos), dtype='int64')
+        for j, combo in enumerate(combos):
+            parts = []
+            for u in reversed(uniques):
+                combo, r = divmod(combo, len(u))
+                parts.append(str(u[r]))
+            key = SEP.join(reversed(parts))
+            i = self._index.get(key)
+            if i is None:
+                i = self._index[key] = len(self.keys)
+                self.keys.append(key)
+            ids[j] = i
+        n = len(self.keys)
+        for c in _COUNTERS:
+            self.arrays[c] = np.concatenate([self.arrays[c], np.zeros(n - len(self.arrays[c]))])
+        for c in _DAYS:
+            grow = n - len(self.arrays[c])
+            self.arrays[c] = np.concatenate([self.arrays[c], np.full(grow, -1, dtype='int64')])
+        return ids[inverse]
+
+    def update(self, batch):
+        batch = batch[batch['campaign'] != PMAX_CAMPAIGN]   # PMax 애셋그룹은 키워드가 아니다
+        if not len(batch):
+            return
+        ids = self._ids(batch)
+        n = len(self.keys)
+        a = self.arrays
+        day = batch['date'].to_numpy().astype('datetime64[D]').astype('int64')
+        cost = batch['cost'].to_numpy(dtype='float64')
+        conv = batch['conversions'].to_numpy(dtype='float64')
+        a['cost'] += np.bincount(ids, weights=cost, minlength=n)
+        a['clicks'] += np.bincount(ids, weights=batch['clicks'].to_numpy(dtype='float64'), minlength=n)
+        a['conversions'] += np.bincount(ids, weights=conv, minlength=n)
+
+        seen = np.bincount(ids, minlength=n) > 0
+        first = np.full(n, np.iinfo('int64').max)
+        np.minimum.at(first, ids, day)
+        a['first_day'] = np.where(seen & (a['first_day'] < 0), first, a['first_day'])
+        last = np.full(n, -1, dtype='int64')
+        np.maximum.at(last, ids, day)
+        a['last_day'] = np.maximum(a['last_day'], last)
+
+        # 배치 안 마지막 전환일 이후 비용 — 전환이 있었던 키는 새로 시작, 없으면 누적
+        converted = conv > 0
+        lcd = np.full(n, -1, dtype='int64')
+        np.maximum.at(lcd, ids[converted], day[converted])
+        after = day > lcd[ids]
+        cost_after = np.bincount(ids[after], weights=cost[after], minlength=n)
+        had_conv = lcd >= 0
+        a['cost_since_conv'] = np.where(had_conv, cost_after, a['cost_since_conv'] + cost_after)
+        a['last_conv_day'] = np.maximum(a['last_conv_day'], lcd)
+
+    # ─── report ───
+    def report(self, zero_conv_cost=ZERO_CONV_COST, stale_cost=STALE_COST):
+        """기준을 넘은 키워드 (마지막 전환 이후 비용 내림차순) + 월 절감 추정 (최근 지출 있는 키워드만)."""
+        a = self.arrays
+        zero = (a['conversions'] == 0) & (a['cost'] >= zero_conv_cost)
+        stale = (a['conversions'] > 0) & (a['cost_since_conv'] >= stale_cost)
+        flagged = np.flatnonzero(zero | stale)
+        if not len(flagged):
+            return pd.DataFrame(columns=KEY_COLUMNS + ['status', 'cost', 'clicks', 'conversions',
+                                                       'cost_since_conv', 'days_since_conv', 'monthly_waste'])
+        keys = pd.DataFrame([self.keys[i].split(SEP) for i in flagged], columns=KEY_COLUMNS)
+        # 경과 일수 · 지출 속도는 키워드 자신이 아니라 데이터의 마지막 날 기준
+        end = a['last_day'].max()
+        since = np.where(a['last_conv_day'][flagged] >= 0, a['last_conv_day'][flagged] + 1, a['first_day'][flagged])
+        days = np.maximum(end - since + 1, 1)
+        active = a['last_day'][flagged] > end - ACTIVE_DAYS
+        out = keys.assign(
+            status=np.where(zero[flagged], '전환 0', '장기 미전환'),
+            cost=a['cost'][flagged].round(),
+            clicks=a['clicks'][flagged].astype('int64'),
+            conversions=a['conversions'][flagged].round(1),
+            cost_since_conv=a['cost_since_conv'][flagged].round(),
+            days_since_conv=days,
+            monthly_waste=np.where(active, np.rint(a['cost_since_conv'][flagged] / days * DAYS_PER_MONTH), 0),
+        )
+        return out.sort_values('cost_since_conv', ascending=False, kind='stable').reset_index(drop=True)